@@ -0,0 +1,83 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Compare memory taken by plain and compact ASTs of a set of MIBs.
+
+Parses the given MIB files (or the MIB shipped with the test suite under
+thirty different module names) and keeps all their ASTs around, just
+like MibCompiler does, then reports the memory they take along with the
+time it takes to parse them (measured without tracing memory).
+
+Usage: PYTHONPATH=. python benchmarks/ast_memory.py [MIB-FILE [...]]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+from pysmi.parser.dialect import smi_v1_relaxed
+from pysmi.parser.smi import compact_ast, parserFactory
+
+COPIES = 30
+
+if sys.argv[1:]:
+    mibs = [open(x, encoding="utf-8", errors="ignore").read() for x in sys.argv[1:]]
+
+else:
+    with open(
+        os.path.join(
+            os.path.dirname(__file__), "..", "tests", "data", "asn1", "MIKROTIK-MIB"
+        )
+    ) as f:
+        data = f.read()
+
+    mibs = [data.replace("MIKROTIK-MIB", f"MIKROTIK-{x}-MIB") for x in range(COPIES)]
+
+parser = parserFactory(**smi_v1_relaxed)()
+
+print(f"parsing {len(mibs)} MIBs, {sum(len(x) for x in mibs) // 1024} KB")
+
+
+def parse(compact):
+    mibTrees = []
+    shared = {}
+
+    for mib in mibs:
+        trees = parser.parse(mib, genTexts=False)
+
+        if compact:
+            trees = compact_ast(trees, shared)
+
+        mibTrees.append(trees)
+
+    return mibTrees
+
+
+for compact in (False, True):
+    started = time.perf_counter()
+
+    parse(compact)
+
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+
+    tracemalloc.start()
+
+    mibTrees = parse(compact)
+
+    gc.collect()
+
+    size = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    del mibTrees
+
+    print(
+        f"{compact and 'compact' or 'plain'} ASTs: {size // 1024} KB, parsed in {elapsed:.2f}s"
+    )
@@ -0,0 +1,157 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Measure the effect of caching resolved types on code generation.
+
+Generates pysnmp code for the given MIB file (or for a vendor-like MIB
+made up on the fly, with a few thousand table columns of a handful of
+textual conventions, some derived from other types, all having DEFVALs)
+with resolved OIDs and base types cached and not cached, best of three
+runs. The MIB file must not
+depend on symbols of other MIBs (except for the base ones).
+
+Usage: PYTHONPATH=. python benchmarks/base_types.py [MIB-FILE]
+"""
+import sys
+import time
+
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.parser.dialect import smi_v1_relaxed
+from pysmi.parser.smi import parserFactory
+
+COLUMNS = 3000
+
+MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  MODULE-IDENTITY, OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI
+  TEXTUAL-CONVENTION
+    FROM SNMPv2-TC;
+
+testModule MODULE-IDENTITY
+    LAST-UPDATED "202501010000Z"
+    ORGANIZATION "Test"
+    CONTACT-INFO "Test"
+    DESCRIPTION  "Test module"
+ ::= { 1 3 6 1 4 1 99999 }
+
+TestStatus ::= TEXTUAL-CONVENTION
+    STATUS       current
+    DESCRIPTION  "Test status"
+    SYNTAX       INTEGER { up(1), down(2), testing(3), unknown(4) }
+
+TestLevelBase ::= Integer32 (0..1000)
+
+TestLevelRange ::= TestLevelBase (0..900)
+
+TestLevel ::= TEXTUAL-CONVENTION
+    STATUS       current
+    DESCRIPTION  "Test level"
+    SYNTAX       TestLevelRange (0..800)
+
+TestName ::= TEXTUAL-CONVENTION
+    STATUS       current
+    DESCRIPTION  "Test name"
+    SYNTAX       OCTET STRING (SIZE (0..64))
+
+testTable OBJECT-TYPE
+    SYNTAX          SEQUENCE OF TestEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test table"
+ ::= { testModule 1 }
+
+testEntry OBJECT-TYPE
+    SYNTAX          TestEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test entry"
+    INDEX           { testIndex }
+ ::= { testTable 1 }
+
+TestEntry ::= SEQUENCE {
+    testIndex Integer32,
+%(sequence)s
+}
+
+testIndex OBJECT-TYPE
+    SYNTAX          Integer32
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test index"
+ ::= { testEntry 1 }
+
+%(columns)s
+
+END
+"""
+
+COLUMN = """
+test%(kind)s%(index)d OBJECT-TYPE
+    SYNTAX          Test%(kind)s%(refinement)s
+    MAX-ACCESS      read-write
+    STATUS          current
+    DESCRIPTION     "Test column"
+    DEFVAL          { %(defval)s }
+ ::= { testEntry %(index)d }
+"""
+
+KINDS = (
+    ("Status", " { up(1), down(2) }", "up"),
+    ("Level", " (1..100)", "10"),
+    ("Name", "", '"test"'),
+)
+
+if sys.argv[1:]:
+    with open(sys.argv[1], encoding="utf-8", errors="ignore") as f:
+        data = f.read()
+
+else:
+    columns = []
+
+    for index in range(2, COLUMNS + 2):
+        kind, refinement, defval = KINDS[index % len(KINDS)]
+
+        columns.append(
+            {
+                "kind": kind,
+                "index": index,
+                "refinement": index % 2 and refinement or "",
+                "defval": defval,
+            }
+        )
+
+    data = MIB % {
+        "sequence": ",\n".join(
+            f"    test{x['kind']}{x['index']} Test{x['kind']}" for x in columns
+        ),
+        "columns": "".join(COLUMN % x for x in columns),
+    }
+
+ast = parserFactory(**smi_v1_relaxed)().parse(data)[0]
+
+mibInfo, symtable = SymtableCodeGen().gen_code(ast, {})
+
+symbolTableMap = {mibInfo.name: symtable}
+
+print(f"generating code for {mibInfo.name}, {len(symtable)} symbols")
+
+for cacheSize in (0, PySnmpCodeGen.cacheSize):
+    elapsed = []
+
+    for _ in range(3):
+        codegen = PySnmpCodeGen()
+        codegen.cacheSize = cacheSize
+
+        started = time.perf_counter()
+
+        codegen.gen_code(ast, symbolTableMap)
+
+        elapsed.append(time.perf_counter() - started)
+
+    print(f"{cacheSize and 'cached' or 'not cached'}: {min(elapsed):.2f} sec")
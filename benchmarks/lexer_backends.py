@@ -0,0 +1,61 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Compare tokenization throughput of the lexer backends.
+
+Tokenizes the given MIB files (or the MIB shipped with the test suite)
+repeated to a few megabytes with each lexer backend, best of three runs.
+
+Usage: PYTHONPATH=. python benchmarks/lexer_backends.py [MIB-FILE [...]]
+"""
+import os
+import sys
+import time
+
+from pysmi.lexer.smi import lexerBackends, lexerFactory
+from pysmi.parser.dialect import smi_v1_relaxed
+
+SIZE = 4 * 1024 * 1024
+
+files = sys.argv[1:] or [
+    os.path.join(
+        os.path.dirname(__file__), "..", "tests", "data", "asn1", "MIKROTIK-MIB"
+    )
+]
+
+data = "\n".join(open(x, encoding="utf-8", errors="ignore").read() for x in files)
+data = data * (SIZE // len(data) + 1)
+
+print(f"tokenizing {len(data) // 1024} KB")
+
+
+def tokenize(lexer):
+    lexer.input(data)
+
+    count = 0
+
+    while lexer.token():
+        count += 1
+
+    return count
+
+
+for backend in sorted(lexerBackends):
+    lexer = lexerFactory(backend, **smi_v1_relaxed)().lexer
+
+    elapsed = []
+
+    for _ in range(3):
+        started = time.perf_counter()
+
+        count = tokenize(lexer)
+
+        elapsed.append(time.perf_counter() - started)
+
+    print(
+        f"{backend:<8} {count} tokens in {min(elapsed):.2f} sec, "
+        f"{len(data) / min(elapsed) / 1024 / 1024:.1f} MB/sec"
+    )
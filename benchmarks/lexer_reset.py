@@ -0,0 +1,70 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Measure per-MIB lexer set up cost.
+
+Compares rebuilding Ply lexer from scratch (what used to happen on every
+parser reset) against rewinding the class-wide lexer, and reports the
+time it takes to parse a small MIB in either case.
+
+Usage: PYTHONPATH=. python benchmarks/lexer_reset.py [ITERATIONS]
+"""
+import re
+import sys
+import timeit
+
+import ply.lex as lex
+
+from pysmi.parser.smi import parserFactory
+
+MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testObject OBJECT-TYPE
+    SYNTAX          Integer32
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test object"
+ ::= { 1 3 6 1 4 1 99999 1 }
+
+END
+"""
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+parser = parserFactory()()
+smiLexer = parser.lexer
+
+
+def rebuild():
+    smiLexer.lexer = lex.lex(
+        module=smiLexer, reflags=re.DOTALL, errorlog=lex.NullLogger()
+    )
+
+
+def rewind():
+    smiLexer.reset()
+
+
+def parse_with(setup):
+    def parse():
+        setup()
+        parser.parser.parse(MIB, lexer=smiLexer.lexer)
+
+    return parse
+
+
+for title, func in (
+    ("lexer rebuild", rebuild),
+    ("lexer reset", rewind),
+    ("parse after lexer rebuild", parse_with(rebuild)),
+    ("parse after lexer reset", parse_with(rewind)),
+):
+    elapsed = min(timeit.repeat(func, number=iterations, repeat=3))
+    print(f"{title:<28} {elapsed / iterations * 1000000:10.1f} usec")
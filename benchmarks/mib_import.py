@@ -0,0 +1,165 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Compare the time it takes pysnmp to load regular and compact MIB code.
+
+Generates pysnmp code for the given MIB file (or for a made up MIB with
+a few dozen tables of a few dozen columns each) both
+from template and in compact form, then measures how long it takes to
+unmarshal the byte-compiled code (as if from a *.pyc* file) and run it
+against a *MibBuilder*, with and without MIB texts loaded, best of five
+runs. The MIB file must not depend on symbols of other MIBs (except for
+the base ones).
+
+Usage: PYTHONPATH=. python benchmarks/mib_import.py [MIB-FILE]
+"""
+import marshal
+import sys
+import time
+
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.parser.dialect import smi_v1_relaxed
+from pysmi.parser.smi import parserFactory
+from pysnmp.smi.builder import MibBuilder
+
+TABLES = 30
+COLUMNS = 40
+
+MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  MODULE-IDENTITY, OBJECT-TYPE, Integer32, Counter32
+    FROM SNMPv2-SMI
+  TEXTUAL-CONVENTION, DisplayString
+    FROM SNMPv2-TC;
+
+testModule MODULE-IDENTITY
+    LAST-UPDATED "202501010000Z"
+    ORGANIZATION "Test"
+    CONTACT-INFO "Test"
+    DESCRIPTION  "Test module"
+ ::= { 1 3 6 1 4 1 99999 }
+
+TestStatus ::= TEXTUAL-CONVENTION
+    STATUS       current
+    DESCRIPTION  "Test status"
+    SYNTAX       INTEGER { up(1), down(2), testing(3), unknown(4) }
+
+%(tables)s
+
+END
+"""
+
+TABLE = """
+test%(table)dTable OBJECT-TYPE
+    SYNTAX          SEQUENCE OF Test%(table)dEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test table"
+ ::= { testModule %(table)d }
+
+test%(table)dEntry OBJECT-TYPE
+    SYNTAX          Test%(table)dEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test entry"
+    INDEX           { test%(table)dIndex }
+ ::= { test%(table)dTable 1 }
+
+Test%(table)dEntry ::= SEQUENCE {
+    test%(table)dIndex Integer32,
+%(sequence)s
+}
+
+test%(table)dIndex OBJECT-TYPE
+    SYNTAX          Integer32 (1..2147483647)
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test index"
+ ::= { test%(table)dEntry 1 }
+
+%(columns)s
+"""
+
+COLUMN = """
+test%(table)dColumn%(column)d OBJECT-TYPE
+    SYNTAX          %(syntax)s
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "A column of the test table, its description
+                    spanning a couple of lines, as usual."
+ ::= { test%(table)dEntry %(column)d }
+"""
+
+SYNTAXES = ("TestStatus", "Counter32", "DisplayString", "Integer32")
+
+if sys.argv[1:]:
+    with open(sys.argv[1], encoding="utf-8", errors="ignore") as f:
+        data = f.read()
+
+else:
+    tables = []
+
+    for table in range(1, TABLES + 1):
+        columns = [
+            (column, SYNTAXES[column % len(SYNTAXES)])
+            for column in range(2, COLUMNS + 2)
+        ]
+
+        tables.append(
+            TABLE
+            % {
+                "table": table,
+                "sequence": ",\n".join(
+                    f"    test{table}Column{column} {syntax}"
+                    for column, syntax in columns
+                ),
+                "columns": "".join(
+                    COLUMN % {"table": table, "column": column, "syntax": syntax}
+                    for column, syntax in columns
+                ),
+            }
+        )
+
+    data = MIB % {"tables": "".join(tables)}
+
+ast = parserFactory(**smi_v1_relaxed)().parse(data)[0]
+
+mibInfo, symtable = SymtableCodeGen().gen_code(ast, {}, genTexts=True)
+
+symbolTableMap = {mibInfo.name: symtable}
+
+print(f"loading code of {mibInfo.name}, {len(symtable)} symbols")
+
+for renderer in ("template", "compact"):
+    mibInfo, text = PySnmpCodeGen().gen_code(
+        ast, symbolTableMap, genTexts=True, renderer=renderer
+    )
+
+    pyc = marshal.dumps(compile(text, mibInfo.name, "exec"))
+
+    for loadTexts in (False, True):
+        elapsed = []
+
+        for _ in range(5):
+            mibBuilder = MibBuilder()
+            mibBuilder.loadTexts = loadTexts
+            mibBuilder.load_modules("SNMPv2-SMI", "SNMPv2-TC", "SNMPv2-CONF")
+
+            started = time.perf_counter()
+
+            ctx = {"mibBuilder": mibBuilder}
+
+            exec(marshal.loads(pyc), ctx, ctx)
+
+            elapsed.append(time.perf_counter() - started)
+
+        print(
+            f"{renderer}: {min(elapsed) * 1000:.1f} ms "
+            f"({loadTexts and 'with' or 'without'} texts), "
+            f"{len(text) // 1024} KB of code, {len(pyc) // 1024} KB of bytecode"
+        )
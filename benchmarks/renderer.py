@@ -0,0 +1,140 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Compare Jinja2 template and direct rendering of pysnmp code.
+
+Generates pysnmp code for the given MIB file (or for a made up MIB with
+a few thousand table columns of various types) using both renderers,
+best of three runs, and makes sure they produce the same code. The MIB
+file must not depend on symbols of other MIBs (except for the base ones).
+
+Usage: PYTHONPATH=. python benchmarks/renderer.py [MIB-FILE]
+"""
+import sys
+import time
+
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.parser.dialect import smi_v1_relaxed
+from pysmi.parser.smi import parserFactory
+
+COLUMNS = 3000
+
+MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  MODULE-IDENTITY, OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI
+  TEXTUAL-CONVENTION
+    FROM SNMPv2-TC;
+
+testModule MODULE-IDENTITY
+    LAST-UPDATED "202501010000Z"
+    ORGANIZATION "Test"
+    CONTACT-INFO "Test"
+    DESCRIPTION  "Test module"
+ ::= { 1 3 6 1 4 1 99999 }
+
+TestStatus ::= TEXTUAL-CONVENTION
+    STATUS       current
+    DESCRIPTION  "Test status"
+    SYNTAX       INTEGER { up(1), down(2), testing(3), unknown(4) }
+
+testTable OBJECT-TYPE
+    SYNTAX          SEQUENCE OF TestEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test table"
+ ::= { testModule 1 }
+
+testEntry OBJECT-TYPE
+    SYNTAX          TestEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test entry"
+    INDEX           { testIndex }
+ ::= { testTable 1 }
+
+TestEntry ::= SEQUENCE {
+    testIndex Integer32,
+%(sequence)s
+}
+
+testIndex OBJECT-TYPE
+    SYNTAX          Integer32
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test index"
+ ::= { testEntry 1 }
+
+%(columns)s
+
+END
+"""
+
+COLUMN = """
+test%(index)d OBJECT-TYPE
+    SYNTAX          %(syntax)s
+    MAX-ACCESS      read-write
+    STATUS          current
+    DESCRIPTION     "Test column"
+ ::= { testEntry %(index)d }
+"""
+
+SYNTAXES = (
+    ("TestStatus", "TestStatus"),
+    ("Integer32", "Integer32 (1..100)"),
+    ("OCTET STRING", "OCTET STRING (SIZE (0..64))"),
+    ("Integer32", "Integer32"),
+)
+
+if sys.argv[1:]:
+    with open(sys.argv[1], encoding="utf-8", errors="ignore") as f:
+        data = f.read()
+
+else:
+    columns = [
+        (index, SYNTAXES[index % len(SYNTAXES)]) for index in range(2, COLUMNS + 2)
+    ]
+
+    data = MIB % {
+        "sequence": ",\n".join(
+            f"    test{index} {syntax[0]}" for index, syntax in columns
+        ),
+        "columns": "".join(
+            COLUMN % {"index": index, "syntax": syntax[1]} for index, syntax in columns
+        ),
+    }
+
+ast = parserFactory(**smi_v1_relaxed)().parse(data)[0]
+
+mibInfo, symtable = SymtableCodeGen().gen_code(ast, {}, genTexts=True)
+
+symbolTableMap = {mibInfo.name: symtable}
+
+print(f"generating code for {mibInfo.name}, {len(symtable)} symbols")
+
+texts = set()
+
+for renderer in ("template", "direct"):
+    elapsed = []
+
+    for _ in range(3):
+        codegen = PySnmpCodeGen()
+
+        started = time.perf_counter()
+
+        mibInfo, text = codegen.gen_code(
+            ast, symbolTableMap, genTexts=True, renderer=renderer
+        )
+
+        elapsed.append(time.perf_counter() - started)
+
+    texts.add(text)
+
+    print(f"{renderer}: {min(elapsed):.2f} sec, {len(text) // 1024} KB of code")
+
+print(f"same code: {len(texts) == 1}")
@@ -0,0 +1,60 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import hashlib
+
+from pysmi import __version__ as package_version
+from pysmi import config
+
+
+class AbstractCache:
+    def set_options(self, **kwargs):
+        for k in kwargs:
+            setattr(self, k, kwargs[k])
+        return self
+
+    @staticmethod
+    def get_key(*parts):
+        """Build content-addressed cache key from given parts.
+
+        Besides the parts, the key covers pysmi version and strict mode
+        setting as both affect the outcome of MIB processing.
+        """
+        digest = hashlib.sha256()
+
+        for part in (package_version, config.STRICT_MODE) + parts:
+            digest.update(str(part).encode("utf-8", "surrogateescape"))
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    @classmethod
+    def get_mib_key(cls, kind, parser, data, **options):
+        """Build cache key for *kind* of results of parsing MIB *data*.
+
+        Parsers built by *parserFactory* are told apart by their grammar
+        relaxation options, results of parsing with different parse
+        *options* (e.g. *genTexts*) are told apart as well.
+        """
+        parserClass = parser.__class__
+
+        grammarOptions = getattr(parser, "grammarOptions", {})
+
+        return cls.get_key(
+            kind,
+            parserClass.__module__,
+            parserClass.__qualname__,
+            ",".join(sorted(x for x in grammarOptions if grammarOptions[x])),
+            getattr(parser, "_startSym", ""),
+            ",".join(f"{x}={options[x]}" for x in sorted(options)),
+            data,
+        )
+
+    def get_data(self, key):
+        raise NotImplementedError()
+
+    def put_data(self, key, data):
+        raise NotImplementedError()
@@ -0,0 +1,89 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import pickle
+import sys
+import tempfile
+
+from pysmi import debug
+from pysmi.cache.base import AbstractCache
+from pysmi.compat import decode
+
+
+class FileCache(AbstractCache):
+    """Keeps MIB processing results in files at specified location.
+
+    Each entry is stored as a pickle in a file named after its
+    content-addressed key. Cache is best effort: unreadable entries
+    are treated as missing and storing failures are ignored.
+
+    User is expected to pass *FileCache* class instance to
+    *MibCompiler.set_cache*. The rest is internal to *MibCompiler*.
+    """
+
+    suffix = ".pickle"
+
+    def __init__(self, path):
+        """Creates an instance of *FileCache* class.
+
+        Args:
+            path: writable directory to store cache entries
+        """
+        self._path = decode(os.path.normpath(path))
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f'{self.__class__.__name__}{{"{self._path}"}}'
+
+    def get_filename(self, key):
+        return os.path.join(self._path, key[:2], key + self.suffix)
+
+    def get_data(self, key):
+        filename = self.get_filename(key)
+
+        try:
+            with open(filename, "rb") as f:
+                data = pickle.load(f)
+
+        except FileNotFoundError:
+            debug.logger & debug.FLAG_CACHE and debug.logger(f"cache miss for {key}")
+            return None
+
+        except Exception:
+            debug.logger & debug.FLAG_CACHE and debug.logger(
+                f"failure reading cache file {filename}: {sys.exc_info()[1]}"
+            )
+            return None
+
+        debug.logger & debug.FLAG_CACHE and debug.logger(f"cache hit for {key}")
+
+        return data
+
+    def put_data(self, key, data):
+        filename = self.get_filename(key)
+
+        tfile = None
+
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+            fd, tfile = tempfile.mkstemp(dir=os.path.dirname(filename))
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tfile, filename)
+
+        except Exception:
+            if tfile and os.access(tfile, os.F_OK):
+                os.unlink(tfile)
+
+            debug.logger & debug.FLAG_CACHE and debug.logger(
+                f"failure writing cache file {filename}: {sys.exc_info()[1]}"
+            )
+            return
+
+        debug.logger & debug.FLAG_CACHE and debug.logger(f"stored {key} in {filename}")
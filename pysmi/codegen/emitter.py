@@ -0,0 +1,719 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+"""Direct pysnmp code emitter.
+
+Writes the very same Python code as the *pysnmp/mib-definitions.j2*
+template does, just without Jinja2, so that MIBs get rendered faster.
+Each *emit_* function below stands for a template block (or macro) of
+the same name and must be kept in sync with it.
+
+Optionally, MIB managed objects are written in compact form, which is
+not available from the template.
+"""
+from pysmi.codegen.jfilters import bitstring, capfirst, pythonstr, pythonsym
+
+EXPORTED_CLASSES = (
+    "moduleidentity",
+    "objecttype",
+    "agentcapabilities",
+    "modulecompliance",
+    "notificationgroup",
+    "notificationtype",
+    "objectgroup",
+    "objectidentity",
+    "textualconvention",
+    "type",
+)
+
+
+def render_mib(mib, compact=False):
+    """Render pysnmp code of MIB from its intermediate representation.
+
+    Args:
+        mib: MIB context as *PySnmpCodeGen* passes it to its template
+        compact: if set, MIB managed objects are not created one by one,
+            but by a loop over a table of their properties (see
+            *emit_managed_objects_table*)
+
+    Returns:
+        Python code of MIB module
+    """
+    out = []
+
+    for emit in (
+        emit_docstring,
+        emit_api_version_check,
+        emit_asn1_imports,
+        emit_smi_imports,
+        emit_module_identity,
+        emit_types_definitions,
+        emit_textual_conventions,
+        compact and emit_managed_objects_table or emit_managed_objects,
+        emit_managed_objects_groups,
+        emit_notification_objects,
+        emit_notification_groups,
+        emit_agent_capabilities,
+        emit_module_compliance,
+        emit_exports,
+    ):
+        emit(out, mib)
+
+    return "".join(out)
+
+
+def definitions(mib, *classes):
+    # MIB symbols and their definitions, "meta" is not a definition
+    for symbol, definition in mib.items():
+        if definition.get("class") in classes:
+            yield symbol, definition
+
+
+def get(definition, key):
+    # missing values render as empty strings in Jinja2
+    return definition.get(key, "")
+
+
+def emit_sequence(out, items, single, first, middle, last):
+    # Python tuple spanning several lines, each item is a tuple of values
+    # to format the line of its position with
+    count = len(items)
+
+    for index, item in enumerate(items):
+        if count == 1:
+            out.append(single.format(*item))
+
+        elif not index:
+            out.append(first.format(*item))
+
+        elif index == count - 1:
+            out.append(last.format(*item))
+
+        else:
+            out.append(middle.format(*item))
+
+
+def emit_texts(out, symbol, definition, *keys):
+    for key, method in keys:
+        if key in definition:
+            out.append(
+                f"if mibBuilder.loadTexts:\n"
+                f"    {symbol}.{method}({pythonstr(definition[key])})\n"
+            )
+
+
+def emit_status(out, symbol, definition):
+    out.append(
+        f"if mibBuilder.loadTexts:\n"
+        f"    {symbol}.setStatus(\n"
+        f"        \"{get(definition, 'status')}\"\n"
+        f"    )\n"
+    )
+
+
+def emit_objects(out, symbol, objects):
+    out.append(f"{symbol}.setObjects(\n")
+
+    emit_sequence(
+        out,
+        [(x["module"], x["object"]) for x in objects],
+        '    ("{0}", "{1}")\n',
+        '      *(("{0}", "{1}"),\n',
+        '        ("{0}", "{1}"),\n',
+        '        ("{0}", "{1}"))\n',
+    )
+
+    out.append(")\n")
+
+
+def emit_docstring(out, mib):
+    out.append(
+        f"# SNMP MIB module ({mib['meta']['module']}) expressed in pysnmp data model.\n"
+        "#\n"
+        "# This Python module is designed to be imported and executed by the\n"
+        "# pysnmp library.\n"
+        "#\n"
+        "# See https://www.pysnmp.com/pysnmp for further information.\n"
+        "#\n"
+        "# Notes\n"
+        "# -----\n"
+    )
+
+    for comment in mib["meta"].get("comments", ()):
+        out.append(f"# {comment}\n")
+
+
+def emit_api_version_check(out, mib):
+    out.append(
+        "\n"
+        "if 'mibBuilder' not in globals():\n"
+        "    import sys\n"
+        "\n"
+        "    sys.stderr.write(__doc__)\n"
+        "    sys.exit(1)\n"
+    )
+
+
+def emit_asn1_imports(out, mib):
+    out.append(
+        "\n"
+        "# Import base ASN.1 objects even if this MIB does not use it\n"
+        "\n"
+        "(Integer,\n"
+        " OctetString,\n"
+        " ObjectIdentifier) = mibBuilder.importSymbols(\n"
+        '    "ASN1",\n'
+        '    "Integer",\n'
+        '    "OctetString",\n'
+        '    "ObjectIdentifier")\n'
+        "\n"
+        "(NamedValues,) = mibBuilder.importSymbols(\n"
+        '    "ASN1-ENUMERATION",\n'
+        '    "NamedValues")\n'
+        "(ConstraintsIntersection,\n"
+        " ConstraintsUnion,\n"
+        " SingleValueConstraint,\n"
+        " ValueRangeConstraint,\n"
+        " ValueSizeConstraint) = mibBuilder.importSymbols(\n"
+        '    "ASN1-REFINEMENT",\n'
+        '    "ConstraintsIntersection",\n'
+        '    "ConstraintsUnion",\n'
+        '    "SingleValueConstraint",\n'
+        '    "ValueRangeConstraint",\n'
+        '    "ValueSizeConstraint")\n'
+    )
+
+
+def emit_smi_imports(out, mib):
+    out.append("\n# Import SMI symbols from the MIBs this MIB depends on\n\n")
+
+    for module, symbols in mib["imports"].items():
+        # unlike elsewhere, the symbol names are not "Pythonized" here
+        emit_sequence(
+            out,
+            [(pythonsym(x), module) for x in symbols],
+            '({0},) = mibBuilder.importSymbols(\n    "{1}",\n',
+            "({0},\n",
+            " {0},\n",
+            ' {0}) = mibBuilder.importSymbols(\n    "{1}",\n',
+        )
+
+        for index, symbol in enumerate(symbols):
+            if index == len(symbols) - 1:
+                out.append(f'    "{symbol}")\n')
+
+            else:
+                out.append(f'    "{symbol}",\n')
+
+        out.append("\n")
+
+
+def emit_module_identity(out, mib):
+    out.append("\n# MODULE-IDENTITY\n\n")
+
+    for symbol, definition in definitions(mib, "moduleidentity"):
+        out.append(f"{symbol} = ModuleIdentity(\n    {definition['oid']}\n)\n")
+
+        if "revisions" in definition:
+            out.append(f"if mibBuilder.loadTexts:\n    {symbol}.setRevisions(\n")
+
+            emit_sequence(
+                out,
+                [(pythonstr(x["revision"]),) for x in definition["revisions"]],
+                "        ({0},)\n",
+                "        ({0},\n",
+                "         {0},\n",
+                "         {0})\n",
+            )
+
+            out.append("    )\n")
+
+        emit_texts(
+            out,
+            symbol,
+            definition,
+            ("lastupdated", "setLastUpdated"),
+            ("organization", "setOrganization"),
+            ("contactinfo", "setContactInfo"),
+            ("description", "setDescription"),
+        )
+
+        out.append("\n")
+
+
+def emit_constraints(out, type, spec):
+    out.append(f"    subtypeSpec = {type}.subtypeSpec\n")
+
+    if "enumeration" in spec:
+        out.append(
+            "    subtypeSpec += ConstraintsUnion(\n        SingleValueConstraint(\n"
+        )
+
+        emit_sequence(
+            out,
+            [(x,) for x in sorted(spec["enumeration"].values())],
+            "            {0}\n",
+            "            *({0},\n",
+            "              {0},\n",
+            "              {0})\n",
+        )
+
+        out.append("        )\n    )\n")
+
+        emit_named_values(out, spec["enumeration"])
+
+    elif "range" in spec:
+        out.append("    subtypeSpec += ConstraintsUnion(\n")
+
+        for rng in spec["range"]:
+            out.append(f"        ValueRangeConstraint({rng['min']}, {rng['max']}),\n")
+
+        out.append("    )\n")
+
+    elif "size" in spec:
+        out.append("    subtypeSpec += ConstraintsUnion(\n")
+
+        for rng in spec["size"]:
+            out.append(f"        ValueSizeConstraint({rng['min']}, {rng['max']}),\n")
+
+        out.append("    )\n")
+
+        if "fixed" in spec:
+            out.append(f"    fixed_length = {spec['fixed']}\n")
+
+
+def emit_named_values(out, namedValues):
+    out.append("    namedValues = NamedValues(\n")
+
+    emit_sequence(
+        out,
+        sorted(namedValues.items(), key=lambda x: x[1]),
+        '        ("{0}", {1})\n',
+        '        *(("{0}", {1}),\n',
+        '          ("{0}", {1}),\n',
+        '          ("{0}", {1}))\n',
+    )
+
+    out.append("    )\n")
+
+
+def emit_bits(out, namedBits):
+    emit_named_values(out, namedBits)
+
+
+def emit_default(out, definition):
+    default = definition["default"]["default"]
+
+    fmt = default["format"]
+
+    if fmt == "decimal" or fmt == "oid":
+        out.append(f"    defaultValue = {default['value']}\n")
+
+    elif fmt == "hex":
+        out.append(f"    defaultHexValue = \"{default['value']}\"\n")
+
+    elif fmt == "string":
+        # TODO: pyasn1 does not like defaulted strings
+        out.append(f"    defaultValue = OctetString({pythonstr(default['value'])})\n")
+
+    elif fmt == "bits":
+        # TODO: pyasn1 does not like default named bits
+        out.append(
+            f"    defaultBinValue = \"{bitstring(default['value']['bits'].values())}\"\n"
+        )
+
+
+def emit_type_body(out, definition, syntax):
+    # class body of a custom type, each macro output followed by a new line
+    if "default" in definition:
+        emit_default(out, definition)
+        out.append("\n")
+
+    if "constraints" in syntax:
+        emit_constraints(out, syntax["type"], syntax["constraints"])
+        out.append("\n")
+
+    if "bits" in syntax:
+        emit_bits(out, syntax["bits"])
+
+
+def emit_types_definitions(out, mib):
+    out.append("\n# Types definitions\n\n")
+
+    for symbol, definition in definitions(mib, "type"):
+        syntax = definition["type"]
+
+        out.append(
+            f"\n\nclass {symbol}({syntax['type']}):\n"
+            f'    """Custom type {symbol} based on {syntax["type"]}"""\n'
+        )
+
+        emit_type_body(out, definition, syntax)
+
+        out.append("\n\n")
+
+
+def emit_textual_conventions(out, mib):
+    out.append("\n# TEXTUAL-CONVENTIONS\n\n")
+
+    for symbol, definition in definitions(mib, "textualconvention"):
+        syntax = definition["type"]
+
+        if syntax["tcbase"]:
+            out.append(f"\n\nclass {symbol}({syntax['type']}):\n")
+
+        else:
+            out.append(f"\n\nclass {symbol}(TextualConvention, {syntax['type']}):\n")
+
+        out.append(f"    status = \"{definition.get('status', 'current')}\"\n")
+
+        if "displayhint" in definition:
+            out.append(f"    displayHint = {pythonstr(definition['displayhint'])}\n")
+
+        if "constraints" in syntax:
+            emit_constraints(out, syntax["type"], syntax["constraints"])
+            out.append("\n")
+
+        if "bits" in syntax:
+            emit_bits(out, syntax["bits"])
+
+        for key in ("description", "reference"):
+            if key in definition:
+                out.append(
+                    f"    if mibBuilder.loadTexts:\n"
+                    f"        {key} = {pythonstr(definition[key])}\n"
+                )
+
+    out.append("\n")
+
+
+def is_custom_syntax(definition):
+    # object syntax needs a class of its own
+    syntax = definition["syntax"]
+
+    return "default" in definition or "constraints" in syntax or "bits" in syntax
+
+
+def emit_custom_syntax(out, symbol, definition):
+    name = capfirst(symbol)
+    syntax = definition["syntax"]
+
+    out.append(
+        f"\n\nclass _{name}_Type({syntax['type']}):\n"
+        f'    """Custom type {symbol} based on {syntax["type"]}"""\n'
+    )
+
+    emit_type_body(out, definition, syntax)
+
+    out.append(f"\n_{name}_Type.__name__ = \"{syntax['type']}\"\n")
+
+
+def emit_index_names(out, symbol, definition):
+    out.append(f"{symbol}.setIndexNames(\n")
+
+    for index in definition["indices"]:
+        out.append(
+            f"    ({index['implied']}, \"{index['module']}\", \"{index['object']}\"),\n"
+        )
+
+    out.append(")\n")
+
+
+def emit_augmentions(out, mib):
+    for symbol, definition in definitions(mib, "objecttype"):
+        if definition.get("nodetype") == "row" and "augmention" in definition:
+            augmented = definition["augmention"]["object"]
+
+            out.append(
+                f"{augmented}.registerAugmentions(\n"
+                f"    (\"{mib['meta']['module']}\",\n"
+                f"     \"{definition['name']}\")\n"
+                f")\n"
+                f"{symbol}.setIndexNames(*{augmented}.getIndexNames())\n"
+            )
+
+
+def emit_managed_objects(out, mib):
+    out.append("\n# MIB Managed Objects in the order of their OIDs\n\n")
+
+    for symbol, definition in definitions(mib, "objecttype", "objectidentity"):
+        name = capfirst(symbol)
+
+        if "syntax" in definition:
+            syntax = definition["syntax"]
+
+            if is_custom_syntax(definition):
+                emit_custom_syntax(out, symbol, definition)
+
+            else:
+                out.append(f"_{name}_Type = {syntax['type']}\n")
+
+        nodetype = definition.get("nodetype")
+
+        if definition["class"] == "objectidentity":
+            out.append(
+                f"_{name}_ObjectIdentity = ObjectIdentity\n"
+                f"{symbol} = _{name}_ObjectIdentity(\n"
+                f"    {definition['oid']}\n"
+                f")\n"
+            )
+
+        elif nodetype == "scalar" or nodetype == "column":
+            out.append(
+                f"_{name}_Object = {nodetype == 'scalar' and 'MibScalar' or 'MibTableColumn'}\n"
+                f"{symbol} = _{name}_Object(\n"
+                f"    {definition['oid']},\n"
+                f"    _{name}_Type()\n"
+                f")\n"
+                f"{symbol}.setMaxAccess(\"{get(definition, 'maxaccess')}\")\n"
+            )
+
+        elif nodetype == "table" or nodetype == "row":
+            out.append(
+                f"_{name}_Object = {nodetype == 'table' and 'MibTable' or 'MibTableRow'}\n"
+                f"{symbol} = _{name}_Object(\n"
+                f"    {definition['oid']}\n"
+                f")\n"
+            )
+
+            if nodetype == "row" and "indices" in definition:
+                emit_index_names(out, symbol, definition)
+
+        if "status" in definition:
+            out.append(
+                f"if mibBuilder.loadTexts:\n"
+                f"    {symbol}.setStatus(\"{definition['status']}\")\n"
+            )
+
+        emit_texts(
+            out,
+            symbol,
+            definition,
+            ("units", "setUnits"),
+            ("reference", "setReference"),
+            ("description", "setDescription"),
+        )
+
+    emit_augmentions(out, mib)
+
+
+# Creates MIB objects from the rows of the table that compact code has
+# in place of the code creating each object
+OBJECTS_LOADER = """\
+def _load_objects(objects):
+    for (symbol, objectClass, oid, syntax, maxAccess,
+         status, units, reference, description) in objects:
+        if syntax is None:
+            mibObject = objectClass(oid)
+        else:
+            mibObject = objectClass(oid, syntax())
+        if maxAccess is not None:
+            mibObject.setMaxAccess(maxAccess)
+        if mibBuilder.loadTexts:
+            if status is not None:
+                mibObject.setStatus(status)
+            if units is not None:
+                mibObject.setUnits(units)
+            if reference is not None:
+                mibObject.setReference(reference)
+            if description is not None:
+                mibObject.setDescription(description)
+        yield symbol, mibObject
+"""
+
+OBJECT_CLASSES = {
+    "scalar": "MibScalar",
+    "column": "MibTableColumn",
+    "table": "MibTable",
+    "row": "MibTableRow",
+}
+
+
+def emit_managed_objects_table(out, mib):
+    """Write MIB managed objects as a table of their properties.
+
+    Objects come out the same as *emit_managed_objects* creates them,
+    just with less (byte)code to load. Custom object syntaxes are still
+    defined as classes. Objects get bound to module-level names, while
+    other helper names (such as *_Object_Type* of objects of standard
+    syntaxes) are not defined. The loader function is deleted once it
+    is done.
+    """
+    out.append("\n# MIB Managed Objects in the order of their OIDs\n\n")
+
+    rows = []
+
+    for symbol, definition in definitions(mib, "objecttype", "objectidentity"):
+        if definition["class"] == "objectidentity":
+            objectClass = "ObjectIdentity"
+
+        elif definition.get("nodetype") in OBJECT_CLASSES:
+            objectClass = OBJECT_CLASSES[definition["nodetype"]]
+
+        else:
+            continue
+
+        syntax = "None"
+
+        if "syntax" in definition:
+            if is_custom_syntax(definition):
+                emit_custom_syntax(out, symbol, definition)
+
+                syntax = f"_{capfirst(symbol)}_Type"
+
+            else:
+                syntax = definition["syntax"]["type"]
+
+        maxAccess = "None"
+
+        if definition.get("nodetype") in ("scalar", "column"):
+            maxAccess = f"\"{get(definition, 'maxaccess')}\""
+
+        texts = [
+            key in definition and pythonstr(definition[key]) or "None"
+            for key in ("status", "units", "reference", "description")
+        ]
+
+        rows.append(
+            f"    (\"{symbol}\", {objectClass}, {definition['oid']}, {syntax},"
+            f" {maxAccess}, {', '.join(texts)}),\n"
+        )
+
+    if rows:
+        out.append(f"\n{OBJECTS_LOADER}\n\nglobals().update(_load_objects((\n")
+        out.extend(rows)
+        out.append(")))\n\ndel _load_objects\n")
+
+    for symbol, definition in definitions(mib, "objecttype"):
+        if definition.get("nodetype") == "row" and "indices" in definition:
+            emit_index_names(out, symbol, definition)
+
+    emit_augmentions(out, mib)
+
+
+def emit_managed_objects_groups(out, mib):
+    out.append("\n# Managed Objects groups\n\n")
+
+    for symbol, definition in definitions(mib, "objectgroup"):
+        out.append(f"{symbol} = ObjectGroup(\n    {definition['oid']}\n)\n")
+
+        if "objects" in definition:
+            emit_objects(out, symbol, definition["objects"])
+
+        out.append(
+            f"if mibBuilder.loadTexts:\n"
+            f"    {symbol}.setStatus(\"{get(definition, 'status')}\")\n"
+        )
+
+        emit_texts(
+            out,
+            symbol,
+            definition,
+            ("description", "setDescription"),
+            ("reference", "setReference"),
+        )
+
+        out.append("\n")
+
+
+def emit_notification_objects(out, mib):
+    out.append("\n# Notification objects\n\n")
+
+    for symbol, definition in definitions(mib, "notificationtype"):
+        out.append(f"{symbol} = NotificationType(\n    {definition['oid']}\n)\n")
+
+        if "objects" in definition:
+            emit_objects(out, symbol, definition["objects"])
+
+        emit_status(out, symbol, definition)
+
+        emit_texts(out, symbol, definition, ("description", "setDescription"))
+
+        out.append("\n")
+
+
+def emit_notification_groups(out, mib):
+    out.append("\n# Notifications groups\n\n")
+
+    for symbol, definition in definitions(mib, "notificationgroup"):
+        out.append(f"{symbol} = NotificationGroup(\n    {definition['oid']}\n)\n")
+
+        if "objects" in definition:
+            emit_objects(out, symbol, definition["objects"])
+
+        emit_status(out, symbol, definition)
+
+        emit_texts(
+            out,
+            symbol,
+            definition,
+            ("description", "setDescription"),
+            ("reference", "setReference"),
+        )
+
+        out.append("\n")
+
+
+def emit_agent_capabilities(out, mib):
+    out.append("\n# Agent capabilities\n\n")
+
+    for symbol, definition in definitions(mib, "agentcapabilities"):
+        out.append(f"{symbol} = AgentCapabilities(\n    {definition['oid']}\n)\n")
+
+        emit_texts(
+            out,
+            symbol,
+            definition,
+            ("productrelease", "setProductRelease"),
+            ("reference", "setReference"),
+        )
+
+        emit_status(out, symbol, definition)
+
+        emit_texts(out, symbol, definition, ("description", "setDescription"))
+
+        out.append("\n")
+
+
+def emit_module_compliance(out, mib):
+    out.append("\n# Module compliance\n\n")
+
+    for symbol, definition in definitions(mib, "modulecompliance"):
+        out.append(f"{symbol} = ModuleCompliance(\n    {definition['oid']}\n)\n")
+
+        if "modulecompliance" in definition:
+            emit_objects(out, symbol, definition["modulecompliance"])
+
+        emit_status(out, symbol, definition)
+
+        emit_texts(
+            out,
+            symbol,
+            definition,
+            ("description", "setDescription"),
+            ("reference", "setReference"),
+        )
+
+        out.append("\n")
+
+
+def emit_exports(out, mib):
+    out.append(
+        "\n# Export all MIB objects to the MIB builder\n\n"
+        "mibBuilder.exportSymbols(\n"
+        f"    \"{mib['meta']['module']}\",\n"
+    )
+
+    emit_sequence(
+        out,
+        [(x[1]["name"], x[0]) for x in definitions(mib, *EXPORTED_CLASSES)],
+        '    **{{"{0}": {1}}}\n',
+        '    **{{"{0}": {1},\n',
+        '       "{0}": {1},\n',
+        '       "{0}": {1}}}\n',
+    )
+
+    out.append(")\n")
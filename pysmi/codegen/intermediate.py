@@ -7,7 +7,9 @@
 import re
 import sys
 from collections import OrderedDict
+from collections.abc import Mapping
 from time import strftime, strptime
+from types import MappingProxyType
 
 from pysmi import config, debug, error
 from pysmi.codegen.base import AbstractCodeGen
@@ -61,7 +63,12 @@ class IntermediateCodeGen(AbstractCodeGen):
         "snmpEnableAuthTraps": "snmpEnableAuthenTraps",  # RFC1158-MIB -> SNMPv2-MIB
     }
 
+    #: most symbol OIDs and base types to keep resolved, see *resolve_oid*
+    cacheSize = 10000
+
     def __init__(self):
+        self._oidCache = OrderedDict()
+        self._baseTypeCache = OrderedDict()
         self._rows = set()
         self._seenSyms = set()
         self._importMap = {}
@@ -75,6 +82,15 @@ class IntermediateCodeGen(AbstractCodeGen):
         self.genRules = {"text": True}
         self.symbolTable = {}
 
+    def __getstate__(self):
+        # text filter is per-call and may not be picklable (e.g. lambda)
+        state = self.__dict__.copy()
+        state.pop("textFilter", None)
+        # cached OIDs refer to symbol tables of this process
+        state["_oidCache"] = OrderedDict()
+        state["_baseTypeCache"] = OrderedDict()
+        return state
+
     def prep_data(self, pdata):
         data = []
         for el in pdata:
@@ -168,7 +184,12 @@ class IntermediateCodeGen(AbstractCodeGen):
                 self._complianceOids.append(outDict["oid"])
 
     def gen_numeric_oid(self, oid):
+        return self._gen_numeric_oid(oid)[0]
+
+    def _gen_numeric_oid(self, oid):
+        # numeric OID along with the symbol tables it is resolved through
         numericOid = ()
+        symbolTables = {}
 
         for part in oid:
             if isinstance(part, tuple):
@@ -177,26 +198,100 @@ class IntermediateCodeGen(AbstractCodeGen):
                     numericOid += (1,)
                     continue
 
-                if module not in self.symbolTable:
-                    # TODO: do getname for possible future borrowed mibs
-                    raise error.PySmiSemanticError(
-                        f'no module "{module}" in symbolTable'
-                    )
-
-                if parent not in self.symbolTable[module]:
-                    raise error.PySmiSemanticError(
-                        f'no symbol "{parent}" in module "{module}"'
-                    )
-                numericOid += self.gen_numeric_oid(
-                    self.symbolTable[module][parent]["oid"]
-                )
+                parentOid, parentTables = self.resolve_oid(parent, module)
+
+                numericOid += parentOid
+                symbolTables.update(parentTables)
 
             else:
                 numericOid += (part,)
 
-        return numericOid
+        return numericOid, symbolTables
+
+    def resolve_oid(self, symbol, module):
+        """Resolve OID of *symbol* defined in *module* into numeric form.
+
+        Resolved OIDs are kept in a bounded cache shared by *gen_code*
+        calls, so that OIDs of the symbols many others are defined under
+        (e.g. *enterprises*) are not resolved over and over again. Cached
+        OID is only used while all symbol tables it was resolved through
+        are still in place.
+
+        Returns:
+            a tuple of numeric OID and the symbol tables (by module name)
+            it was resolved through
+        """
+        key = module, symbol
+
+        cached = self.get_cached(self._oidCache, key)
+
+        if cached is not None:
+            return cached
+
+        if module not in self.symbolTable:
+            # TODO: do getname for possible future borrowed mibs
+            raise error.PySmiSemanticError(f'no module "{module}" in symbolTable')
+
+        if symbol not in self.symbolTable[module]:
+            raise error.PySmiSemanticError(f'no symbol "{symbol}" in module "{module}"')
+
+        numericOid, symbolTables = self._gen_numeric_oid(
+            self.symbolTable[module][symbol]["oid"]
+        )
+
+        symbolTables[module] = self.symbolTable[module]
+
+        self.put_cached(self._oidCache, key, (numericOid, symbolTables))
+
+        return numericOid, symbolTables
+
+    def get_cached(self, cache, key):
+        # cached result is good while its symbol tables are all in place
+        cached = cache.get(key)
+
+        if cached is not None:
+            symbolTables = cached[-1]
+
+            for module in symbolTables:
+                if self.symbolTable.get(module) is not symbolTables[module]:
+                    return None
+
+            cache.move_to_end(key)
+
+        return cached
+
+    def put_cached(self, cache, key, result):
+        cache[key] = result
+
+        if len(cache) > self.cacheSize:
+            cache.popitem(last=False)
 
     def get_base_type(self, symName, module):
+        """Resolve syntax of *symName* defined in *module* into a base type.
+
+        Textual conventions are followed down to one of *baseTypes*,
+        merging enumerations and range constraints along the way. Resolved
+        types are cached the same way OIDs are (see *resolve_oid*), hence
+        returned subtypes are immutable: enumerations are read-only
+        mappings, range and size constraints are tuples.
+
+        Returns:
+            a tuple of base type and its subtype
+        """
+        return self._get_base_type(symName, module)[0]
+
+    def _get_base_type(self, symName, module):
+        key = module, symName
+
+        # types are shared by many objects, objects are resolved just once
+        cacheable = symName[:1].isupper()
+
+        if cacheable:
+            cached = self.get_cached(self._baseTypeCache, key)
+
+            if cached is not None:
+                return cached
+
         if module not in self.symbolTable:
             raise error.PySmiSemanticError(f'no module "{module}" in symbolTable')
 
@@ -211,34 +306,58 @@ class IntermediateCodeGen(AbstractCodeGen):
         if not symType[0]:
             raise error.PySmiSemanticError(f'unknown type for symbol "{symName}"')
 
+        symSubtype = self.freeze_subtype(symSubtype)
+
         if symType[0] in self.baseTypes:
-            return symType, symSubtype
+            baseType = symType, symSubtype
+            symbolTables = {}
 
         else:
-            baseSymType, baseSymSubtype = self.get_base_type(*symType)
+            (baseSymType, baseSymSubtype), symbolTables = self._get_base_type(*symType)
 
-            if isinstance(baseSymSubtype, dict):
+            if isinstance(baseSymSubtype, MappingProxyType):
                 # An enumeration (INTEGER or BITS). Combine the enumeration
                 # lists when applicable. That is a bit more permissive than
                 # strictly needed, as syntax refinement may only remove entries
                 # from the base enumeration (RFC 2578 Sec. 9 point (2)).
-                if isinstance(symSubtype, dict):
-                    baseSymSubtype.update(symSubtype)
+                if isinstance(symSubtype, MappingProxyType):
+                    baseSymSubtype = MappingProxyType({**baseSymSubtype, **symSubtype})
                 symSubtype = baseSymSubtype
 
-            elif isinstance(baseSymSubtype, list):
+            elif isinstance(baseSymSubtype, tuple):
                 # A value range or size constraint. Note that each list is an
                 # intersection of unions of ranges. Taking the intersection
                 # instead of the most-top level union of ranges is a bit more
                 # restrictive than strictly needed, as range syntax refinement
                 # may only remove allowed values from the base type (RFC 2578
                 # Sec. 9. points (1) and (3)), but it matches what pyasn1 does.
-                if isinstance(symSubtype, list):
+                if isinstance(symSubtype, tuple):
                     symSubtype += baseSymSubtype
                 else:
                     symSubtype = baseSymSubtype
 
-            return baseSymType, symSubtype
+            baseType = baseSymType, symSubtype
+
+        if cacheable:
+            symbolTables = dict(symbolTables)
+            symbolTables[module] = self.symbolTable[module]
+
+            self.put_cached(self._baseTypeCache, key, (baseType, symbolTables))
+
+        return baseType, symbolTables
+
+    @staticmethod
+    def freeze_subtype(subtype):
+        # enumerations become read-only mappings, lists become tuples
+        subtypeType = type(subtype)
+
+        if subtypeType is dict or subtypeType is OrderedDict:
+            return MappingProxyType(dict(subtype))
+
+        if subtypeType is list:
+            return tuple([IntermediateCodeGen.freeze_subtype(x) for x in subtype])
+
+        return subtype
 
     def is_type_derived_from_tc(self, symName, module):
         """Is the given type derived from a Textual-Convention declaration?
@@ -718,7 +837,7 @@ class IntermediateCodeGen(AbstractCodeGen):
         elif self.is_binary(defval):  # binary
             value = int(defval[1:-2] or "0", 2)
 
-        elif isinstance(defvalType[1], dict):  # enumeration label
+        elif isinstance(defvalType[1], Mapping):  # enumeration label
             # For enumerations, the ASN.1 DEFVAL statements contain names,
             # whereas the code generation template expects integer values
             # (represented as strings).
@@ -742,14 +861,14 @@ class IntermediateCodeGen(AbstractCodeGen):
         else:
             raise ValueError("wrong input type for integer")
 
-        if isinstance(defvalType[1], dict):  # enumeration number
+        if isinstance(defvalType[1], Mapping):  # enumeration number
             # For numerical values given for enumerated integers, make sure
             # that they are valid, because pyasn1 will not check this case and
             # thus let us set a default value that is not valid for the type.
             if value not in defvalType[1].values():
                 raise ValueError("wrong enumeration value")
 
-        elif isinstance(defvalType[1], list):  # range constraints
+        elif isinstance(defvalType[1], tuple):  # range constraints
             if not self.is_in_range(defvalType[1], value):
                 raise ValueError("value does not conform to range constraints")
 
@@ -809,7 +928,7 @@ class IntermediateCodeGen(AbstractCodeGen):
             raise ValueError("wrong input type for string")
 
         if defvalBaseType == "OctetString" and isinstance(
-            defvalType[1], list
+            defvalType[1], tuple
         ):  # size constraints
             size = len(value) // 2 if fmt == "hex" else len(value)
 
@@ -0,0 +1,88 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import sys
+
+import jinja2
+from pysmi import debug
+from pysmi.compat import get_user_cache_dir
+
+#: templates shipped with pysmi
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+# Jinja2 environments by code generator class and template search path
+_environments = {}
+
+
+def get_bytecode_cache():
+    """Return Jinja2 cache of compiled templates kept in per-user directory.
+
+    Returns `None` if the directory is not usable, templates then get
+    compiled in every process.
+    """
+    cacheDir = os.path.join(get_user_cache_dir(), "templates")
+
+    try:
+        os.makedirs(cacheDir, exist_ok=True)
+
+    except OSError:
+        debug.logger & debug.FLAG_CODEGEN and debug.logger(
+            f"failure creating templates cache directory: {sys.exc_info()[1]}"
+        )
+        return None
+
+    return jinja2.FileSystemBytecodeCache(cacheDir)
+
+
+def get_template(codegen, templateName, dstTemplate=None):
+    """Return compiled Jinja2 template for *codegen* to render MIBs with.
+
+    Jinja2 environment is set up once per code generator class and
+    template search path, so templates are loaded and compiled just once
+    per process (and, thanks to the on-disk bytecode cache, just once
+    after they change). Template files are checked for modification on
+    each call, so that edited templates are picked up.
+
+    Args:
+        codegen: code generator class, its *TEMPLATE_FILTERS* get
+            registered with the environment
+        templateName: name of the template shipped with pysmi
+        dstTemplate: path to the template to use instead
+
+    Raises:
+        TemplateError: if template could not be loaded or compiled
+    """
+    searchPath = (TEMPLATES_DIR,)
+
+    if dstTemplate:
+        searchPath = (os.path.dirname(os.path.abspath(dstTemplate)),) + searchPath
+
+    key = codegen, searchPath
+
+    env = _environments.get(key)
+
+    if env is None:
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(searchPath),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=True,
+            bytecode_cache=get_bytecode_cache(),
+        )
+
+        env.filters.update(codegen.TEMPLATE_FILTERS)
+
+        env = _environments.setdefault(key, env)
+
+        debug.logger & debug.FLAG_CODEGEN and debug.logger(
+            f"templates environment set up for {codegen.__name__} at {', '.join(searchPath)}"
+        )
+
+    if dstTemplate:
+        return env.get_template(os.path.basename(dstTemplate))
+
+    return env.get_template(templateName)
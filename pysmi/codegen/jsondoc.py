@@ -4,7 +4,6 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: https://www.pysnmp.com/pysmi/license.html
 #
-import os
 import sys
 from collections import OrderedDict
 
@@ -13,6 +12,7 @@ import jinja2
 from pysmi import debug, error
 from pysmi.codegen import jfilters
 from pysmi.codegen.intermediate import IntermediateCodeGen
+from pysmi.codegen.jenv import get_template
 
 try:
     import json
@@ -32,29 +32,17 @@ class JsonCodeGen(IntermediateCodeGen):
 
     TEMPLATE_NAME = "jsondoc/base.j2"
 
+    TEMPLATE_FILTERS = {"capfirst": jfilters.capfirst}
+
     def gen_code(self, ast, symbolTable, **kwargs):
         mibInfo, context = IntermediateCodeGen.gen_code(
             self, ast, symbolTable, **kwargs
         )
 
-        # TODO: reduce code duplication with the other codegens
-
-        searchPath = [os.path.join(os.path.dirname(__file__), "templates")]
-
         dstTemplate = kwargs.get("dstTemplate")
-        if dstTemplate:
-            searchPath.insert(0, os.path.dirname(os.path.abspath(dstTemplate)))
-
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(searchPath),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
-
-        env.filters["capfirst"] = jfilters.capfirst
 
         try:
-            tmpl = env.get_template(dstTemplate or self.TEMPLATE_NAME)
+            tmpl = get_template(self.__class__, self.TEMPLATE_NAME, dstTemplate)
             text = tmpl.render(mib=context)
 
         except jinja2.exceptions.TemplateError:
@@ -4,14 +4,14 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: https://www.pysnmp.com/pysmi/license.html
 #
-import os
 import sys
 from collections import OrderedDict
 
 import jinja2
 from pysmi import debug, error
-from pysmi.codegen import jfilters
+from pysmi.codegen import emitter, jfilters
 from pysmi.codegen.intermediate import IntermediateCodeGen
+from pysmi.codegen.jenv import get_template
 from pysmi.mibinfo import MibInfo
 
 
@@ -29,6 +29,13 @@ class PySnmpCodeGen(IntermediateCodeGen):
 
     TEMPLATE_NAME = "pysnmp/mib-definitions.j2"
 
+    TEMPLATE_FILTERS = {
+        "capfirst": jfilters.capfirst,
+        "bitstring": jfilters.bitstring,
+        "pythonsym": jfilters.pythonsym,
+        "pythonstr": jfilters.pythonstr,
+    }
+
     SMI_OBJECTS = {
         "MODULE-IDENTITY": ["ModuleIdentity"],
         "OBJECT-TYPE": ["MibScalar", "MibTable", "MibTableRow", "MibTableColumn"],
@@ -129,35 +136,30 @@ class PySnmpCodeGen(IntermediateCodeGen):
 
         # Render Python code
 
-        searchPath = [os.path.join(os.path.dirname(__file__), "templates")]
-
         # TODO: add unit test on custom template
 
         dstTemplate = kwargs.get("dstTemplate")
-        if dstTemplate:
-            searchPath.insert(0, os.path.dirname(os.path.abspath(dstTemplate)))
 
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(searchPath),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        renderer = kwargs.get("renderer", "template")
+
+        if renderer not in ("template", "direct", "compact"):
+            raise error.PySmiCodegenError(f"Unknown renderer {renderer}")
 
-        env.filters["capfirst"] = jfilters.capfirst
-        env.filters["bitstring"] = jfilters.bitstring
-        env.filters["pythonsym"] = jfilters.pythonsym
-        env.filters["pythonstr"] = jfilters.pythonstr
+        # custom templates can only be rendered by Jinja2
+        if renderer != "template" and not dstTemplate:
+            text = emitter.render_mib(context, compact=renderer == "compact")
 
-        try:
-            tmpl = env.get_template(dstTemplate or self.TEMPLATE_NAME)
-            text = tmpl.render(mib=context)
+        else:
+            try:
+                tmpl = get_template(self.__class__, self.TEMPLATE_NAME, dstTemplate)
+                text = tmpl.render(mib=context)
 
-        except jinja2.exceptions.TemplateError:
-            err = sys.exc_info()[1]
-            raise error.PySmiCodegenError(f"Jinja template rendering error: {err}")
+            except jinja2.exceptions.TemplateError:
+                err = sys.exc_info()[1]
+                raise error.PySmiCodegenError(f"Jinja template rendering error: {err}")
 
         debug.logger & debug.FLAG_CODEGEN and debug.logger(
-            f"canonical MIB name {mibInfo.name} ({mibInfo.identity}), imported MIB(s) {','.join(mibInfo.imported) or '<none>'}, rendered from {dstTemplate}, Python code size {len(text)} bytes"
+            f"canonical MIB name {mibInfo.name} ({mibInfo.identity}), imported MIB(s) {','.join(mibInfo.imported) or '<none>'}, rendered from {dstTemplate or renderer}, Python code size {len(text)} bytes"
         )
 
         return mibInfo, text
@@ -4,6 +4,7 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: https://www.pysnmp.com/pysmi/license.html
 #
+import os
 import sys
 
 
@@ -17,3 +18,16 @@ def decode(s):
     if isinstance(s, bytes):
         s = s.decode("utf-8", "ignore")
     return s
+
+
+def get_user_cache_dir():
+    """Return per-user directory for pysmi to cache data at."""
+    if sys.platform[:3] == "win":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+
+    return os.path.join(base, "pysmi")
@@ -5,19 +5,28 @@
 # License: https://www.pysnmp.com/pysmi/license.html
 #
 import getpass
+import heapq
+import itertools
+import pickle
 import platform
 import sys
 import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from pysmi import __name__ as package_name
 from pysmi import __version__ as package_version
 from pysmi import debug
 from pysmi import error
 from pysmi.borrower.base import AbstractBorrower
+from pysmi.cache.base import AbstractCache
 from pysmi.codegen.base import AbstractCodeGen
 from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.manifest import BuildManifest
 from pysmi.mibinfo import MibInfo
+from pysmi.parser.smi import compact_ast
+from pysmi.planner import BuildPlan, plan_mibs
+from pysmi.probe import split_mib
 from pysmi.reader.base import AbstractReader
 from pysmi.searcher.base import AbstractSearcher
 from pysmi.writer.base import AbstractWriter
@@ -37,10 +46,27 @@ class MibStatus(str):
     * *unprocessed* - MIB transformation required but waived for some reason
     * *missing* - ASN.1 MIB source can't be found
     * *borrowed* - MIB transformation failed but pre-transformed version was used
+
+    Statuses reported by *MibCompiler* also carry processing statistics:
+
+    * *timings* - seconds spent on each stage of MIB processing: *read*,
+      *parse*, *symtable*, *search*, *codegen*, *borrow* and *write*
+    * *bytesRead* - size of ASN.1 MIB text(s) read
+    * *cacheHits* - number of parse results taken from cache
     """
 
+    #: seconds spent per processing stage, `None` if not accounted
+    timings: "dict | None" = None
+
+    #: size of ASN.1 MIB text(s) read
+    bytesRead = 0
+
+    #: number of parse results taken from cache
+    cacheHits = 0
+
     def set_options(self, **kwargs):
         n = self.__class__(self)
+        n.__dict__.update(self.__dict__)
         for k in kwargs:
             setattr(n, k, kwargs[k])
         return n
@@ -54,6 +80,268 @@ status_missing = MibStatus("missing")
 status_borrowed = MibStatus("borrowed")
 
 
+def new_stats():
+    """Create empty MIB processing statistics."""
+    return {"timings": {}, "bytesRead": 0, "cacheHits": 0}
+
+
+def merge_stats(stats, other):
+    """Add up MIB processing statistics *other* to *stats*."""
+    for stage, elapsed in other["timings"].items():
+        stats["timings"][stage] = stats["timings"].get(stage, 0.0) + elapsed
+
+    stats["bytesRead"] += other["bytesRead"]
+    stats["cacheHits"] += other["cacheHits"]
+
+
+def timed(stats, stage, func, *args, **kwargs):
+    """Call *func* accounting time it takes to *stage* in *stats*."""
+    started = time.perf_counter()
+
+    try:
+        return func(*args, **kwargs)
+
+    finally:
+        elapsed = time.perf_counter() - started
+
+        stats["timings"][stage] = stats["timings"].get(stage, 0.0) + elapsed
+
+
+# MIB files this large get split into modules parsed in parallel
+bundleSize = 1000000
+
+
+def parse_mib(parser, data, cache=None, stats=None, genTexts=True, jobs=1):
+    """Parse MIB text into a list of ASTs, one per MIB module in it.
+
+    If *cache* is given, ASTs of previously parsed MIB texts are taken
+    from it rather than produced by the parser. Cache hits are counted
+    in *stats*, if given. Unless *genTexts* is set, MIB texts that code
+    generators would discard are left out of the ASTs. MIB texts of
+    *bundleSize* characters or more are parsed as per *parse_bundle*.
+    """
+    genTexts = bool(genTexts)
+
+    if cache is not None:
+        key = cache.get_mib_key("ast", parser, data, genTexts=genTexts)
+
+        mibTrees = cache.get_data(key)
+
+        if mibTrees is not None:
+            if stats is not None:
+                stats["cacheHits"] += 1
+
+            return mibTrees
+
+    if jobs > 1 and len(data) >= bundleSize:
+        mibTrees = parse_bundle(parser, data, genTexts, jobs)
+
+    else:
+        mibTrees = parser.parse(data, genTexts=genTexts)
+
+    if cache is not None:
+        cache.put_data(key, mibTrees)
+
+    return mibTrees
+
+
+def parse_bundle(parser, data, genTexts=True, jobs=1):
+    """Parse MIB text holding many MIB modules with up to *jobs* processes.
+
+    MIB text is split into MIB modules (see *split_mib*), which are then
+    parsed in worker processes. ASTs come out in the order of modules
+    in MIB text, errors carry line numbers of the whole MIB text. Should
+    more than one module fail to parse, the first failure is reported.
+    """
+    chunks = split_mib(data)
+
+    if jobs < 2 or len(chunks) < 2:
+        return parser.parse(data, genTexts=genTexts)
+
+    jobs = min(jobs, len(chunks))
+
+    debug.logger & debug.FLAG_COMPILER and debug.logger(
+        f"parsing {len(chunks)} MIB modules with {jobs} worker processes"
+    )
+
+    pool = ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(parser, genTexts)
+    )
+
+    mibTrees = []
+
+    try:
+        for trees in pool.map(
+            _parse_in_worker,
+            *zip(*chunks),
+            chunksize=max(1, len(chunks) // (jobs * 4)),
+        ):
+            mibTrees.extend(trees)
+
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    return mibTrees
+
+
+def fetch_and_parse(
+    sources,
+    parser,
+    symbolgen,
+    mibname,
+    cache=None,
+    keepTrees=True,
+    genTexts=True,
+    jobs=1,
+    maxSize=None,
+):
+    """Fetch MIB by name from the first capable source and parse it.
+
+    Each source is tried in turn until one of them yields a MIB that
+    parses. Every attempt is reported back as a tuple of source index,
+    *MibInfo* of the MIB file, MIB text, a list of parsed `(mibInfo,
+    symbolTable, mibTree)` tuples, an exception (`None` if the attempt
+    succeeded) and processing statistics (see *new_stats*).
+
+    If *cache* is given, symbol tables and ASTs of previously parsed MIB
+    texts are taken from it. When symbol tables are found in the cache,
+    MIB text is not parsed at all: `mibTree` is `None` and MIB text is
+    reported instead so that it can be parsed later if need be. Otherwise
+    MIB text is not reported.
+
+    If *keepTrees* is false, neither ASTs nor MIB text are reported, just
+    symbol tables. ASTs are parsed as per *genTexts* and *jobs* (see
+    *parse_mib*). If *maxSize* is given, MIB texts of that many characters
+    or more are not parsed here: `None` is returned instead, so that the
+    caller can parse them with more processes.
+
+    Unlike *MibCompiler.compile*, this function does not depend on
+    compiler state, so it can run in a separate process.
+    """
+    attempts = []
+
+    for index, source in enumerate(sources):
+        debug.logger & debug.FLAG_COMPILER and debug.logger(f"trying source {source}")
+
+        fileInfo = None
+        results = []
+        stats = new_stats()
+
+        try:
+            fileInfo, fileData = timed(stats, "read", source.get_data, mibname)
+
+            fileInfo.digest = BuildManifest.get_digest(fileData)
+
+            stats["bytesRead"] += len(fileData.encode("utf-8", "surrogateescape"))
+
+            symbolTables = None
+
+            if cache is not None:
+                # symbol tables do not depend on MIB texts
+                key = cache.get_mib_key("symtable", parser, fileData)
+
+                symbolTables = timed(stats, "parse", cache.get_data, key)
+
+            if (
+                symbolTables is None
+                and maxSize is not None
+                and len(fileData) >= maxSize
+            ):
+                return None
+
+            if symbolTables is not None:
+                stats["cacheHits"] += 1
+
+                results = [
+                    (mibInfo, symbolTable, None)
+                    for mibInfo, symbolTable in symbolTables
+                ]
+
+                if not keepTrees:
+                    fileData = None
+
+                attempts.append((index, fileInfo, fileData, results, None, stats))
+                break
+
+            for mibTree in timed(
+                stats,
+                "parse",
+                parse_mib,
+                parser,
+                fileData,
+                cache,
+                stats,
+                genTexts,
+                jobs,
+            ):
+                mibInfo, symbolTable = timed(
+                    stats, "symtable", symbolgen.gen_code, mibTree, {}
+                )
+
+                results.append((mibInfo, symbolTable, keepTrees and mibTree or None))
+
+            if cache is not None:
+                cache.put_data(key, [(x[0], x[1]) for x in results])
+
+        except (UnicodeDecodeError, error.PySmiError) as exc:
+            attempts.append((index, fileInfo, None, results, exc, stats))
+            continue
+
+        attempts.append((index, fileInfo, None, results, None, stats))
+        break
+
+    return attempts
+
+
+# Per-process state of a worker, set up once by the pool initializer
+_worker = ()
+
+
+def _is_picklable(obj):
+    """Tell whether *obj* can be shipped to a worker process."""
+    try:
+        pickle.dumps(obj)
+
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+
+    return True
+
+
+def _init_worker(*state):
+    global _worker
+    _worker = state
+
+
+def _fetch_and_parse_in_worker(mibname):
+    # bundles are left to the coordinator, which parses them with its own
+    # worker processes rather than with a pool per worker
+    sources, parser, symbolgen, cache, keepTrees, genTexts, maxSize = _worker
+    return fetch_and_parse(
+        sources, parser, symbolgen, mibname, cache, keepTrees, genTexts, 1, maxSize
+    )
+
+
+def _parse_in_worker(lineno, data):
+    parser, genTexts = _worker
+    return parser.parse(data, genTexts=genTexts, lineno=lineno)
+
+
+def _gen_code_in_worker(mibTree, comments):
+    codegen, symbolTableMap, codegenOptions = _worker
+    stats = new_stats()
+    result = timed(
+        stats,
+        "codegen",
+        codegen.gen_code,
+        mibTree,
+        symbolTableMap,
+        comments=comments,
+        **codegenOptions,
+    )
+    return result, stats
+
+
 class MibCompiler:
     """Top-level, user-facing, composite MIB compiler object.
 
@@ -63,6 +351,7 @@ class MibCompiler:
       * *readers* - to acquire ASN.1 MIB data
       * *searchers* - to see if transformed MIB already exists and no processing is necessary
       * *parser* - to parse ASN.1 MIB into AST
+      * *cache* - to reuse symbol tables and ASTs of unchanged ASN.1 MIBs
       * *code generator* - to perform actual MIB transformation
       * *borrowers* - to fetch pre-transformed MIB if transformation is impossible
       * *writer* - to store transformed MIB data
@@ -73,13 +362,16 @@ class MibCompiler:
     Optional components could be set or modified at later phases of MibCompiler
     life. Unlike singular, required components, optional one can be present
     in sequences to address many possible sources of data. They are
-    *readers*, *searchers* and *borrowers*.
+    *readers*, *searchers* and *borrowers*. The optional *cache* and build
+    *manifest* are singular.
     """
 
     indexFile = "index"
     _searchers: list[AbstractSearcher]
     _sources: list[AbstractReader]
     _borrowers: list[AbstractBorrower]
+    _cache: "AbstractCache | None"
+    _manifest: "BuildManifest | None"
     _parsedMibs: dict[str, tuple]
 
     failedMibs: dict[str, error.PySmiError]
@@ -99,6 +391,8 @@ class MibCompiler:
         self._sources = []
         self._searchers = []
         self._borrowers = []
+        self._cache = None
+        self._manifest = None
 
     def add_sources(self, *sources):
         """Add more ASN.1 MIB source repositories.
@@ -168,6 +462,55 @@ class MibCompiler:
 
         return self
 
+    def set_cache(self, cache):
+        """Use cache of MIB processing results.
+
+        MibCompiler.compile will look up symbol tables and ASTs of fetched
+        ASN.1 MIBs in the *cache* by MIB text contents and grammar, and
+        only parse MIBs that are not there. Dependencies found in the
+        cache are not parsed unless code has to be generated for them.
+
+        Args:
+            cache: cache object or `None` to stop caching
+
+        Returns:
+            reference to itself (can be used for call chaining)
+
+        """
+        self._cache = cache
+
+        debug.logger & debug.FLAG_COMPILER and debug.logger(
+            f"current MIB cache: {self._cache}"
+        )
+
+        return self
+
+    def set_manifest(self, manifest):
+        """Use build manifest to decide which MIBs need rebuilding.
+
+        MibCompiler.compile will record source hashes and dependencies of
+        the MIBs it writes or finds up to date in the *manifest*, other
+        MIBs are dropped from it. On subsequent runs, MIBs
+        known to the manifest are rebuilt if and only if their source or
+        any MIB they depend on changed. MIBs not in the manifest are
+        rebuilt if their source is newer than transformed MIB.
+
+        Args:
+            manifest: build manifest object or `None` to compare file
+                modification times only
+
+        Returns:
+            reference to itself (can be used for call chaining)
+
+        """
+        self._manifest = manifest
+
+        debug.logger & debug.FLAG_COMPILER and debug.logger(
+            f"current build manifest: {self._manifest}"
+        )
+
+        return self
+
     def _get_system_info(self):
         # Gather platform information
         platform_info = (
@@ -181,6 +524,16 @@ class MibCompiler:
 
         return platform_info, user_info
 
+    def _get_comments(self, fileInfo):
+        platform_info, user_info = self._get_system_info()
+
+        return [
+            f"ASN.1 source {fileInfo.path}",
+            f"Produced by {package_name}-{package_version} at {time.asctime()}",
+            f"On host {platform_info[1]} platform {platform_info[0]} version {platform_info[2]} by user {user_info[0]}",
+            f"Using Python version {sys.version.splitlines()[0]}",
+        ]
+
     def compile(self, *mibnames, **options):
         """Transform requested and possibly referred MIBs.
 
@@ -204,133 +557,499 @@ class MibCompiler:
             mibnames: list of ASN.1 MIBs names
             options: options that affect the way PySMI components work
 
+        Keyword Args:
+            jobs (int): number of worker processes to fetch, parse and
+                generate code for MIBs with. The same number of threads
+                store the generated MIBs, so the writer must tolerate
+                concurrent calls. Sources, parser, code generator and
+                options are shipped to the workers, so they must be
+                picklable unless processes are forked. Code is generated
+                serially if code generation options (e.g. *textFilter*)
+                are not picklable. Modules of large
+                MIB files are parsed in parallel too (see *parse_mib*).
+                The results are the same as of the (default) serial run.
+            lowMemory (bool): keep memory footprint flat regardless of the
+                number of MIBs. Parsed MIBs are reduced to their symbol
+                tables right away. Then MIBs are read and parsed once
+                again (or taken from cache), one at a time, and each is
+                written right after code generation. Unless *ignoreErrors*
+                is set, no more MIBs are written after the first failure.
+            plan (bool): work out all dependencies up front (see *plan*)
+                and then process MIBs in the planned order, dependencies
+                first. With *jobs*, all planned MIBs are handed to the
+                workers at once rather than as they are discovered. Still,
+                MIBs are only processed once some processed MIB turns out
+                to import them, so MIB statuses are the same as without
+                a plan. A *BuildPlan* made for the same MIBs may be given
+                instead.
+            compactAst (bool): keep parsed MIBs in less memory by sharing
+                identifiers and equal AST pieces among all ASTs (see
+                *compact_ast*). Generated code is the same either way.
+            renderer (str): "direct" to have pysnmp code written by plain
+                Python code rather than rendered from the Jinja2 template
+                ("template", the default). Generated code is the same
+                either way, custom templates are always rendered by Jinja2.
+                "compact" to have it written in compact form, that creates
+                MIB objects out of a table (see *PySnmpCodeGen*).
+
         Returns:
             A dictionary of MIB module names processed (keys) and *MibStatus*
             class instances (values)
 
         """
         processed = {}
+
+        for mibname, status in self._compile(processed, mibnames, options):
+            pass
+
+        return processed
+
+    def compile_targets(self, targets, *mibnames, **options):
+        """Transform requested and possibly referred MIBs into several formats.
+
+        Works just like *compile*, except that MIBs are transformed for
+        each of the *targets*. MIBs are fetched, parsed and have their
+        symbol tables built just once, then each target checks which
+        MIBs need updating with its own searchers, generates code for
+        them from the very same ASTs and stores it with its own writer.
+        Code generator, writer, searchers and borrowers given to
+        *MibCompiler* itself are not used.
+
+        ASTs are kept until the last target is done with them. Build
+        manifest, if any, only records MIBs as up to date when they are up
+        to date for all targets.
+
+        Args:
+            targets: sequence of (*code generator*, *writer*, *searchers*)
+                tuples, optionally followed by *borrowers* to fetch
+                pre-transformed MIBs of target format from
+            mibnames: list of ASN.1 MIBs names
+            options: options that affect the way PySMI components work,
+                see *compile*
+
+        Returns:
+            A list of dictionaries of MIB module names processed (keys) and
+            *MibStatus* class instances (values), one per target
+
+        """
+        processed = [{} for _ in targets]
+
+        for index, mibname, status in self._compile_targets(
+            targets, processed, mibnames, options
+        ):
+            pass
+
+        return processed
+
+    def plan(self, *mibnames):
+        """Work out dependencies and processing order of MIBs.
+
+        Each MIB is fetched from *sources*, but rather than being parsed,
+        its IMPORTS are picked up by probing MIB module headers. The same
+        is done for the MIBs it imports, and so on. That is way cheaper
+        than compiling, so the plan can be used to estimate the amount of
+        work ahead and to schedule it.
+
+        Args:
+            mibnames: list of ASN.1 MIBs names
+
+        Returns:
+            *BuildPlan* class instance
+
+        """
+        return plan_mibs(self._sources, *mibnames)
+
+    def compile_iter(self, *mibnames, **options):
+        """Transform requested and possibly referred MIBs, one at a time.
+
+        Works just like *compile*, but reports MIBs as soon as they are
+        done with rather than all at once. Transformed MIBs are reported
+        right after they have been written, MIBs that needed no
+        transformation are reported as soon as that is known. Since a
+        failure of any MIB prevents writing unless *ignoreErrors* is set,
+        writing starts once all MIBs have been transformed.
+
+        ASTs and transformed MIBs are let go as soon as they are processed.
+        Build manifest, if any, is updated once the generator is exhausted.
+
+        Args:
+            mibnames: list of ASN.1 MIBs names
+            options: options that affect the way PySMI components work,
+                see *compile*
+
+        Yields:
+            MIB module name and its *MibStatus* class instance
+
+        """
+        yield from self._compile({}, mibnames, options)
+
+    def _compile(self, processed, mibnames, options):
+        target = self._codegen, self._writer, self._searchers, self._borrowers
+
+        for index, mibname, status in self._compile_targets(
+            [target], [processed], mibnames, options
+        ):
+            yield mibname, status
+
+    def _compile_targets(self, targets, processedByTarget, mibnames, options):
+        # MIBs are fetched, parsed and analyzed once, then built for each
+        # target in turn
+        processed = {}
         parsedMibs = {}
         failedMibs = {}
-        borrowedMibs = {}
-        builtMibs = {}
         symbolTableMap = {}
-        mibsToParse = [x for x in mibnames]
+        unparsedMibs = {}
+        builtFrom = {}
+        mibsToParse = []
         canonicalMibNames = {}
         seenMibNames = set()
+        mibStats = {}
+        sharedAst = {} if options.get("compactAst") else None
 
-        while mibsToParse:
-            mibname = mibsToParse.pop(0)
+        def get_stats(mibname):
+            if mibname not in mibStats:
+                mibStats[mibname] = new_stats()
 
-            if mibname in parsedMibs:
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"MIB {mibname} already parsed"
-                )
-                continue
+            return mibStats[mibname]
 
-            if mibname in failedMibs:
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"MIB {mibname} already failed"
-                )
-                continue
+        def register(mibname, attempts):
+            for index, fileInfo, fileData, results, exc, stats in attempts:
+                source = self._sources[index]
 
-            if mibname in seenMibNames:
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"MIB {mibname} already seen (cyclic dependency)"
+                # MIB file may be known under other name than its module(s)
+                names = [x[0].name for x in results]
+
+                merge_stats(
+                    get_stats(mibname if mibname in names or not names else names[0]),
+                    stats,
                 )
-                continue
 
-            seenMibNames.add(mibname)
+                for mibInfo, symbolTable, mibTree in results:
+                    if mibTree is not None and sharedAst is not None:
+                        mibTree = compact_ast(mibTree, sharedAst)
 
-            for source in self._sources:
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"trying source {source}"
-                )
+                    symbolTableMap[mibInfo.name] = symbolTable
 
-                try:
-                    fileInfo, fileData = source.get_data(mibname)
+                    parsedMibs[mibInfo.name] = fileInfo, mibInfo, mibTree
 
-                    for mibTree in self._parser.parse(fileData):
-                        mibInfo, symbolTable = self._symbolgen.gen_code(
-                            mibTree, symbolTableMap
-                        )
+                    builtFrom[mibInfo.name] = fileInfo.digest, mibInfo.imported
 
-                        symbolTableMap[mibInfo.name] = symbolTable
+                    if mibTree is None:
+                        unparsedMibs[mibInfo.name] = index, mibname, fileData
 
-                        parsedMibs[mibInfo.name] = fileInfo, mibInfo, mibTree
+                    if mibname in failedMibs:
+                        del failedMibs[mibname]
 
-                        if mibname in failedMibs:
-                            del failedMibs[mibname]
+                    enqueue(mibInfo.imported)
+                    prefetch(mibInfo.imported)
 
-                        mibsToParse.extend(mibInfo.imported)
+                    if fileInfo.name in mibnames:
+                        if mibInfo.name not in canonicalMibNames:
+                            canonicalMibNames[mibInfo.name] = []
+                        canonicalMibNames[mibInfo.name].append(fileInfo.name)
 
-                        if fileInfo.name in mibnames:
-                            if mibInfo.name not in canonicalMibNames:
-                                canonicalMibNames[mibInfo.name] = []
-                            canonicalMibNames[mibInfo.name].append(fileInfo.name)
+                    debug.logger & debug.FLAG_COMPILER and debug.logger(
+                        f"{mibInfo.name} ({mibname}) read from {fileInfo.path}, immediate dependencies: {', '.join(mibInfo.imported) or '<none>'}"
+                    )
 
-                        debug.logger & debug.FLAG_COMPILER and debug.logger(
-                            f"{mibInfo.name} ({mibname}) read from {fileInfo.path}, immediate dependencies: {', '.join(mibInfo.imported) or '<none>'}"
-                        )
+                if exc is None:
+                    return True
 
-                    break
-                except UnicodeDecodeError:
+                if isinstance(exc, UnicodeDecodeError):
                     debug.logger & debug.FLAG_COMPILER and debug.logger(
                         f"http exception {mibname} found at {source}"
                     )
                     continue
 
-                except error.PySmiReaderFileNotFoundError:
+                if isinstance(exc, error.PySmiReaderFileNotFoundError):
                     debug.logger & debug.FLAG_COMPILER and debug.logger(
                         f"no {mibname} found at {source}"
                     )
                     continue
 
-                except error.PySmiError as exc:
-                    exc.source = source
-                    exc.mibname = mibname
-                    exc.msg += f" at MIB {mibname}"
+                exc.source = source
+                exc.mibname = mibname
+                exc.msg += f" at MIB {mibname}"
+
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    f"{options.get('ignoreErrors') and 'ignoring ' or 'failing on '} {exc} from {source}"
+                )
+
+                failedMibs[mibname] = exc
+
+                processed[mibname] = status_failed.set_options(error=exc)
 
+            return False
+
+        jobs = options.get("jobs") or 1
+        lowMemory = options.get("lowMemory")
+
+        pool = None
+        futures = {}
+
+        def prefetch(names):
+            # Speculatively fetch and parse the dependency frontier in
+            # worker processes. Results are still consumed in the order
+            # of the serial run, so the outcome does not change.
+            if pool is None:
+                return
+
+            for name in names:
+                if (
+                    name in futures
+                    or name in parsedMibs
+                    or name in failedMibs
+                    or name in seenMibNames
+                ):
+                    continue
+
+                futures[name] = pool.submit(_fetch_and_parse_in_worker, name)
+
+        plan = options.get("plan") or ()
+
+        if plan and not isinstance(plan, BuildPlan):
+            plan = self.plan(*mibnames)
+
+        # planned order of MIBs, still MIBs are only processed once some
+        # processed MIB turns out to import them
+        planned = {x: n for n, x in enumerate(plan)}
+
+        # MIBs to process are taken in planned order, otherwise (and if
+        # not planned) in order of their discovery
+        discovered = itertools.count()
+
+        def enqueue(names):
+            for name in names:
+                if name in parsedMibs or name in failedMibs:
+                    continue
+
+                heapq.heappush(
+                    mibsToParse,
+                    (planned.get(name, len(planned)), next(discovered), name),
+                )
+
+        enqueue(mibnames)
+
+        if jobs > 1:
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"fetching and parsing MIBs with {jobs} worker processes"
+            )
+
+            pool = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(
+                    self._sources,
+                    self._parser,
+                    self._symbolgen,
+                    self._cache,
+                    not lowMemory,
+                    options.get("genTexts"),
+                    bundleSize,
+                ),
+            )
+
+        try:
+            prefetch([x for x in plan] + [x for x in mibnames])
+
+            while mibsToParse:
+                mibname = heapq.heappop(mibsToParse)[2]
+
+                if mibname in parsedMibs:
                     debug.logger & debug.FLAG_COMPILER and debug.logger(
-                        f"{options.get('ignoreErrors') and 'ignoring ' or 'failing on '} {exc} from {source}"
+                        f"MIB {mibname} already parsed"
                     )
+                    continue
 
-                    failedMibs[mibname] = exc
+                if mibname in failedMibs:
+                    debug.logger & debug.FLAG_COMPILER and debug.logger(
+                        f"MIB {mibname} already failed"
+                    )
+                    continue
 
-                    processed[mibname] = status_failed.set_options(error=exc)
+                if mibname in seenMibNames:
+                    debug.logger & debug.FLAG_COMPILER and debug.logger(
+                        f"MIB {mibname} already seen (cyclic dependency)"
+                    )
+                    continue
 
-            else:
-                exc = error.PySmiError(f"MIB source {mibname} not found")
-                exc.mibname = mibname
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"no {mibname} found anywhere"
-                )
+                seenMibNames.add(mibname)
+
+                attempts = None
+
+                if mibname in futures:
+                    attempts = futures.pop(mibname).result()
+
+                if attempts is None:
+                    attempts = fetch_and_parse(
+                        self._sources,
+                        self._parser,
+                        self._symbolgen,
+                        mibname,
+                        self._cache,
+                        not lowMemory,
+                        options.get("genTexts"),
+                        jobs,
+                    )
+
+                found = register(mibname, attempts)
+
+                # ASTs live on in parsedMibs only
+                del attempts
+
+                if not found:
+                    exc = error.PySmiError(f"MIB source {mibname} not found")
+                    exc.mibname = mibname
+                    debug.logger & debug.FLAG_COMPILER and debug.logger(
+                        f"no {mibname} found anywhere"
+                    )
+
+                    if mibname not in failedMibs:
+                        failedMibs[mibname] = exc
 
-                if mibname not in failedMibs:
-                    failedMibs[mibname] = exc
+                    if mibname not in processed:
+                        processed[mibname] = status_missing
 
-                if mibname not in processed:
-                    processed[mibname] = status_missing
+        finally:
+            if pool is not None:
+                for future in futures.values():
+                    future.cancel()
+
+                pool.shutdown()
 
         debug.logger & debug.FLAG_COMPILER and debug.logger(
             f"MIBs analyzed {len(parsedMibs)}, MIBs failed {len(failedMibs)}"
         )
 
+        state = dict(
+            analyzed=processed,
+            parsedMibs=parsedMibs,
+            failedMibs=failedMibs,
+            unparsedMibs=unparsedMibs,
+            symbolTableMap=symbolTableMap,
+            canonicalMibNames=canonicalMibNames,
+            mibStats=mibStats,
+            sharedAst=sharedAst,
+        )
+
+        # MIBs whose transformed version is known to be up to date, per target
+        freshMibs = [set() for _ in targets]
+
+        built = True
+
+        for index, target in enumerate(targets):
+            built = (
+                yield from self._build(
+                    index,
+                    target,
+                    processedByTarget[index],
+                    freshMibs[index],
+                    state,
+                    options,
+                    last=index == len(targets) - 1,
+                )
+            ) and built
+
+        if not built:
+            return
+
+        if self._manifest is not None and not options.get("dryRun"):
+            for mibname in processedByTarget[0]:
+                if mibname in builtFrom and all(mibname in x for x in freshMibs):
+                    self._manifest.update(mibname, *builtFrom[mibname])
+
+                else:
+                    self._manifest.remove(mibname)
+
+            self._manifest.save()
+
+    def _build(self, index, target, processed, fresh, state, options, last=True):
+        # Generate and store code of analyzed MIBs for one target, returns
+        # true unless storing MIBs was given up because of failures. MIBs
+        # written or found up to date by searchers are added to *fresh*.
+        # The *last* target takes over parsed MIBs from *state*
+        codegen, writer, searchers = target[:3]
+        borrowers = target[3] if len(target) > 3 else ()
+
+        processed.update(state["analyzed"])
+
+        if last:
+            # ASTs are let go as soon as they are processed
+            parsedMibs = state.pop("parsedMibs")
+            unparsedMibs = state.pop("unparsedMibs")
+
+        else:
+            parsedMibs = dict(state["parsedMibs"])
+            unparsedMibs = dict(state["unparsedMibs"])
+
+        failedMibs = dict(state["failedMibs"])
+        symbolTableMap = state["symbolTableMap"]
+        canonicalMibNames = state["canonicalMibNames"]
+        sharedAst = state["sharedAst"]
+        borrowedMibs = {}
+        builtMibs = {}
+        mibStats = {}
+
+        # statistics of fetching and parsing go to each target
+        for mibname, stats in state["mibStats"].items():
+            mibStats[mibname] = new_stats()
+            merge_stats(mibStats[mibname], stats)
+
+        def get_stats(mibname):
+            if mibname not in mibStats:
+                mibStats[mibname] = new_stats()
+
+            return mibStats[mibname]
+
+        def done(mibname):
+            # attach statistics to final MIB status
+            stats = mibStats.pop(mibname, None) or new_stats()
+
+            processed[mibname] = processed[mibname].set_options(**stats)
+
+            return index, mibname, processed[mibname]
+
+        jobs = options.get("jobs") or 1
+        lowMemory = options.get("lowMemory")
+
         #
         # See what MIBs need generating
         #
 
+        changedMibs = None
+
+        if self._manifest is not None and not options.get("rebuild"):
+            changedMibs = self._manifest.get_changed(
+                {x: parsedMibs[x][0].digest for x in parsedMibs},
+                {x: parsedMibs[x][1].imported for x in parsedMibs},
+            )
+
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"MIBs changed since last build: {', '.join(sorted(changedMibs)) or '<none>'}"
+            )
+
         for mibname in tuple(parsedMibs):
-            fileInfo, mibInfo, mibTree = parsedMibs[mibname]
+            fileInfo = parsedMibs[mibname][0]
 
             debug.logger & debug.FLAG_COMPILER and debug.logger(
                 f"checking if {mibname} requires updating"
             )
 
-            for searcher in self._searchers:
+            mtime, rebuild = fileInfo.mtime, options.get("rebuild")
+
+            if changedMibs is not None and mibname in self._manifest:
+                # any existing compiled MIB is fresh unless sources changed
+                mtime, rebuild = 0, mibname in changedMibs
+
+            for searcher in searchers:
                 try:
-                    searcher.file_exists(
-                        mibname, fileInfo.mtime, rebuild=options.get("rebuild")  # type: ignore
+                    timed(
+                        get_stats(mibname),
+                        "search",
+                        searcher.file_exists,
+                        mibname,
+                        mtime,
+                        rebuild=rebuild,
                     )
 
                 except error.PySmiFileNotFoundError:
@@ -345,6 +1064,8 @@ class MibCompiler:
                     )
                     del parsedMibs[mibname]
                     processed[mibname] = status_untouched
+                    fresh.add(mibname)
+                    yield done(mibname)
                     break
 
                 except error.PySmiError as exc:
@@ -367,6 +1088,7 @@ class MibCompiler:
                     )
                     del parsedMibs[mibname]
                     processed[mibname] = status_untouched
+                    yield done(mibname)
                     continue
 
         debug.logger & debug.FLAG_COMPILER and debug.logger(
@@ -377,55 +1099,239 @@ class MibCompiler:
         # Generate code for parsed MIBs
         #
 
-        for mibname in parsedMibs.copy():
+        codegenOptions = dict(
+            dstTemplate=options.get("dstTemplate"),
+            genTexts=options.get("genTexts"),
+            textFilter=options.get("textFilter"),
+            renderer=options.get("renderer", "template"),
+        )
+
+        def parse(mibname):
+            # MIB is known just by its symbol table, taken from cache or
+            # kept alone to save memory
             fileInfo, mibInfo, mibTree = parsedMibs[mibname]
+            index, name, fileData = unparsedMibs.pop(mibname)
 
             debug.logger & debug.FLAG_COMPILER and debug.logger(
-                f"compiling {mibname} read from {fileInfo.path}"
+                f"parsing {mibname} read from {fileInfo.path} for code generation"
             )
 
-            platform_info, user_info = self._get_system_info()
-
-            comments = [
-                f"ASN.1 source {fileInfo.path}",
-                f"Produced by {package_name}-{package_version} at {time.asctime()}",
-                f"On host {platform_info[1]} platform {platform_info[0]} version {platform_info[2]} by user {user_info[0]}",
-                f"Using Python version {sys.version.splitlines()[0]}",
-            ]
+            stats = get_stats(mibname)
 
             try:
-                mibInfo, mibData = self._codegen.gen_code(
-                    mibTree,
-                    symbolTableMap,
-                    comments=comments,
-                    dstTemplate=options.get("dstTemplate"),
-                    genTexts=options.get("genTexts"),
-                    textFilter=options.get("textFilter"),
+                if fileData is None:
+                    _, fileData = timed(
+                        stats, "read", self._sources[index].get_data, name
+                    )
+
+                    stats["bytesRead"] += len(
+                        fileData.encode("utf-8", "surrogateescape")
+                    )
+
+                for mibTree in timed(
+                    stats,
+                    "parse",
+                    parse_mib,
+                    self._parser,
+                    fileData,
+                    self._cache,
+                    stats,
+                    options.get("genTexts"),
+                    jobs,
+                ):
+                    if mibTree[0] == mibname:
+                        # symbol table generation alters AST the way code
+                        # generators expect it
+                        timed(stats, "symtable", self._symbolgen.gen_code, mibTree, {})
+
+                        if sharedAst is not None:
+                            mibTree = compact_ast(mibTree, sharedAst)
+
+                        parsedMibs[mibname] = fileInfo, mibInfo, mibTree
+
+                        # the other targets need not parse it once again
+                        if not lowMemory and not last:
+                            state["parsedMibs"][mibname] = parsedMibs[mibname]
+                            state["unparsedMibs"].pop(mibname, None)
+
+                        return True
+
+                raise error.PySmiError(f"MIB {mibname} not found in its source")
+
+            except error.PySmiError as exc:
+                exc.mibname = mibname
+                exc.msg += f" at MIB {mibname}"
+
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    f"error from {self._parser}: {exc}"
                 )
 
-                builtMibs[mibname] = fileInfo, mibInfo, mibData
+                processed[mibname] = status_failed.set_options(error=exc)
+
+                failedMibs[mibname] = exc
                 del parsedMibs[mibname]
 
+                return False
+
+        def generate(mibname, future=None):
+            fileInfo, mibInfo, mibTree = parsedMibs.pop(mibname)
+
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"compiling {mibname} read from {fileInfo.path}"
+            )
+
+            try:
+                if future is not None:
+                    (mibInfo, mibData), stats = future.result()
+
+                    merge_stats(get_stats(mibname), stats)
+
+                else:
+                    mibInfo, mibData = timed(
+                        get_stats(mibname),
+                        "codegen",
+                        codegen.gen_code,
+                        mibTree,
+                        symbolTableMap,
+                        comments=self._get_comments(fileInfo),
+                        **codegenOptions,
+                    )
+
+            except error.PySmiError as exc:
+                exc.handler = codegen
+                exc.mibname = mibname
+                exc.msg += f" at MIB {mibname}"
+
                 debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"{mibname} read from {fileInfo.path} and compiled by {self._writer}"
+                    f"error from {codegen}: {exc}"
                 )
 
+                processed[mibname] = status_failed.set_options(error=exc)
+
+                failedMibs[mibname] = exc
+
+                return False
+
+            builtMibs[mibname] = fileInfo, mibInfo, mibData
+
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"{mibname} read from {fileInfo.path} and compiled by {writer}"
+            )
+
+            return True
+
+        def store(mibname, future=None):
+            fileInfo, mibInfo, mibData = builtMibs.pop(mibname)
+
+            try:
+                if future is not None:
+                    future.result()
+
+                elif options.get("writeMibs", True):
+                    timed(
+                        get_stats(mibname),
+                        "write",
+                        writer.put_data,
+                        mibname,
+                        mibData,
+                        dryRun=options.get("dryRun"),
+                    )
+
             except error.PySmiError as exc:
-                exc.handler = self._codegen
+                exc.handler = codegen
                 exc.mibname = mibname
                 exc.msg += f" at MIB {mibname}"
 
                 debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"error from {self._codegen}: {exc}"
+                    f"error {exc} from {writer}"
                 )
 
                 processed[mibname] = status_failed.set_options(error=exc)
-
                 failedMibs[mibname] = exc
-                del parsedMibs[mibname]
+
+                return False
+
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"{mibname} stored by {writer}"
+            )
+
+            if mibname not in processed:
+                if options.get("writeMibs", True):
+                    fresh.add(mibname)
+
+                processed[mibname] = status_compiled.set_options(
+                    path=fileInfo.path,
+                    file=fileInfo.file,
+                    alias=fileInfo.name,
+                    oid=mibInfo.oid,
+                    oids=mibInfo.oids,
+                    identity=mibInfo.identity,
+                    revision=mibInfo.revision,
+                    enterprise=mibInfo.enterprise,
+                    compliance=mibInfo.compliance,
+                )
+
+            return True
+
+        if lowMemory:
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                "generating and storing MIBs one by one"
+            )
+
+            # only one AST at a time and no generated MIBs pile up
+            for mibname in parsedMibs.copy():
+                if failedMibs and not options.get("ignoreErrors"):
+                    del parsedMibs[mibname]
+                    processed[mibname] = status_unprocessed
+                    yield done(mibname)
+                    continue
+
+                if parse(mibname) and generate(mibname) and store(mibname):
+                    yield done(mibname)
+
+        else:
+            for mibname in parsedMibs.copy():
+                if parsedMibs[mibname][2] is None:
+                    parse(mibname)
+
+            pool = None
+            futures = {}
+
+            if jobs > 1 and len(parsedMibs) > 1 and not _is_picklable(codegenOptions):
+                # e.g. lambda as text filter, can not leave this process
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    "generating code serially, codegen options are not picklable"
+                )
+
+            elif jobs > 1 and len(parsedMibs) > 1:
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    f"generating code with {jobs} worker processes"
+                )
+
+                # each MIB only depends on the (now complete) symbol tables
+                pool = ProcessPoolExecutor(
+                    max_workers=jobs,
+                    initializer=_init_worker,
+                    initargs=(codegen, symbolTableMap, codegenOptions),
+                )
+
+                for mibname in parsedMibs:
+                    fileInfo, mibInfo, mibTree = parsedMibs[mibname]
+
+                    futures[mibname] = pool.submit(
+                        _gen_code_in_worker, mibTree, self._get_comments(fileInfo)
+                    )
+
+            try:
+                for mibname in parsedMibs.copy():
+                    generate(mibname, futures.pop(mibname, None))
+
+            finally:
+                if pool is not None:
+                    pool.shutdown()
 
         debug.logger & debug.FLAG_COMPILER and debug.logger(
-            f"MIBs built {len(parsedMibs)}, MIBs failed {len(failedMibs)}"
+            f"MIBs built {len(builtMibs)}, MIBs failed {len(failedMibs)}"
         )
 
         #
@@ -439,13 +1345,17 @@ class MibCompiler:
                 )
                 continue
 
-            for borrower in self._borrowers:
+            for borrower in borrowers:
                 debug.logger & debug.FLAG_COMPILER and debug.logger(
                     f"trying to borrow {mibname} from {borrower}"
                 )
                 try:
-                    fileInfo, fileData = borrower.get_data(
-                        mibname, genTexts=options.get("genTexts")
+                    fileInfo, fileData = timed(
+                        get_stats(mibname),
+                        "borrow",
+                        borrower.get_data,
+                        mibname,
+                        genTexts=options.get("genTexts"),
                     )
 
                     borrowedMibs[mibname] = (
@@ -481,10 +1391,15 @@ class MibCompiler:
 
             fileInfo, mibInfo, mibData = borrowedMibs[mibname]
 
-            for searcher in self._searchers:
+            for searcher in searchers:
                 try:
-                    searcher.file_exists(
-                        mibname, fileInfo.mtime, rebuild=options.get("rebuild")  # type: ignore
+                    timed(
+                        get_stats(mibname),
+                        "search",
+                        searcher.file_exists,
+                        mibname,
+                        fileInfo.mtime,
+                        rebuild=options.get("rebuild"),
                     )
 
                 except error.PySmiFileNotFoundError:
@@ -499,6 +1414,7 @@ class MibCompiler:
                     )
                     del borrowedMibs[mibname]
                     processed[mibname] = status_untouched
+                    yield done(mibname)
                     break
 
                 except error.PySmiError as exc:
@@ -521,6 +1437,7 @@ class MibCompiler:
                         f"excluding imported MIB {mibname} from borrowing"
                     )
                     processed[mibname] = status_untouched
+                    yield done(mibname)
 
                 else:
                     debug.logger & debug.FLAG_COMPILER and debug.logger(
@@ -538,6 +1455,14 @@ class MibCompiler:
             f"MIBs built {len(builtMibs)}, MIBs failed {len(failedMibs)}"
         )
 
+        # failures are final once borrowing is over
+        for mibname in tuple(processed):
+            if mibname not in builtMibs and processed[mibname] in (
+                "failed",
+                "missing",
+            ):
+                yield done(mibname)
+
         #
         # We could attempt to ignore missing/failed MIBs
         #
@@ -550,7 +1475,9 @@ class MibCompiler:
             for mibname in builtMibs:
                 processed[mibname] = status_unprocessed
 
-            return processed
+                yield done(mibname)
+
+            return False
 
         debug.logger & debug.FLAG_COMPILER and debug.logger(
             f"proceeding with built MIBs {', '.join(builtMibs)}, failed MIBs {', '.join(failedMibs)}"
@@ -560,46 +1487,38 @@ class MibCompiler:
         # Store compiled MIBs
         #
 
-        for mibname in builtMibs.copy():
-            fileInfo, mibInfo, mibData = builtMibs[mibname]
+        pool = None
+        futures = {}
 
-            try:
-                if options.get("writeMibs", True):
-                    self._writer.put_data(
-                        mibname, mibData, dryRun=options.get("dryRun")  # type: ignore
-                    )
+        if jobs > 1 and options.get("writeMibs", True) and len(builtMibs) > 1:
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"storing MIBs with {jobs} threads"
+            )
 
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"{mibname} stored by {self._writer}"
-                )
+            pool = ThreadPoolExecutor(max_workers=jobs)
 
-                del builtMibs[mibname]
-
-                if mibname not in processed:
-                    processed[mibname] = status_compiled.set_options(
-                        path=fileInfo.path,
-                        file=fileInfo.file,
-                        alias=fileInfo.name,
-                        oid=mibInfo.oid,
-                        oids=mibInfo.oids,
-                        identity=mibInfo.identity,
-                        revision=mibInfo.revision,
-                        enterprise=mibInfo.enterprise,
-                        compliance=mibInfo.compliance,
-                    )
+            for mibname in builtMibs:
+                fileInfo, mibInfo, mibData = builtMibs[mibname]
+
+                futures[mibname] = pool.submit(
+                    timed,
+                    get_stats(mibname),
+                    "write",
+                    writer.put_data,
+                    mibname,
+                    mibData,
+                    dryRun=options.get("dryRun"),
+                )
 
-            except error.PySmiError as exc:
-                exc.handler = self._codegen
-                exc.mibname = mibname
-                exc.msg += f" at MIB {mibname}"
+        try:
+            for mibname in builtMibs.copy():
+                store(mibname, futures.pop(mibname, None))
 
-                debug.logger & debug.FLAG_COMPILER and debug.logger(
-                    f"error {exc} from {self._writer}"
-                )
+                yield done(mibname)
 
-                processed[mibname] = status_failed.set_options(error=exc)
-                failedMibs[mibname] = exc
-                del builtMibs[mibname]
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         modified_mibs = [
             x for x in processed if processed[x] in ("compiled", "borrowed")
@@ -608,7 +1527,7 @@ class MibCompiler:
             f"MIBs modified: {', '.join(modified_mibs)}"
         )
 
-        return processed
+        return True
 
     def build_index(self, processedMibs, **options):
         platform_info, user_info = self._get_system_info()
@@ -641,6 +1560,43 @@ class MibCompiler:
 
             raise exc
 
+    @staticmethod
+    def build_report(processedMibs):
+        """Summarize MIB processing statistics.
+
+        Args:
+            processedMibs: dictionary of MIB names and *MibStatus* class
+                instances as returned by *compile*
+
+        Returns:
+            JSON-serializable dictionary holding per-MIB statistics under
+            *mibs*, the number of MIBs per status under *statuses* and
+            the totals of *timings*, *bytesRead* and *cacheHits*
+
+        """
+        report = {"mibs": {}, "statuses": {}}
+
+        total = new_stats()
+
+        for mibname in sorted(processedMibs):
+            status = processedMibs[mibname]
+
+            stats = {
+                "timings": dict(status.timings or {}),
+                "bytesRead": status.bytesRead,
+                "cacheHits": status.cacheHits,
+            }
+
+            merge_stats(total, stats)
+
+            report["mibs"][mibname] = dict(stats, status=str(status))
+
+            report["statuses"][str(status)] = report["statuses"].get(str(status), 0) + 1
+
+        report.update(total)
+
+        return report
+
     # compatibility with legacy code
     # Old to new attribute mapping
     deprecated_attributes = {
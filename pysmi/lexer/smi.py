@@ -4,6 +4,7 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: https://www.pysnmp.com/pysmi/license.html
 #
+import functools
 import re
 
 import ply.lex as lex
@@ -15,6 +16,9 @@ UNSIGNED32_MAX = 4294967295
 UNSIGNED64_MAX = 18446744073709551615
 LEX_VERSION = [int(x) for x in lex.__version__.split(".")]
 
+# Stands in for the texts lexer is told to skip, see *SmiV2Lexer.skipTexts*
+SKIPPED_TEXT = '""'
+
 
 # Do not overload single lexer methods - overload all or none of them!
 # noinspection PySingleQuotedDocstring,PyMethodMayBeStatic,PyIncorrectDocstring
@@ -176,34 +180,70 @@ class SmiV2Lexer(AbstractLexer):
 
     t_ignore = " \t"
 
+    # types of tokens followed by free-form texts
+    text_tokens = ("DESCRIPTION", "REFERENCE", "ORGANIZATION", "CONTACT_INFO")
+
+    #: when set, texts following *text_tokens* (except revision
+    #: descriptions) are replaced with *SKIPPED_TEXT*
+    skipTexts = False
+
     def __init__(self, tempdir=""):
         self._tempdir = tempdir
-        self.lexer = None
-        self.reset()
-
-    def reset(self):
-        if LEX_VERSION < [3, 0]:
-            self.lexer = lex.lex(
-                module=self, reflags=re.DOTALL, outputdir=self._tempdir, debug=False
-            )
-        else:
-            if debug.logger & debug.FLAG_LEXER:
-                logger = debug.logger.get_current_logger()
+        self._textAt = -1
+        self._revision = False
+        self.lexer = self.build_lexer()
+
+    def build_lexer(self):
+        """Return Ply lexer bound to this instance.
+
+        Ply lexer construction (collecting and compiling all token rules)
+        is costly, so it only happens once per lexer class. Instances get
+        a clone of the class-wide lexer.
+        """
+        lexer = self.__class__.__dict__.get("_lexer")
+
+        if lexer is None:
+            if LEX_VERSION < [3, 0]:
+                lexer = lex.lex(
+                    module=self, reflags=re.DOTALL, outputdir=self._tempdir, debug=False
+                )
             else:
-                logger = lex.NullLogger()
+                if debug.logger & debug.FLAG_LEXER:
+                    logger = debug.logger.get_current_logger()
+                else:
+                    logger = lex.NullLogger()
+
+                if debug.logger & debug.FLAG_GRAMMAR:
+                    debuglogger = debug.logger.get_current_logger()
+                else:
+                    debuglogger = None
+
+                lexer = lex.lex(
+                    module=self,
+                    reflags=re.DOTALL,
+                    outputdir=self._tempdir,
+                    debuglog=debuglogger,
+                    errorlog=logger,
+                )
 
-            if debug.logger & debug.FLAG_GRAMMAR:
-                debuglogger = debug.logger.get_current_logger()
-            else:
-                debuglogger = None
-
-            self.lexer = lex.lex(
-                module=self,
-                reflags=re.DOTALL,
-                outputdir=self._tempdir,
-                debuglog=debuglogger,
-                errorlog=logger,
-            )
+            # keep the class-wide lexer unbound from this instance
+            lexer = lexer.clone(self.__class__)
+            self.__class__._lexer = lexer
+
+        lexer = lexer.clone(self)
+
+        # Ply does not rebind rules of the current state on cloning
+        lexer.begin(lexer.lexstate)
+
+        return lexer
+
+    def reset(self):
+        # Ply lexer keeps no per-input state other than line number and
+        # lexer state, the rest is reset by lexer.input()
+        self.lexer.lineno = 1
+        self.lexer.begin("INITIAL")
+        self._textAt = -1
+        self._revision = False
 
     def t_newline(self, t):
         r"\r\n|\n|\r"
@@ -294,6 +334,16 @@ class SmiV2Lexer(AbstractLexer):
 
         t.type = self.reserved.get(t.value, "UPPERCASE_IDENTIFIER")
 
+        if self.skipTexts:
+            if t.type == "REVISION":
+                self._revision = True
+
+            elif t.type in self.text_tokens:
+                if self._revision:
+                    self._revision = False
+                else:
+                    self._textAt = t.lexer.lexpos
+
         return t
 
     def t_LOWERCASE_IDENTIFIER(self, t):
@@ -358,9 +408,26 @@ class SmiV2Lexer(AbstractLexer):
 
     def t_QUOTED_STRING(self, t):
         r"\"[^\"]*\""
-        t.lexer.lineno += len(re.findall(r"\r\n|\n|\r", t.value))
+        t.lexer.lineno += self.count_lines(t.value)
+
+        if self._textAt >= 0:
+            if self.is_text(t.lexer.lexdata, self._textAt, t.lexpos):
+                t.value = SKIPPED_TEXT
+
+            self._textAt = -1
+
         return t
 
+    @staticmethod
+    def count_lines(text):
+        # same as counting r"\r\n|\n|\r" matches
+        return text.count("\n") + text.count("\r") - text.count("\r\n")
+
+    @staticmethod
+    def is_text(data, textAt, pos):
+        # nothing but whitespace in between text token and quoted string
+        return not data[textAt:pos].strip(" \t\r\n")
+
     def t_error(self, t):
         raise error.PySmiLexerError(
             f"Illegal character '{t.value[0]}', {len(t.value) - 1} characters left unparsed at this stage",
@@ -369,6 +436,278 @@ class SmiV2Lexer(AbstractLexer):
         # t.lexer.skip(1)
 
 
+class Token:
+    """Token produced by *SmiV2RegexLexer*, interchangeable with Ply's."""
+
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __str__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    def __repr__(self):
+        return str(self)
+
+
+def _master_re(prefix, *rules):
+    rules = "|".join(f"(?P<{name}>{regex})" for name, regex in rules)
+
+    return re.compile(f"{prefix}(?:{rules})", re.DOTALL)
+
+
+# noinspection PyMethodMayBeStatic
+class SmiV2RegexLexer(SmiV2Lexer):
+    """SMI lexer scanning MIB text with one compiled regular expression.
+
+    Produces the same tokens (including line numbers and errors) as the
+    Ply-based *SmiV2Lexer*, but rather than calling a method per token it
+    handles all tokens in a single loop and looks reserved and forbidden
+    words up in hash tables. Token rules and their precedence are those
+    of *SmiV2Lexer*, whitespace, newlines and comments preceding a token
+    are skipped at once.
+    """
+
+    _newline = SmiV2Lexer.t_newline.__doc__
+
+    # newlines and comments (i.e. "--" up to the end of line) along
+    # with ignored characters in between
+    _skip = rf"(?:{_newline}|--[^\r\n]*)(?:[ \t]*(?:{_newline}|--[^\r\n]*))*"
+
+    # Ply tries function rules first (in order of definition), then
+    # string rules (longest regex first), then literals
+    _initial = _master_re(
+        r"[ \t]*",
+        ("skip", _skip),
+        ("MACRO", SmiV2Lexer.t_MACRO.__doc__),
+        ("EXPORTS", SmiV2Lexer.t_EXPORTS.__doc__),
+        ("CHOICE", SmiV2Lexer.t_CHOICE.__doc__),
+        ("UPPERCASE_IDENTIFIER", SmiV2Lexer.t_UPPERCASE_IDENTIFIER.__doc__),
+        ("LOWERCASE_IDENTIFIER", SmiV2Lexer.t_LOWERCASE_IDENTIFIER.__doc__),
+        ("NUMBER", SmiV2Lexer.t_NUMBER.__doc__),
+        ("BIN_STRING", SmiV2Lexer.t_BIN_STRING.__doc__),
+        ("HEX_STRING", SmiV2Lexer.t_HEX_STRING.__doc__),
+        ("QUOTED_STRING", SmiV2Lexer.t_QUOTED_STRING.__doc__),
+        ("DOT_DOT", SmiV2Lexer.t_DOT_DOT),
+        ("COLON_COLON_EQUAL", SmiV2Lexer.t_COLON_COLON_EQUAL),
+        ("literal", f"[{re.escape(SmiV2Lexer.literals)}]"),
+    )
+
+    # exclusive states have no ignored characters
+    _states = {
+        "MACRO": _master_re(
+            "",
+            ("newline", _newline),
+            ("END", SmiV2Lexer.t_macro_END.__doc__),
+            ("body", SmiV2Lexer.t_macro_body.__doc__),
+        ),
+        "EXPORTS": _master_re(
+            "",
+            ("newline", _newline),
+            ("end", SmiV2Lexer.t_exports_end.__doc__),
+            ("body", SmiV2Lexer.t_exports_body.__doc__),
+        ),
+        "CHOICE": _master_re(
+            "",
+            ("newline", _newline),
+            ("end", SmiV2Lexer.t_choice_end.__doc__),
+            ("body", SmiV2Lexer.t_choice_body.__doc__),
+        ),
+    }
+
+    def __init__(self, tempdir=""):
+        self._tempdir = tempdir
+        self._reserved = dict(self.reserved)
+        self._forbidden = frozenset(self.forbidden_words)
+        # the parser feeds on this lexer directly
+        self.lexer = self
+        self.reset()
+
+    def reset(self):
+        self.input("")
+        self.lineno = 1
+
+    def input(self, data):
+        # spare a method call per token
+        self.token = functools.partial(next, self.tokenize(data), None)
+
+    def tokenize(self, data):
+        """Generate tokens of MIB *data* in Ply lexer fashion."""
+        reserved = self._reserved
+        forbidden = self._forbidden
+        count_lines = self.count_lines
+        skipTexts = self.skipTexts
+        textTokens = self.text_tokens
+
+        lineno = self.lineno
+        pos = 0
+        textAt = -1
+        revision = False
+
+        scan = self._initial.scanner(data).match
+
+        last = None
+
+        while True:
+            m = scan()
+
+            if m is None:
+                break
+
+            last = m
+
+            kind = m.lastgroup
+            value = m.group(kind)
+
+            if kind == "skip":
+                lineno += count_lines(value)
+
+            elif kind == "UPPERCASE_IDENTIFIER":
+                if value in forbidden:
+                    raise error.PySmiLexerError(f"{value} is forbidden", lineno=lineno)
+
+                if value[-1] == "-":
+                    raise error.PySmiLexerError(
+                        f"Identifier should not end with '-': {value}", lineno=lineno
+                    )
+
+                tokenType = reserved.get(value, kind)
+
+                if skipTexts:
+                    if tokenType == "REVISION":
+                        revision = True
+
+                    elif tokenType in textTokens:
+                        if revision:
+                            revision = False
+                        else:
+                            textAt = m.end()
+
+                yield Token(tokenType, value, lineno, m.start(kind))
+
+            elif kind == "LOWERCASE_IDENTIFIER":
+                if value[-1] == "-":
+                    raise error.PySmiLexerError(
+                        f"Identifier should not end with '-': {value}", lineno=lineno
+                    )
+
+                yield Token(kind, value, lineno, m.start(kind))
+
+            elif kind == "literal":
+                yield Token(value, value, lineno, m.start(kind))
+
+            elif kind == "NUMBER":
+                yield Token(
+                    self.get_number_type(value, lineno),
+                    int(value),
+                    lineno,
+                    m.start(kind),
+                )
+
+            elif kind == "QUOTED_STRING":
+                start = m.start(kind)
+                lines = count_lines(value)
+
+                if textAt >= 0:
+                    if self.is_text(data, textAt, start):
+                        value = SKIPPED_TEXT
+
+                    textAt = -1
+
+                yield Token(kind, value, lineno, start)
+
+                lineno += lines
+
+            elif kind in ("DOT_DOT", "COLON_COLON_EQUAL"):
+                yield Token(kind, value, lineno, m.start(kind))
+
+            elif kind in ("BIN_STRING", "HEX_STRING"):
+                # these rules only validate the token
+                yield getattr(self, f"t_{kind}")(
+                    Token(kind, value, lineno, m.start(kind))
+                )
+
+            else:
+                # MACRO, EXPORTS or CHOICE body is skipped in its own state
+                yield Token(kind, value, lineno, m.start(kind))
+
+                lineno, pos = yield from self.skip_state(kind, data, m.end(), lineno)
+
+                scan = self._initial.scanner(data, pos).match
+
+                last = None
+
+        if last is not None:
+            pos = last.end()
+
+        while pos < len(data) and data[pos] in self.t_ignore:
+            pos += 1
+
+        if pos < len(data):
+            raise error.PySmiLexerError(
+                f"Illegal character '{data[pos]}', {len(data) - pos - 1} characters left unparsed at this stage",
+                lineno=lineno,
+            )
+
+        self.lineno = lineno
+
+    def skip_state(self, state, data, pos, lineno):
+        match = self._states[state].match
+
+        while pos < len(data):
+            m = match(data, pos)
+
+            if m is None:
+                if data[pos] not in self.literals:
+                    raise lex.LexError(
+                        f"Illegal character '{data[pos]}' at index {pos}", data[pos:]
+                    )
+
+                yield Token(data[pos], data[pos], lineno, pos)
+
+                pos += 1
+
+                continue
+
+            kind = m.lastgroup
+
+            if kind == "newline":
+                lineno += 1
+
+            elif kind == "END":
+                yield Token(kind, m.group(), lineno, pos)
+
+            pos = m.end()
+
+            if kind in ("END", "end"):
+                break
+
+        return lineno, pos
+
+    def get_number_type(self, value, lineno):
+        val = int(value)
+
+        if val < 0:
+            if -val <= UNSIGNED32_MAX:
+                return "NEGATIVENUMBER"
+
+            if -val <= UNSIGNED64_MAX:
+                return "NEGATIVENUMBER64"
+
+        else:
+            if val <= UNSIGNED32_MAX:
+                return "NUMBER"
+
+            if val <= UNSIGNED64_MAX:
+                return "NUMBER64"
+
+        raise error.PySmiLexerError(f"Number {val} is too big", lineno=lineno)
+
+
 class SupportSmiV1Keywords:
     @staticmethod
     def reserved():
@@ -537,15 +876,35 @@ relaxedGrammar = {
 }
 
 
-def lexerFactory(**grammarOptions):
-    classAttr = {}
+lexerBackends = {"ply": SmiV2Lexer, "regex": SmiV2RegexLexer}
+
+
+# lexer classes by backend and enabled grammar options
+_lexerClasses = {}
+
+
+def lexerFactory(backend="ply", **grammarOptions):
+    if backend not in lexerBackends:
+        raise error.PySmiError(f"Unknown lexer backend: {backend}")
 
     for option in grammarOptions:
-        if grammarOptions[option]:
-            if option not in relaxedGrammar:
-                raise error.PySmiError(f"Unknown lexer relaxation option: {option}")
+        if grammarOptions[option] and option not in relaxedGrammar:
+            raise error.PySmiError(f"Unknown lexer relaxation option: {option}")
+
+    # same options give the same class, so that its Ply lexer is built once
+    key = backend, tuple(sorted(x for x in grammarOptions if grammarOptions[x]))
 
-            for func in relaxedGrammar[option]:
-                classAttr[func.__name__] = func()
+    lexerClass = _lexerClasses.get(key)
 
-    return type("SmiLexer", (SmiV2Lexer,), classAttr)
+    if lexerClass is not None:
+        return lexerClass
+
+    classAttr = {}
+
+    for option in key[1]:
+        for func in relaxedGrammar[option]:
+            classAttr[func.__name__] = func()
+
+    return _lexerClasses.setdefault(
+        key, type("SmiLexer", (lexerBackends[backend],), classAttr)
+    )
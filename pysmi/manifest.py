@@ -0,0 +1,160 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from pysmi import __version__ as package_version
+from pysmi import debug
+from pysmi import error
+from pysmi.compat import decode
+
+
+class BuildManifest:
+    """Keeps track of ASN.1 MIB sources transformed MIBs were built from.
+
+    For each MIB module, the manifest records a hash of its ASN.1 source
+    and the names of the MIBs it imports. Based on that, *MibCompiler*
+    rebuilds exactly the MIBs whose own source or any (transitive)
+    dependency changed since the last run, rather than comparing file
+    modification times.
+
+    The manifest is stored as a JSON document. Manifests written by a
+    different pysmi version are ignored.
+
+    User is expected to pass *BuildManifest* class instance to
+    *MibCompiler.set_manifest*. The rest is internal to *MibCompiler*.
+    """
+
+    def __init__(self, path):
+        """Creates an instance of *BuildManifest* class.
+
+        Args:
+            path: path to manifest file, created if not present
+        """
+        self._path = decode(os.path.normpath(path))
+        self._mibs = None
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f'{self.__class__.__name__}{{"{self._path}"}}'
+
+    def __contains__(self, mibname):
+        return mibname in self.mibs
+
+    @staticmethod
+    def get_digest(data):
+        return hashlib.sha256(data.encode("utf-8", "surrogateescape")).hexdigest()
+
+    @property
+    def mibs(self):
+        if self._mibs is None:
+            self._mibs = self.load()
+
+        return self._mibs
+
+    def load(self):
+        try:
+            with open(self._path) as f:
+                manifest = json.load(f)
+
+        except FileNotFoundError:
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"no build manifest at {self._path}"
+            )
+            return {}
+
+        except Exception:
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"failure reading build manifest {self._path}: {sys.exc_info()[1]}"
+            )
+            return {}
+
+        if not isinstance(manifest, dict) or manifest.get("version") != package_version:
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"ignoring build manifest {self._path} of other pysmi version"
+            )
+            return {}
+
+        return manifest.get("mibs", {})
+
+    def save(self):
+        tfile = None
+
+        try:
+            fd, tfile = tempfile.mkstemp(dir=os.path.dirname(self._path) or None)
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {"version": package_version, "mibs": self.mibs},
+                    f,
+                    indent=1,
+                    sort_keys=True,
+                )
+
+            os.replace(tfile, self._path)
+
+        except OSError:
+            if tfile and os.access(tfile, os.F_OK):
+                os.unlink(tfile)
+
+            raise error.PySmiError(
+                f"failure writing build manifest {self._path}: {sys.exc_info()[1]}"
+            )
+
+        debug.logger & debug.FLAG_COMPILER and debug.logger(
+            f"build manifest of {len(self.mibs)} MIBs stored in {self._path}"
+        )
+
+    def get_changed(self, digests, imports):
+        """Figure out which of the recorded MIBs need rebuilding.
+
+        Args:
+            digests: source hashes of MIBs at hand, MIBs that could not be
+                read or parsed are absent
+            imports: names of the MIBs each of the MIBs at hand imports
+
+        Returns:
+            set of recorded MIB names whose own source or that of any MIB
+            they transitively depend on differs from the recorded one
+        """
+        mibs = self.mibs
+
+        importers = {}
+
+        for mibname in set(mibs).union(imports):
+            if mibname in imports:
+                imported = imports[mibname]
+
+            else:
+                imported = mibs[mibname].get("imported", ())
+
+            for dependency in imported:
+                importers.setdefault(dependency, []).append(mibname)
+
+        changed = set()
+
+        for mibname in set(mibs).union(digests, importers):
+            if digests.get(mibname) != mibs.get(mibname, {}).get("digest"):
+                changed.add(mibname)
+
+        mibsToCheck = list(changed)
+
+        while mibsToCheck:
+            for mibname in importers.get(mibsToCheck.pop(), ()):
+                if mibname not in changed:
+                    changed.add(mibname)
+                    mibsToCheck.append(mibname)
+
+        return changed.intersection(mibs)
+
+    def update(self, mibname, digest, imported):
+        self.mibs[mibname] = {"digest": digest, "imported": list(imported)}
+
+    def remove(self, mibname):
+        self.mibs.pop(mibname, None)
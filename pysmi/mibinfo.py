@@ -22,6 +22,9 @@ class MibInfo:
     #: MIB file modification time
     mtime = 0
 
+    #: MIB file contents hash
+    digest = ""
+
     #: module OID
     oid = ""
 
@@ -4,23 +4,78 @@
 # Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
 # License: https://www.pysnmp.com/pysmi/license.html
 #
+import copy
+import hashlib
 import os
 import sys
+import threading
+from contextlib import contextmanager
 
 import ply.yacc as yacc
 from pysmi import debug
 from pysmi import error
+from pysmi.compat import get_user_cache_dir
 from pysmi.lexer.smi import lexerFactory
 from pysmi.parser.base import AbstractParser
 
 YACC_VERSION = [int(x) for x in yacc.__version__.split(".")]
 
+#: LALR tables for the shipped parser dialects, built along with the package
+TABLES_DIR = os.path.join(os.path.dirname(__file__), "tables")
+
+
+def compact_ast(node, shared=None):
+    """Make AST take less memory without changing its value.
+
+    Words (strings without white space, e.g. identifiers) are interned,
+    so that each of them is kept once throughout all ASTs. Equal tuples
+    holding nothing but words, integers, `None` and such tuples are
+    shared within AST (through *shared* mapping, if given, in between
+    ASTs too). Lists and dictionaries, which code generators may
+    modify, are just rebuilt from compacted items.
+    """
+    if shared is None:
+        shared = {}
+
+    nodeType = type(node)
+
+    if nodeType is str:
+        if " " in node or "\n" in node:
+            return node
+
+        return sys.intern(node)
+
+    if nodeType is tuple:
+        node = tuple([compact_ast(x, shared) for x in node])
+
+        for x in node:
+            if x is not None and type(x) not in (str, int):
+                try:
+                    if type(x) is not tuple or shared.get(x) is not x:
+                        return node
+
+                except TypeError:  # holds lists
+                    return node
+
+        return shared.setdefault(node, node)
+
+    if nodeType is list:
+        return [compact_ast(x, shared) for x in node]
+
+    if nodeType is dict:
+        return {compact_ast(k, shared): compact_ast(v, shared) for k, v in node.items()}
+
+    return node
+
 
 # noinspection PyMethodMayBeStatic,PyIncorrectDocstring
 class SmiV2Parser(AbstractParser):
     defaultLexer = lexerFactory()
 
     def __init__(self, startSym="mibFile", tempdir=""):
+        self._startSym = startSym
+        self._tempdir = tempdir
+
         if tempdir:
             tempdir = os.path.join(tempdir, startSym)
             try:
@@ -36,8 +91,64 @@ class SmiV2Parser(AbstractParser):
         # tokens are required for parser
         self.tokens = self.lexer.tokens
 
+        self.parser = self.build_parser(startSym, tempdir)
+
+    def build_parser(self, startSym, tempdir):
+        """Return PLY parser bound to this instance.
+
+        Loading (or building) LALR tables and reflecting grammar rules
+        is costly, so it only happens once per parser class, start symbol
+        and tables directory. Instances get a copy of the class-wide
+        parser with grammar rule handlers bound to them.
+        """
+        parsers = self.__class__.__dict__.get("_parsers")
+
+        if parsers is None:
+            parsers = self.__class__._parsers = {}
+
+        parser = parsers.get((startSym, tempdir))
+
+        if parser is None:
+            parser = parsers.setdefault(
+                (startSym, tempdir), self.load_parser(startSym, tempdir)
+            )
+
+        return self.clone_parser(parser)
+
+    def clone_parser(self, parser):
+        # LALR tables are shared, productions are bound to this instance
+        parser = copy.copy(parser)
+
+        productions = []
+
+        for production in parser.productions:
+            production = yacc.MiniProduction(
+                production.str,
+                production.name,
+                production.len,
+                production.func,
+                production.file,
+                production.line,
+            )
+
+            if production.func:
+                production.callable = getattr(self, production.func)
+
+            productions.append(production)
+
+        parser.productions = productions
+        parser.errorfunc = self.p_error
+
+        return parser
+
+    def load_parser(self, startSym, tempdir):
+        """Return PLY parser with LALR tables loaded from a file.
+
+        Tables are built and stored in a file if none of the known
+        files hold usable tables.
+        """
         if YACC_VERSION < [3, 0]:
-            self.parser = yacc.yacc(
+            parser = yacc.yacc(
                 module=self,
                 start=startSym,
                 write_tables=bool(tempdir),
@@ -55,31 +166,167 @@ class SmiV2Parser(AbstractParser):
             else:
                 debuglogger = None
 
-            self.parser = yacc.yacc(
-                module=self,
-                start=startSym,
-                write_tables=bool(tempdir),
-                debug=False,
-                outputdir=tempdir,
-                debuglog=debuglogger,
-                errorlog=logger,
+            tablesFile = self.get_grammar_hash(startSym) + ".pickle"
+
+            if tempdir:
+                tablesFiles = [os.path.join(tempdir, tablesFile)]
+
+            else:
+                tablesFiles = [
+                    os.path.join(TABLES_DIR, tablesFile),
+                    os.path.join(get_user_cache_dir(), "tables", tablesFile),
+                ]
+
+            parser = None
+
+            for tablesFile in tablesFiles:
+                if not os.path.exists(tablesFile):
+                    continue
+
+                try:
+                    parser = yacc.yacc(
+                        module=self,
+                        start=startSym,
+                        debug=False,
+                        picklefile=tablesFile,
+                        debuglog=debuglogger,
+                        errorlog=logger,
+                    )
+
+                except Exception:
+                    debug.logger & debug.FLAG_PARSER and debug.logger(
+                        f"failure loading parser tables {tablesFile}: {sys.exc_info()[1]}"
+                    )
+                    continue
+
+                debug.logger & debug.FLAG_PARSER and debug.logger(
+                    f"parser tables loaded from {tablesFile}"
+                )
+                break
+
+            else:
+                parser = self.build_tables(
+                    startSym, tablesFiles[-1], debuglog=debuglogger, errorlog=logger
+                )
+
+        return parser
+
+    @classmethod
+    def get_grammar_hash(cls, startSym="mibFile"):
+        """Compute a hash of the grammar this parser class implements.
+
+        LALR tables are stored under this hash so that tables of
+        different grammars (e.g. dialects) never get mixed up.
+        """
+        digest = hashlib.sha256()
+
+        parts = [yacc.__version__, startSym, " ".join(sorted(cls.defaultLexer.tokens))]
+
+        for name in sorted(dir(cls)):
+            if name.startswith("p_"):
+                parts.append(f"{name}:{getattr(cls, name).__doc__}")
+
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def build_tables(self, startSym, tablesFile, **options):
+        """Build LALR tables of this parser and store them in a file.
+
+        Tables are written to a temporary file first, then moved in
+        place, so that concurrently starting parsers never read a
+        half-written file. Failure to store tables is not fatal.
+
+        Returns:
+            PLY parser object
+
+        """
+        tempFile = f"{tablesFile}.{os.getpid()}.{threading.get_ident()}"
+
+        try:
+            os.makedirs(os.path.dirname(tablesFile), exist_ok=True)
+
+        except OSError:
+            debug.logger & debug.FLAG_PARSER and debug.logger(
+                f"failure creating parser tables directory: {sys.exc_info()[1]}"
+            )
+
+        parser = yacc.yacc(
+            module=self,
+            start=startSym,
+            debug=False,
+            picklefile=tempFile,
+            **options,
+        )
+
+        try:
+            os.replace(tempFile, tablesFile)
+
+        except OSError:
+            debug.logger & debug.FLAG_PARSER and debug.logger(
+                f"failure storing parser tables {tablesFile}: {sys.exc_info()[1]}"
+            )
+
+            if os.path.exists(tempFile):
+                os.unlink(tempFile)
+
+        else:
+            debug.logger & debug.FLAG_PARSER and debug.logger(
+                f"parser tables stored in {tablesFile}"
+            )
+
+        return parser
+
+    def __reduce__(self):
+        """Pickle parser by its grammar rather than by its PLY state.
+
+        PLY lexer and parser objects are not picklable. Instead, the
+        parser gets rebuilt from the same grammar options wherever it is
+        unpickled (e.g. in a worker process).
+        """
+        if "grammarOptions" in self.__class__.__dict__:
+            return _rebuild_parser, (
+                self.grammarOptions,
+                self._startSym,
+                self._tempdir,
+                self.lexerBackend,
             )
 
+        return self.__class__, (self._startSym, self._tempdir)
+
     def reset(self):
-        # Ply requires lexer reinitialization for (at least) resetting lineno
+        # rewind lexer for (at least) resetting lineno
         self.lexer.reset()
 
-    def parse(self, data, **kwargs):
+    def parse(self, data, genTexts=True, lineno=1, compact=False, **kwargs):
+        """Parse MIB text into a list of ASTs, one per MIB module in it.
+
+        Unless *genTexts* is set, DESCRIPTION, REFERENCE, ORGANIZATION and
+        CONTACT-INFO texts (except revision descriptions) are not carried
+        over into the ASTs, empty strings stand in for them.
+
+        Lines of MIB text are numbered from *lineno* on, which is useful
+        when *data* is a piece of a larger MIB file. If *compact* is set,
+        ASTs are passed through *compact_ast*.
+        """
         debug.logger & debug.FLAG_PARSER and debug.logger(
             f'source MIB size is {len(data)} characters, first 50 characters are "{data[:50]}..."'
         )
 
-        ast = self.parser.parse(data, lexer=self.lexer.lexer)
+        self.lexer.skipTexts = not genTexts
+        self.lexer.lexer.lineno = lineno
+
+        try:
+            ast = self.parser.parse(data, lexer=self.lexer.lexer)
 
-        self.reset()
+        finally:
+            # reset even on failure so that the next MIB starts at line 1
+            self.reset()
 
         if ast and ast[0] == "mibFile" and ast[1]:  # mibfile is not empty
-            return ast[1]
+            return compact and compact_ast(ast[1]) or ast[1]
         else:
             return []
 
@@ -1441,16 +1688,25 @@ relaxedGrammar = {
 }
 
 
-def parserFactory(**grammarOptions):
+# parser classes by lexer backend and enabled grammar options
+_parserClasses = {}
+
+
+def parserFactory(lexerBackend="ply", **grammarOptions):
     """Factory function producing custom specializations of base *SmiV2Parser*
     class.
 
     Keyword Args:
+        lexerBackend: "ply" for the Ply-based lexer or "regex" for the
+                      faster one built on a single regular expression,
+                      both produce the same tokens
         grammarOptions: a list of (bool) typed optional keyword parameters
                         enabling particular set of SMIv2 grammar relaxations.
 
     Returns:
-        Specialized copy of *SmiV2Parser* class.
+        Specialized copy of *SmiV2Parser* class. The same class is
+        returned for the same set of enabled options and lexer backend,
+        so its LALR tables and lexer are built once per process.
 
     Notes:
         The following SMIv2 grammar relaxation parameters are defined:
@@ -1471,16 +1727,118 @@ def parserFactory(**grammarOptions):
     >>> SmiV1Parser = smi.parserFactory(supportSmiV1Keywords=True, supportIndex=True)
 
     """
+    for option in grammarOptions:
+        if grammarOptions[option] and option not in relaxedGrammar:
+            raise error.PySmiError(f"Unknown parser relaxation option: {option}")
+
+    # options that are off make no difference to the grammar
+    grammarOptions = {x: True for x in sorted(grammarOptions) if grammarOptions[x]}
+
+    key = lexerBackend, tuple(grammarOptions)
+
+    parserClass = _parserClasses.get(key)
+
+    if parserClass is not None:
+        return parserClass
+
     classAttr = {}
 
     for option in grammarOptions:
-        if grammarOptions[option]:
-            if option not in relaxedGrammar:
-                raise error.PySmiError(f"Unknown parser relaxation option: {option}")
+        for func in relaxedGrammar[option]:
+            classAttr[func.__name__] = func
+
+    classAttr["defaultLexer"] = lexerFactory(lexerBackend, **grammarOptions)
+    classAttr["grammarOptions"] = grammarOptions
+    classAttr["lexerBackend"] = lexerBackend
+
+    # the first class made wins should several threads race for it
+    return _parserClasses.setdefault(key, type("SmiParser", (SmiV2Parser,), classAttr))
+
+
+class ParserPool:
+    """Pool of parsers of the same class to be shared by threads.
+
+    PLY parsers keep their state in the instance while parsing, so a
+    parser instance can not be used by several threads at once. The pool
+    hands out an idle parser to each caller, making a new one only if all
+    of them are busy. Instantiating a parser is cheap as LALR tables are
+    shared by all instances of a parser class.
+    """
 
-            for func in relaxedGrammar[option]:
-                classAttr[func.__name__] = func
+    def __init__(self, parserClass, size=4, **kwargs):
+        """Creates an instance of *ParserPool* class.
+
+        Args:
+            parserClass: parser class e.g. as returned by *parserFactory*
+            size: number of idle parsers to keep around at most
+            kwargs: parser class instantiation parameters
+        """
+        self._parserClass = parserClass
+        self._size = size
+        self._kwargs = kwargs
+        self._parsers = []
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f"{self.__class__.__name__}{{{self._parserClass.__name__}, {len(self._parsers)} idle}}"
+
+    def acquire(self):
+        """Take an idle parser out of the pool or make a new one."""
+        with self._lock:
+            if self._parsers:
+                return self._parsers.pop()
+
+        return self._parserClass(**self._kwargs)
+
+    def release(self, parser):
+        """Put *parser* back into the pool unless the pool is full."""
+        with self._lock:
+            if len(self._parsers) < self._size:
+                self._parsers.append(parser)
+
+    @contextmanager
+    def parser(self):
+        """Context manager lending a parser for the duration of the block."""
+        parser = self.acquire()
+
+        try:
+            yield parser
+
+        finally:
+            self.release(parser)
+
+    def parse(self, data, **kwargs):
+        """Parse MIB text with a parser from the pool.
+
+        Same as *SmiV2Parser.parse*, but safe to call from several
+        threads at once.
+        """
+        with self.parser() as parser:
+            return parser.parse(data, **kwargs)
+
+
+def build_tables(path=TABLES_DIR, startSym="mibFile"):
+    """Build LALR tables for the shipped parser dialects into *path*.
+
+    Meant to be run when building pysmi package, so that parsers of the
+    shipped dialects do not have to build their tables on first use.
+    """
+    from pysmi.parser.dialect import smi_v1, smi_v1_relaxed, smi_v2
+
+    for grammarOptions in (smi_v2, smi_v1, smi_v1_relaxed):
+        parserClass = parserFactory(**grammarOptions)
+
+        tablesFile = os.path.join(
+            path, parserClass.get_grammar_hash(startSym) + ".pickle"
+        )
+
+        parserClass(startSym).build_tables(
+            startSym, tablesFile, errorlog=yacc.NullLogger()
+        )
 
-    classAttr["defaultLexer"] = lexerFactory(**grammarOptions)
 
-    return type("SmiParser", (SmiV2Parser,), classAttr)
+def _rebuild_parser(grammarOptions, startSym, tempdir, lexerBackend="ply"):
+    return parserFactory(lexerBackend, **grammarOptions)(
+        startSym=startSym, tempdir=tempdir
+    )
@@ -0,0 +1,217 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+from pysmi import debug
+from pysmi import error
+from pysmi.probe import probe_mib
+
+
+class BuildPlan:
+    """Dependency graph of MIBs and the order to process them in.
+
+    MIBs are scheduled in *waves*: every MIB of a wave depends only on
+    MIBs of earlier waves, so MIBs within a wave can be processed in
+    parallel. MIBs depending on each other in a cycle are put into the
+    same wave. MIBs that could not be found are not scheduled.
+    """
+
+    def __init__(self, imports, missing=()):
+        """Creates an instance of *BuildPlan* class.
+
+        Args:
+            imports: dictionary of names of the MIBs at hand (keys) and
+                names of the MIBs each of them imports (values)
+            missing: names of the MIBs that could not be found
+        """
+        self.imports = imports
+        self.missing = tuple(missing)
+        self.waves = self.schedule(imports)
+        self.order = tuple(x for wave in self.waves for x in wave)
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f"{self.__class__.__name__}{{{len(self.order)} MIBs in {len(self.waves)} waves}}"
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __contains__(self, mibname):
+        return mibname in self.imports
+
+    @staticmethod
+    def schedule(imports):
+        """Group MIBs into waves, dependencies first.
+
+        Args:
+            imports: names of the MIBs each of the MIBs at hand imports
+
+        Returns:
+            tuple of waves, each a tuple of MIB names
+        """
+        pending = {
+            mibname: {x for x in imported if x in imports and x != mibname}
+            for mibname, imported in imports.items()
+        }
+
+        importers = {}
+
+        for mibname, imported in pending.items():
+            for dependency in imported:
+                importers.setdefault(dependency, []).append(mibname)
+
+        waves = []
+
+        while pending:
+            wave = [x for x in pending if not pending[x]]
+
+            if not wave:
+                wave = BuildPlan.find_cycle(pending)
+
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    f"dependency cycle among {', '.join(wave)}"
+                )
+
+            for mibname in wave:
+                del pending[mibname]
+
+            for mibname in wave:
+                for importer in importers.get(mibname, ()):
+                    if importer in pending:
+                        pending[importer].discard(mibname)
+
+            waves.append(tuple(wave))
+
+        return tuple(waves)
+
+    @staticmethod
+    def find_cycle(pending):
+        # every MIB depends on some, look for MIBs only depending on each other
+        def reach(mibname):
+            reachable = set()
+            mibsToCheck = [mibname]
+
+            while mibsToCheck:
+                for dependency in pending[mibsToCheck.pop()]:
+                    if dependency not in reachable:
+                        reachable.add(dependency)
+                        mibsToCheck.append(dependency)
+
+            return reachable
+
+        mibname = next(iter(pending))
+        reachable = reach(mibname)
+
+        while True:
+            for dependency in reachable:
+                other = reach(dependency)
+
+                if mibname not in other:
+                    mibname, reachable = dependency, other
+                    break
+
+            else:
+                return [x for x in pending if x in reachable]
+
+
+def plan_mibs(sources, *mibnames):
+    """Work out dependencies of MIBs and the order to process them in.
+
+    Each MIB is fetched from the first capable source and its IMPORTS are
+    picked up by *probe_mib* rather than by parsing MIB text. Then the
+    same is done for the MIBs it imports, and so on.
+
+    MIBs are looked up by the names they are requested or imported by.
+    MIB modules found in a file fetched under another name are not looked
+    up once again.
+
+    Args:
+        sources: reader objects to fetch ASN.1 MIBs from
+        mibnames: names of the MIBs to plan processing of
+
+    Returns:
+        *BuildPlan* class instance
+    """
+    imports = {}
+    aliases = {}
+    missing = []
+
+    mibsToProbe = list(mibnames)
+
+    while mibsToProbe:
+        mibname = mibsToProbe.pop(0)
+
+        if mibname in imports or mibname in aliases or mibname in missing:
+            continue
+
+        found = False
+
+        for source in sources:
+            try:
+                fileInfo, fileData = source.get_data(mibname)
+
+            except error.PySmiReaderFileNotFoundError:
+                continue
+
+            except (UnicodeDecodeError, error.PySmiError) as exc:
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    f"failure reading {mibname} from {source}: {exc}"
+                )
+                continue
+
+            found = True
+
+            try:
+                mibHeaders = probe_mib(fileData)
+
+            except error.PySmiError as exc:
+                # leave it to the parser to fail this MIB or try other sources
+                debug.logger & debug.FLAG_COMPILER and debug.logger(
+                    f"failure probing {mibname} from {source}: {exc}"
+                )
+                continue
+
+            imported = []
+
+            for mibHeader in mibHeaders:
+                if mibHeader.name != mibname and mibHeader.name not in imports:
+                    aliases[mibHeader.name] = mibname
+
+                for dependency in mibHeader.imported:
+                    if dependency not in imported:
+                        imported.append(dependency)
+
+            imports[mibname] = imported
+
+            mibsToProbe.extend(imported)
+
+            debug.logger & debug.FLAG_COMPILER and debug.logger(
+                f"{mibname} probed at {fileInfo.path}, immediate dependencies: {', '.join(imported) or '<none>'}"
+            )
+
+            break
+
+        else:
+            if found:
+                imports[mibname] = []
+
+            else:
+                missing.append(mibname)
+
+    imports = {
+        mibname: tuple(aliases.get(x, x) for x in imported)
+        for mibname, imported in imports.items()
+    }
+
+    plan = BuildPlan(imports, missing)
+
+    debug.logger & debug.FLAG_COMPILER and debug.logger(
+        f"planned {len(plan)} MIBs in {len(plan.waves)} waves, missing: {', '.join(plan.missing) or '<none>'}"
+    )
+
+    return plan
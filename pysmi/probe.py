@@ -0,0 +1,257 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+from datetime import datetime
+
+from pysmi import debug
+from pysmi import error
+from pysmi.lexer.smi import lexerFactory
+from pysmi.parser.dialect import smi_v1_relaxed
+
+# the most tolerant lexer, probing does not validate MIBs
+ProbeLexer = lexerFactory("regex", **smi_v1_relaxed)
+
+
+class MibHeader:
+    """MIB module particulars learned without parsing the whole module."""
+
+    #: MIB module name
+    name = ""
+
+    #: imported MIB names, in order of appearance
+    imported: tuple[str, ...] = ()
+
+    #: symbols imported from each of the *imported* MIBs
+    imports: dict = {}
+
+    #: MODULE-IDENTITY name
+    identityName = ""
+
+    #: MODULE-IDENTITY OID components as written, e.g. `("enterprises", 1)`
+    identity = ()
+
+    #: LAST-UPDATED time as written
+    lastUpdated = ""
+
+    #: REVISION times as written, most recent first
+    revisions: tuple[str, ...] = ()
+
+    def __init__(self, **kwargs):
+        for k in kwargs:
+            setattr(self, k, kwargs[k])
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f'{self.__class__.__name__}{{"{self.name}"}}'
+
+    @property
+    def revision(self):
+        """Most recent MIB revision as `datetime` or `None` if not known."""
+        if not self.revisions:
+            return None
+
+        timeStr = self.revisions[0]
+
+        if len(timeStr) == 11:
+            timeStr = "19" + timeStr
+
+        try:
+            return datetime.strptime(timeStr, "%Y%m%d%H%MZ")
+
+        except ValueError:
+            return None
+
+
+def probe_mib(data):
+    """Learn names, imports, identity and revisions of MIB modules in *data*.
+
+    Rather than parsing MIB text, the probe just skims through its tokens
+    looking at module headers, IMPORTS and MODULE-IDENTITY clauses. That
+    makes it many times cheaper than compiling a MIB, though MIBs are not
+    validated in any way beyond tokenization.
+
+    Args:
+        data: ASN.1 MIB text, possibly holding several MIB modules
+
+    Returns:
+        a list of *MibHeader* instances, one per MIB module
+
+    Raises:
+        PySmiLexerError: if MIB text could not be tokenized
+    """
+    lexer = ProbeLexer()
+    lexer.skipTexts = True
+    lexer.input(data)
+
+    tokens = iter(lexer.token, None)
+
+    headers = []
+
+    header = None
+    name = ""
+    macro = False
+
+    for token in tokens:
+        if header is None:
+            if token.type == "UPPERCASE_IDENTIFIER":
+                name = token.value
+
+            elif token.type == "DEFINITIONS" and name:
+                header = MibHeader(name=name, imports={})
+
+            continue
+
+        if token.type == "MACRO":
+            macro = True
+
+        elif token.type == "END":
+            if macro:
+                macro = False
+                continue
+
+            header.imported = tuple(header.imports)
+            headers.append(header)
+
+            debug.logger & debug.FLAG_PARSER and debug.logger(
+                f"probed {header.name}, imports {', '.join(header.imported) or '<none>'}"
+            )
+
+            header = None
+            name = ""
+
+        elif token.type == "IMPORTS":
+            symbols = []
+
+            for token in tokens:
+                if token.type == ";":
+                    break
+
+                if token.type == "FROM":
+                    token = next(tokens, None)
+
+                    if token is None:
+                        break
+
+                    header.imports.setdefault(token.value, []).extend(symbols)
+                    symbols = []
+
+                elif token.type != ",":
+                    symbols.append(token.value)
+
+        elif token.type == "MODULE_IDENTITY" and not header.identityName:
+            header.identityName = name
+            revisions = []
+
+            for token in tokens:
+                if token.type == "LAST_UPDATED":
+                    token = next(tokens, None)
+
+                    if token is not None and token.type == "QUOTED_STRING":
+                        header.lastUpdated = token.value[1:-1]
+
+                elif token.type == "REVISION":
+                    token = next(tokens, None)
+
+                    if token is not None and token.type == "QUOTED_STRING":
+                        revisions.append(token.value[1:-1])
+
+                elif token.type == "COLON_COLON_EQUAL":
+                    header.identity = probe_oid(tokens)
+                    break
+
+            header.revisions = tuple(revisions)
+
+        elif token.type == "LOWERCASE_IDENTIFIER":
+            name = token.value
+
+    return headers
+
+
+def split_mib(data):
+    """Split MIB text into MIB modules.
+
+    Module boundaries are found by skimming through MIB tokens, so that
+    the modules of a large MIB file can be parsed independently of each
+    other (e.g. in parallel). The text in between modules is nothing but
+    white space and comments.
+
+    Args:
+        data: ASN.1 MIB text, possibly holding several MIB modules
+
+    Returns:
+        a list of `(lineno, text)` tuples, MIB module text along with the
+        number of the line it starts at in *data*. Unless *data* looks
+        like a sequence of MIB modules, it is returned in one piece.
+    """
+    lexer = ProbeLexer()
+    lexer.skipTexts = True
+    lexer.input(data)
+
+    chunks = []
+
+    start = None
+    module = macro = False
+
+    try:
+        for token in iter(lexer.token, None):
+            if module:
+                if token.type == "MACRO":
+                    macro = True
+
+                elif token.type == "END":
+                    if macro:
+                        macro = False
+                        continue
+
+                    chunks.append((start[0], data[start[1] : token.lexpos + 3]))
+
+                    start = None
+                    module = False
+
+            elif start is None:
+                if token.type != "UPPERCASE_IDENTIFIER":
+                    return [(1, data)]
+
+                start = token.lineno, token.lexpos
+
+            elif token.type == "DEFINITIONS":
+                module = True
+
+    except error.PySmiError:
+        # let the parser report it
+        return [(1, data)]
+
+    if start is not None:
+        chunks.append((start[0], data[start[1] :]))
+
+    debug.logger & debug.FLAG_PARSER and debug.logger(
+        f"MIB text of {len(data)} characters split into {len(chunks)} modules"
+    )
+
+    return chunks or [(1, data)]
+
+
+def probe_oid(tokens):
+    # { parent sub(1) 2 } -> ("parent", 1, 2)
+    components = []
+
+    for token in tokens:
+        if token.type == "{":
+            continue
+
+        if token.type == "}":
+            break
+
+        if token.type == "(":
+            token = next(tokens, None)
+
+            if token is not None and token.type == "NUMBER" and components:
+                components[-1] = token.value
+
+        elif token.type in ("LOWERCASE_IDENTIFIER", "NUMBER"):
+            components.append(token.value)
+
+    return tuple(components)
@@ -14,11 +14,8 @@ import sys
 from datetime import datetime
 
 from pysmi import debug, error
-from pysmi.codegen import JsonCodeGen
-from pysmi.compiler import MibCompiler
-from pysmi.parser import SmiV1CompatParser
-from pysmi.reader import FileReader, get_readers_from_urls
-from pysmi.writer import CallbackWriter
+from pysmi.probe import probe_mib
+from pysmi.reader import FileReader
 
 
 def start():
@@ -30,9 +27,7 @@ def start():
     # Defaults
     quietFlag = False
     verboseFlag = False
-    mibSources = []
     dstDirectory = None
-    cacheDirectory = ""
     dryrunFlag = False
     ignoreErrorsFlag = False
 
@@ -42,16 +37,9 @@ def start():
         [--verbose]
         [--quiet]
         [--debug=<{"|".join(sorted(debug.FLAG_MAP))}>]
-        [--mib-source=<URI>]
-        [--cache-directory=<DIRECTORY>]
         [--ignore-errors]
         [--dry-run]
         <SOURCE [SOURCE...]> <DESTINATION>
-    Where:
-        URI      - file, zip, http, https schemes are supported.
-                Use @mib@ placeholder token in URI to refer directly to
-                the required MIB module when source does not support
-                directory listing (e.g. HTTP).
     """
 
     # TODO(etingof): add the option to copy MIBs into enterprise-indexed subdirs
@@ -118,11 +106,12 @@ def start():
         if opt[0] == "--debug":
             debug.set_logger(debug.Debug(*opt[1].split(",")))
 
-        if opt[0] == "--mib-source":
-            mibSources.append(opt[1])
-
-        if opt[0] == "--cache-directory":
-            cacheDirectory = opt[1]
+        # MIBs are not compiled, so neither MIB sources nor parser
+        # tables are needed
+        if opt[0] in ("--mib-source", "--cache-directory"):
+            sys.stderr.write(
+                f"WARNING: {opt[0]} option is deprecated and has no effect{os.linesep}"
+            )
 
         if opt[0] == "--ignore-errors":
             ignoreErrorsFlag = True
@@ -130,12 +119,6 @@ def start():
         if opt[0] == "--dry-run":
             dryrunFlag = True
 
-    if not mibSources:
-        mibSources = [
-            "file:///usr/share/snmp/mibs",
-            "https://mibs.pysnmp.com/asn1/@mib@",
-        ]
-
     if len(inputMibs) < 2:
         sys.stderr.write(
             f"ERROR: MIB source and/or destination arguments not given{os.linesep}{helpMessage}{os.linesep}"
@@ -156,54 +139,32 @@ def start():
     except OSError:
         pass
 
-    # Compiler infrastructure
-
-    codeGenerator = JsonCodeGen()
-
-    mibParser = SmiV1CompatParser(tempdir=cacheDirectory)
-
-    fileWriter = CallbackWriter(lambda *x: None)
-
     def get_mib_revision(mibDir, mibFile):
-        mibCompiler = MibCompiler(mibParser, codeGenerator, fileWriter)
-
-        mibCompiler.add_sources(
-            FileReader(mibDir, recursive=False, ignoreErrors=ignoreErrorsFlag),
-            *get_readers_from_urls(*mibSources),
+        mibReader = FileReader(mibDir, recursive=False, ignoreErrors=ignoreErrorsFlag)
+        mibReader.set_options(
+            fuzzyMatching=False, uppercaseMatching=False, lowcaseMatching=False
         )
 
-        try:
-            processed = mibCompiler.compile(
-                mibFile,
-                **dict(
-                    noDeps=True,
-                    rebuild=True,
-                    fuzzyMatching=False,
-                    ignoreErrors=ignoreErrorsFlag,
-                ),
-            )
-
-        except error.PySmiError:
-            sys.stderr.write(f"ERROR: {sys.exc_info()[1]}{os.linesep}")
-            sys.exit(EX_SOFTWARE)
+        mibPath = os.path.join(mibDir, mibFile)
 
-        for canonicalMibName in processed:
-            if processed[canonicalMibName] == "compiled" and processed[
-                canonicalMibName
-            ].path == "file://" + os.path.join(mibDir, mibFile):
-                try:
-                    revision = datetime.strptime(
-                        processed[canonicalMibName].revision, "%Y-%m-%d %H:%M"
+        try:
+            mibInfo, mibData = mibReader.get_data(mibFile, exts=[""])
+
+            # only module headers matter here, no need to compile the MIB
+            if mibInfo.path == "file://" + mibPath:
+                for mibHeader in probe_mib(mibData):
+                    return (
+                        mibHeader.name,
+                        mibHeader.revision or datetime.fromtimestamp(0),
                     )
 
-                except Exception:
-                    revision = datetime.fromtimestamp(0)
+        except error.PySmiReaderFileNotFoundError:
+            pass
 
-                return canonicalMibName, revision
+        except error.PySmiError as exc:
+            raise error.PySmiError(f'Can\'t read or parse MIB "{mibPath}": {exc}')
 
-        raise error.PySmiError(
-            f'Can\'t read or parse MIB "{os.path.join(mibDir, mibFile)}"'
-        )
+        raise error.PySmiError(f'Can\'t read or parse MIB "{mibPath}"')
 
     def shorten_path(path, maxLength=45):
         if len(path) > maxLength:
@@ -8,14 +8,18 @@
 # SNMP SMI/MIB data management tool
 #
 import getopt
+import json
 import os
+import signal
 import sys
 from pathlib import Path
 
 from pysmi import config, debug, error
 from pysmi.borrower import AnyFileBorrower, PyFileBorrower
+from pysmi.cache import FileCache
 from pysmi.codegen import JsonCodeGen, NullCodeGen, PySnmpCodeGen
 from pysmi.compiler import MibCompiler
+from pysmi.manifest import BuildManifest
 from pysmi.parser import SmiV1CompatParser
 from pysmi.reader import get_readers_from_urls
 from pysmi.searcher import (
@@ -27,6 +31,11 @@ from pysmi.searcher import (
 from pysmi.writer import CallbackWriter, FileWriter, PyFileWriter
 
 
+def keep_text_layout(symbol, text):
+    # module-level, so that it can be shipped to worker processes
+    return text
+
+
 def start():
     # sysexits.h
     EX_OK = 0
@@ -46,16 +55,26 @@ def start():
     dstTemplate = None
     dstDirectory = None
     cacheDirectory = ""
+    manifestFile = ""
     nodepsFlag = False
     rebuildFlag = False
     dryrunFlag = False
     genMibTextsFlag = False
     keepTextsLayout = False
     pyCompileFlag = True
+    pySourcelessFlag = False
     pyOptimizationLevel = 0
     ignoreErrorsFlag = False
     buildIndexFlag = False
     writeMibsFlag = True
+    jobs = 1
+    lowMemoryFlag = False
+    compactAstFlag = False
+    directRenderFlag = False
+    compactCodeFlag = False
+    planFlag = False
+    serveSocket = ""
+    reportFile = ""
 
     helpMessage = f"""\
     Usage: {sys.argv[0]} [--help]
@@ -71,9 +90,11 @@ def start():
         [--destination-template=<PATH>]
         [--destination-directory=<DIRECTORY>]
         [--cache-directory=<DIRECTORY>]
+        [--build-manifest=<FILE>]
         [--disable-fuzzy-source]
         [--no-dependencies]
         [--no-python-compile]
+        [--no-python-source]
         [--python-optimization-level]
         [--ignore-errors]
         [--build-index]
@@ -82,12 +103,22 @@ def start():
         [--no-mib-writes]
         [--generate-mib-texts]
         [--keep-texts-layout]
+        [--jobs=<N>]
+        [--low-memory]
+        [--compact-ast]
+        [--direct-render]
+        [--compact-code]
+        [--plan]
+        [--serve=<SOCKET>]
+        [--report=<FILE>]
         <MIB-NAME> [MIB-NAME [...]]]
     Where:
         URI      - file, zip, http, https schemes are supported.
                 Use @mib@ placeholder token in URI to refer directly to
                 the required MIB module when source does not support
                 directory listing (e.g. HTTP).
+        SOCKET   - Unix domain socket path to serve compile requests at
+                instead of compiling MIBs given on the command line
         FORMAT   - pysnmp, json, null
         TEMPLATE - path to a Jinja2 template extending the base one (see
                 documentation for details)"""
@@ -110,8 +141,10 @@ def start():
                 "destination-template=",
                 "destination-directory=",
                 "cache-directory=",
+                "build-manifest=",
                 "no-dependencies",
                 "no-python-compile",
+                "no-python-source",
                 "python-optimization-level=",
                 "ignore-errors",
                 "build-index",
@@ -121,6 +154,14 @@ def start():
                 "generate-mib-texts",
                 "disable-fuzzy-source",
                 "keep-texts-layout",
+                "jobs=",
+                "low-memory",
+                "compact-ast",
+                "direct-render",
+                "compact-code",
+                "plan",
+                "serve=",
+                "report=",
             ],
         )
 
@@ -191,12 +232,18 @@ def start():
         if opt[0] == "--cache-directory":
             cacheDirectory = opt[1]
 
+        if opt[0] == "--build-manifest":
+            manifestFile = opt[1]
+
         if opt[0] == "--no-dependencies":
             nodepsFlag = True
 
         if opt[0] == "--no-python-compile":
             pyCompileFlag = False
 
+        if opt[0] == "--no-python-source":
+            pySourcelessFlag = True
+
         if opt[0] == "--python-optimization-level":
             try:
                 pyOptimizationLevel = int(opt[1])
@@ -231,6 +278,37 @@ def start():
         if opt[0] == "--keep-texts-layout":
             keepTextsLayout = True
 
+        if opt[0] == "--low-memory":
+            lowMemoryFlag = True
+
+        if opt[0] == "--compact-ast":
+            compactAstFlag = True
+
+        if opt[0] == "--direct-render":
+            directRenderFlag = True
+
+        if opt[0] == "--compact-code":
+            compactCodeFlag = True
+
+        if opt[0] == "--plan":
+            planFlag = True
+
+        if opt[0] == "--report":
+            reportFile = opt[1]
+
+        if opt[0] == "--serve":
+            serveSocket = opt[1]
+
+        if opt[0] == "--jobs":
+            try:
+                jobs = int(opt[1])
+
+            except ValueError:
+                sys.stderr.write(
+                    f"ERROR: number of jobs must be an integer{os.linesep}{helpMessage}{os.linesep}"
+                )
+                sys.exit(EX_USAGE)
+
     if not mibSources:
         mibSources = [
             "file:///usr/share/snmp/mibs",
@@ -251,7 +329,7 @@ def start():
 
         inputMibs = [os.path.basename(os.path.splitext(x)[0]) for x in inputMibs]
 
-    if not inputMibs:
+    if not inputMibs and not serveSocket:
         sys.stderr.write(
             f"ERROR: MIB module names not specified{os.linesep}{helpMessage}{os.linesep}"
         )
@@ -305,7 +383,9 @@ def start():
         codeGenerator = PySnmpCodeGen()
 
         fileWriter = PyFileWriter(dstDirectory).set_options(
-            pyCompile=pyCompileFlag, pyOptimizationLevel=pyOptimizationLevel
+            pyCompile=pyCompileFlag,
+            pyOptimizationLevel=pyOptimizationLevel,
+            pySourceless=pySourcelessFlag,
         )
 
     elif dstFormat == "json":
@@ -390,17 +470,27 @@ MIBs excluded from code generation: {', '.join(sorted(mibStubs))}
 MIBs to compile: {', '.join(inputMibs)}
 Destination format: {dstFormat}
 Custom destination template: {dstTemplate}
-Parser grammar cache directory: {cacheDirectory or "not used"}
+Render code without template: {"yes" if directRenderFlag or compactCodeFlag else "no"}
+Generate compact code: {"yes" if compactCodeFlag else "no"}
+Parser grammar and parsed MIBs cache directory: {cacheDirectory or "not used"}
+Build manifest: {manifestFile or "not used"}
 Also compile all relevant MIBs: {"no" if nodepsFlag else "yes"}
 Rebuild MIBs regardless of age: {"yes" if rebuildFlag else "no"}
 Dry run mode: {"yes" if dryrunFlag else "no"}
 Create/update MIBs: {"yes" if writeMibsFlag else "no"}
-Byte-compile Python modules: {"yes" if dstFormat == "pysnmp" and pyCompileFlag else "no"} (optimization level {"yes" if dstFormat == "pysnmp" and pyOptimizationLevel else "no"})
+Byte-compile Python modules: {"yes" if dstFormat == "pysnmp" and (pyCompileFlag or pySourcelessFlag) else "no"} (optimization level {"yes" if dstFormat == "pysnmp" and pyOptimizationLevel else "no"})
+Write Python modules source: {"no" if dstFormat == "pysnmp" and pySourcelessFlag else "yes"}
 Ignore compilation errors: {"yes" if ignoreErrorsFlag else "no"}
 Generate OID->MIB index: {"yes" if buildIndexFlag else "no"}
 Generate texts in MIBs: {"yes" if genMibTextsFlag else "no"}
 Keep original texts layout: {"yes" if keepTextsLayout else "no"}
 Try various file names while searching for MIB module: {"yes" if doFuzzyMatchingFlag else "no"}
+Parallel jobs: {jobs}
+Keep memory usage low: {"yes" if lowMemoryFlag else "no"}
+Keep parsed MIBs compact: {"yes" if compactAstFlag else "no"}
+Plan processing order in advance: {"yes" if planFlag else "no"}
+Serve compile requests at: {serveSocket or "not serving"}
+Processing statistics report file: {reportFile or "not written"}
 """
         )
 
@@ -421,20 +511,78 @@ Try various file names while searching for MIB module: {"yes" if doFuzzyMatching
 
         mibCompiler.add_borrowers(*borrowers)
 
-        processed = mibCompiler.compile(
-            *inputMibs,
-            **dict(
-                noDeps=nodepsFlag,
-                rebuild=rebuildFlag,
-                dryRun=dryrunFlag,
-                dstTemplate=dstTemplate,
-                genTexts=genMibTextsFlag,
-                textFilter=keepTextsLayout and (lambda symbol, text: text) or None,
-                writeMibs=writeMibsFlag,
-                ignoreErrors=ignoreErrorsFlag,
-            ),
+        if cacheDirectory:
+            mibCompiler.set_cache(FileCache(os.path.join(cacheDirectory, "mibs")))
+
+        if manifestFile:
+            mibCompiler.set_manifest(BuildManifest(manifestFile))
+
+        renderer = "template"
+
+        if compactCodeFlag:
+            renderer = "compact"
+
+        elif directRenderFlag:
+            renderer = "direct"
+
+        compileOptions = dict(
+            noDeps=nodepsFlag,
+            rebuild=rebuildFlag,
+            dryRun=dryrunFlag,
+            dstTemplate=dstTemplate,
+            genTexts=genMibTextsFlag,
+            textFilter=keepTextsLayout and keep_text_layout or None,
+            writeMibs=writeMibsFlag,
+            ignoreErrors=ignoreErrorsFlag,
+            jobs=jobs,
+            lowMemory=lowMemoryFlag,
+            compactAst=compactAstFlag,
+            renderer=renderer,
         )
 
+        if serveSocket:
+            # Unix domain sockets are not available everywhere
+            from pysmi.server import CompileServer
+
+            try:
+                server = CompileServer(
+                    serveSocket,
+                    mibCompiler,
+                    buildIndex=buildIndexFlag,
+                    **compileOptions,
+                )
+
+            except OSError:
+                raise error.PySmiError(
+                    f"failure serving at {serveSocket}: {sys.exc_info()[1]}"
+                )
+
+            # shut down gracefully on termination
+            signal.signal(signal.SIGTERM, lambda *args: sys.exit(EX_OK))
+
+            try:
+                server.serve_forever()
+
+            except KeyboardInterrupt:
+                pass
+
+            finally:
+                server.server_close()
+
+            sys.exit(EX_OK)
+
+        if planFlag:
+            plan = mibCompiler.plan(*inputMibs)
+
+            if verboseFlag:
+                sys.stderr.write(
+                    f"MIBs planned: {len(plan)} in {len(plan.waves)} waves, missing: {', '.join(plan.missing) or '<none>'}{os.linesep}"
+                )
+
+            compileOptions["plan"] = plan
+
+        processed = mibCompiler.compile(*inputMibs, **compileOptions)
+
         safe = {}
         sorted_files = sorted(processed)
         for x in sorted_files:
@@ -444,6 +592,16 @@ Try various file names while searching for MIB module: {"yes" if doFuzzyMatching
         if buildIndexFlag:
             mibCompiler.build_index(safe, dryRun=dryrunFlag, ignoreErrors=True)
 
+        if reportFile:
+            try:
+                with open(reportFile, "w") as f:
+                    json.dump(mibCompiler.build_report(processed), f, indent=2)
+
+            except OSError:
+                raise error.PySmiError(
+                    f"failure writing report file {reportFile}: {sys.exc_info()[1]}"
+                )
+
     except error.PySmiError:
         sys.stderr.write(f"ERROR: {sys.exc_info()[1]}{os.linesep}")
         sys.exit(EX_SOFTWARE)
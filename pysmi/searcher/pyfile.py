@@ -57,7 +57,7 @@ class PyFileSearcher(AbstractSearcher):
 
             try:
                 fp = open(f, "rb")
-                pyData = fp.read(8)
+                pyData = fp.read(16)
                 fp.close()
 
             except OSError:
@@ -65,9 +65,14 @@ class PyFileSearcher(AbstractSearcher):
                     f"failure opening compiled file {f}: {sys.exc_info()[1]}",
                     searcher=self,
                 )
-            if pyData[:4] == PY_MAGIC_NUMBER:
-                pyData = pyData[4:]
-                pyTime = struct.unpack("<L", pyData[:4])[0]
+            if pyData[:4] == PY_MAGIC_NUMBER and len(pyData) == 16:
+                # PEP 552 header: magic, flags, source mtime and size
+                flags, pyTime = struct.unpack("<LL", pyData[4:12])
+
+                # hash-based .pyc does not carry source mtime
+                if flags & 0x01:
+                    pyTime = os.stat(f)[8]
+
                 debug.logger & debug.FLAG_SEARCHER and debug.logger(
                     f"found {f}, mtime {time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(pyTime))}"
                 )
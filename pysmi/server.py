@@ -0,0 +1,269 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import errno
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+
+from pysmi import debug
+from pysmi import error
+from pysmi.compiler import MibStatus
+
+
+def encode_status(status):
+    """Turn *MibStatus* into a JSON-serializable dictionary."""
+    data = {"status": str(status)}
+
+    for k, v in vars(status).items():
+        if isinstance(v, (tuple, list)):
+            data[k] = [str(x) for x in v]
+
+        elif isinstance(v, dict):
+            data[k] = {str(x): y for x, y in v.items()}
+
+        elif v is None or isinstance(v, (bool, int, float)):
+            data[k] = v
+
+        else:
+            data[k] = str(v)
+
+    return data
+
+
+def decode_status(data):
+    """Turn dictionary produced by *encode_status* back into *MibStatus*."""
+    data = dict(data)
+
+    return MibStatus(data.pop("status")).set_options(**data)
+
+
+class CompileRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                try:
+                    request = json.loads(line)
+
+                except ValueError:
+                    raise error.PySmiError(f"malformed request: {sys.exc_info()[1]}")
+
+                response = self.server.handle_compile(request)
+
+            except error.PySmiError:
+                response = {"error": str(sys.exc_info()[1])}
+
+            except Exception:
+                debug.logger & debug.FLAG_SERVER and debug.logger(
+                    f"request failed: {sys.exc_info()[1]!r}"
+                )
+                response = {"error": f"internal error: {sys.exc_info()[1]!r}"}
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+# Unix domain sockets are not available everywhere (e.g. on Windows)
+if hasattr(socket, "AF_UNIX"):
+    _StreamServer = socketserver.UnixStreamServer
+
+else:
+    _StreamServer = socketserver.BaseServer
+
+
+def remove_stale_socket(path):
+    """Remove Unix domain socket at *path* unless a server listens on it.
+
+    Raises *OSError* if *path* exists, but is not a socket or is still
+    in use. Missing *path* is fine.
+    """
+    try:
+        mode = os.stat(path).st_mode
+
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "File exists and is not a socket", path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+
+        except OSError:
+            pass
+
+        else:
+            raise OSError(
+                errno.EADDRINUSE, "Socket is in use by a running server", path
+            )
+
+    debug.logger & debug.FLAG_SERVER and debug.logger(f"removing stale socket {path}")
+
+    os.unlink(path)
+
+
+class CompileServer(socketserver.ThreadingMixIn, _StreamServer):
+    """Serves MIB compilation requests over a Unix domain socket.
+
+    The server keeps a configured *MibCompiler* (along with its parser,
+    code generator and anything they have set up on first use) alive in
+    between requests, so repeated requests for a few MIBs each do not pay
+    for interpreter start up and parser tables construction.
+
+    Requests and responses are single-line JSON documents. A request
+    looks like `{"mibs": ["IF-MIB"], "options": {"rebuild": true}}`,
+    a response maps MIB names to their statuses, e.g. `{"mibs":
+    {"IF-MIB": {"status": "compiled", ...}}}`, or reports a failure to
+    serve the request as `{"error": "..."}`. Several requests may be
+    sent over one connection. Each connection is served in a thread of
+    its own, so idle clients do not hold up others, while requests are
+    still served one at a time.
+    """
+
+    # idle clients must not keep the server from shutting down
+    daemon_threads = True
+    block_on_close = False
+
+    #: compile options clients may set on per-request basis
+    requestOptions = (
+        "noDeps",
+        "rebuild",
+        "dryRun",
+        "genTexts",
+        "ignoreErrors",
+        "writeMibs",
+        "lowMemory",
+    )
+
+    def __init__(self, path, mibCompiler, buildIndex=False, **options):
+        """Creates an instance of *CompileServer* class.
+
+        Args:
+            path: Unix domain socket path, stale socket is replaced
+            mibCompiler: fully configured *MibCompiler* instance
+            buildIndex: update OID->MIB index after each request
+            options: default *MibCompiler.compile* options
+
+        Raises:
+            OSError: if *path* can not be served at, e.g. it is not a
+                socket or another server is running there
+        """
+        self._path = path
+        self._mibCompiler = mibCompiler
+        self._buildIndex = buildIndex
+        self._options = options
+        self._lock = threading.Lock()
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError(
+                errno.EAFNOSUPPORT, "Unix domain sockets are not supported", path
+            )
+
+        remove_stale_socket(path)
+
+        _StreamServer.__init__(self, path, CompileRequestHandler)
+
+        debug.logger & debug.FLAG_SERVER and debug.logger(
+            f"serving compile requests at {path}"
+        )
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f'{self.__class__.__name__}{{"{self._path}"}}'
+
+    def server_close(self):
+        _StreamServer.server_close(self)
+
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+    def handle_compile(self, request):
+        if not isinstance(request, dict) or not isinstance(request.get("mibs"), list):
+            raise error.PySmiError("MIB names not specified")
+
+        options = dict(self._options)
+
+        for k, v in request.get("options", {}).items():
+            if k not in self.requestOptions:
+                raise error.PySmiError(f"unsupported compile option {k}")
+
+            options[k] = v
+
+        mibnames = [str(x) for x in request["mibs"]]
+
+        debug.logger & debug.FLAG_SERVER and debug.logger(
+            f"compiling {', '.join(mibnames)}"
+        )
+
+        # MIB compiler and the MIBs it writes are not to be shared
+        with self._lock:
+            processed = self._mibCompiler.compile(*mibnames, **options)
+
+            if self._buildIndex:
+                self._mibCompiler.build_index(
+                    {x: processed[x] for x in processed if processed[x] != "failed"},
+                    dryRun=options.get("dryRun"),
+                    ignoreErrors=True,
+                )
+
+        return {"mibs": {x: encode_status(processed[x]) for x in processed}}
+
+
+class CompileClient:
+    """Submits MIB compilation requests to *CompileServer*."""
+
+    def __init__(self, path, timeout=None):
+        """Creates an instance of *CompileClient* class.
+
+        Args:
+            path: Unix domain socket path *CompileServer* listens at
+            timeout: seconds to wait for the server to respond
+        """
+        self._path = path
+        self._timeout = timeout
+
+    def __str__(self):
+        """Return a string representation of the instance."""
+        return f'{self.__class__.__name__}{{"{self._path}"}}'
+
+    def compile(self, *mibnames, **options):
+        """Have the server transform requested and possibly referred MIBs.
+
+        Args:
+            mibnames: list of ASN.1 MIBs names
+            options: subset of *MibCompiler.compile* options, see
+                *CompileServer.requestOptions*
+
+        Returns:
+            A dictionary of MIB module names processed (keys) and *MibStatus*
+            class instances (values)
+
+        """
+        request = json.dumps({"mibs": mibnames, "options": options})
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self._timeout)
+                sock.connect(self._path)
+                sock.sendall(request.encode("utf-8") + b"\n")
+
+                with sock.makefile("rb") as f:
+                    response = json.loads(f.readline())
+
+        except (OSError, ValueError):
+            raise error.PySmiError(
+                f"failure talking to compile server at {self._path}: {sys.exc_info()[1]}"
+            )
+
+        if "error" in response:
+            raise error.PySmiError(f"compile server error: {response['error']}")
+
+        return {x: decode_status(y) for x, y in response["mibs"].items()}
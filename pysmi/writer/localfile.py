@@ -58,7 +58,7 @@ class FileWriter(AbstractWriter):
 
         if not os.path.exists(self._path):
             try:
-                os.makedirs(self._path)
+                os.makedirs(self._path, exist_ok=True)
 
             except OSError:
                 raise error.PySmiWriterError(
@@ -5,17 +5,22 @@
 # License: https://www.pysnmp.com/pysmi/license.html
 #
 import importlib.machinery
+import importlib.util
+import marshal
 import os
 import py_compile
 import sys
 import tempfile
+import time
 
 from pysmi import debug
 from pysmi import error
 from pysmi.compat import decode, encode
 from pysmi.writer.base import AbstractWriter
 
+PY_MAGIC_NUMBER = importlib.util.MAGIC_NUMBER
 SOURCE_SUFFIXES = importlib.machinery.SOURCE_SUFFIXES
+BYTECODE_SUFFIXES = importlib.machinery.BYTECODE_SUFFIXES
 
 
 class PyFileWriter(AbstractWriter):
@@ -23,10 +28,21 @@ class PyFileWriter(AbstractWriter):
 
     User is expected to pass *PyFileWriter* class instance to
     *MibCompiler* on instantiation. The rest is internal to *MibCompiler*.
+
+    Unless *pyCompile* is off, Python files are byte-compiled as well.
+    By default, that is done by *py_compile* reading the file just
+    written, with syntax errors ignored. With *pyCompileInMemory* set,
+    the code is compiled in memory before anything gets written, so that
+    syntax errors fail the MIB, and *.pyc* file is written right away.
+    With *pySourceless* set (which implies *pyCompileInMemory*), only
+    the *.pyc* file is written, next to where the Python file would be,
+    so that it can be imported without the source.
     """
 
     pyCompile = True
     pyOptimizationLevel = -1
+    pyCompileInMemory = False
+    pySourceless = False
 
     def __init__(self, path):
         """Creates an instance of *PyFileWriter* class.
@@ -47,7 +63,7 @@ class PyFileWriter(AbstractWriter):
 
         if not os.path.exists(self._path):
             try:
-                os.makedirs(self._path)
+                os.makedirs(self._path, exist_ok=True)
 
             except OSError:
                 raise error.PySmiWriterError(
@@ -61,24 +77,24 @@ class PyFileWriter(AbstractWriter):
         pyfile = os.path.join(self._path, decode(mibname))
         pyfile += SOURCE_SUFFIXES[0]
 
-        tfile = None
+        if self.pySourceless or self.pyCompile and self.pyCompileInMemory:
+            self.put_code(mibname, pyfile, data)
 
-        try:
-            fd, tfile = tempfile.mkstemp(dir=self._path)
-            os.write(fd, encode(data))
-            os.close(fd)
-            os.rename(tfile, pyfile)
+            debug.logger & debug.FLAG_WRITER and debug.logger(f"{mibname} stored")
 
-        except (OSError, UnicodeEncodeError):
-            exc = sys.exc_info()
-            if tfile and os.access(tfile, os.F_OK):
-                os.unlink(tfile)
+            return
 
+        try:
+            source = encode(data)
+
+        except UnicodeEncodeError:
             raise error.PySmiWriterError(
-                f"failure writing file {pyfile}: {exc[1]}", file=pyfile, writer=self
+                f"failure writing file {pyfile}: {sys.exc_info()[1]}",
+                file=pyfile,
+                writer=self,
             )
 
-        debug.logger & debug.FLAG_WRITER and debug.logger(f"created file {pyfile}")
+        self.write_file(pyfile, source)
 
         if self.pyCompile:
             try:
@@ -101,5 +117,116 @@ class PyFileWriter(AbstractWriter):
 
         debug.logger & debug.FLAG_WRITER and debug.logger(f"{mibname} stored")
 
+    def put_code(self, mibname, pyfile, data):
+        """Compile Python code in memory and write it out along with *.pyc*.
+
+        Args:
+            mibname: name of MIB module
+            pyfile: path to Python file to write
+            data: Python code
+
+        Raises:
+            PySmiWriterError: if code could not be compiled or written
+        """
+        try:
+            source = encode(data)
+
+            code = compile(
+                source,
+                pyfile,
+                "exec",
+                dont_inherit=True,
+                optimize=self.pyOptimizationLevel,
+            )
+
+        except (SyntaxError, ValueError, UnicodeEncodeError):
+            raise error.PySmiWriterError(
+                f"failure compiling {pyfile}: {sys.exc_info()[1]}",
+                file=mibname,
+                writer=self,
+            )
+
+        if self.pySourceless:
+            pycfile = pyfile[: -len(SOURCE_SUFFIXES[0])] + BYTECODE_SUFFIXES[0]
+
+            mtime = int(time.time())
+
+            # Python would import stale source rather than bytecode
+            if os.path.isfile(pyfile):
+                try:
+                    os.unlink(pyfile)
+
+                except OSError:
+                    raise error.PySmiWriterError(
+                        f"failure removing file {pyfile}: {sys.exc_info()[1]}",
+                        file=pyfile,
+                        writer=self,
+                    )
+
+        else:
+            # the same location as chosen by py_compile
+            if self.pyOptimizationLevel >= 0:
+                pycfile = importlib.util.cache_from_source(
+                    pyfile,
+                    optimization=self.pyOptimizationLevel or "",
+                )
+
+            else:
+                pycfile = importlib.util.cache_from_source(pyfile)
+
+            self.write_file(pyfile, source)
+
+            try:
+                mtime = int(os.stat(pyfile).st_mtime)
+
+            except OSError:
+                raise error.PySmiWriterError(
+                    f"failure writing file {pyfile}: {sys.exc_info()[1]}",
+                    file=pyfile,
+                    writer=self,
+                )
+
+        # timestamp-based .pyc header as of PEP 552
+        header = PY_MAGIC_NUMBER + b"".join(
+            (x & 0xFFFFFFFF).to_bytes(4, "little") for x in (0, mtime, len(source))
+        )
+
+        try:
+            os.makedirs(os.path.dirname(pycfile), exist_ok=True)
+
+        except OSError:
+            raise error.PySmiWriterError(
+                f"failure creating directory for {pycfile}: {sys.exc_info()[1]}",
+                file=pycfile,
+                writer=self,
+            )
+
+        self.write_file(pycfile, header + marshal.dumps(code))
+
+    def write_file(self, path, data):
+        """Atomically write *data* bytes into file at *path*.
+
+        Raises:
+            PySmiWriterError: if file could not be written
+        """
+        tfile = None
+
+        try:
+            fd, tfile = tempfile.mkstemp(dir=os.path.dirname(path))
+            os.write(fd, data)
+            os.close(fd)
+            os.rename(tfile, path)
+
+        except OSError:
+            exc = sys.exc_info()
+            if tfile and os.access(tfile, os.F_OK):
+                os.unlink(tfile)
+
+            raise error.PySmiWriterError(
+                f"failure writing file {path}: {exc[1]}", file=path, writer=self
+            )
+
+        debug.logger & debug.FLAG_WRITER and debug.logger(f"created file {path}")
+
     def get_data(self, filename):
         return ""
@@ -7,6 +7,7 @@ Equivalent to Build-Packages.ps1
 import os
 import shutil
 import subprocess
+import sys
 
 
 def main():
@@ -18,6 +19,20 @@ def main():
     else:
         print("dist directory not found. Skipping removal.")
 
+    # Ship LALR tables of the parser dialects along with the package
+    print("Building parser tables...")
+    if os.path.isdir(os.path.join("pysmi", "parser", "tables")):
+        shutil.rmtree(os.path.join("pysmi", "parser", "tables"))
+
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from pysmi.parser.smi import build_tables; build_tables()",
+        ],
+        check=True,
+    )
+
     # Build the packages
     print("Building packages...")
     subprocess.run(["uv", "build"], check=True)
@@ -1 +1,13 @@
 # This file is necessary to make this directory a package.
+import atexit
+import os
+import shutil
+import tempfile
+
+# keep parser tables and compiled templates built by tests (and by worker
+# processes they start) out of the real per-user cache directory
+_cacheDir = tempfile.mkdtemp()
+
+os.environ["XDG_CACHE_HOME"] = os.environ["LOCALAPPDATA"] = _cacheDir
+
+atexit.register(shutil.rmtree, _cacheDir, True)
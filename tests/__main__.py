@@ -13,6 +13,15 @@ except ImportError:
 suite = unittest.TestLoader().loadTestsFromNames(
     [
         "test_zipreader",
+        "test_compiler",
+        "test_server",
+        "test_parser",
+        "test_probe",
+        "test_planner",
+        "test_intermediate",
+        "test_jenv",
+        "test_emitter",
+        "test_pyfile",
         "test_agentcapabilities_smiv2_pysnmp",
         "test_defval_smiv2_pysnmp",
         "test_imports_smiv2_pysnmp",
@@ -0,0 +1,675 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import gc
+import multiprocessing
+import os
+import sys
+import shutil
+import tempfile
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from unittest import mock
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.cache.localfile import FileCache
+from pysmi.codegen.jsondoc import JsonCodeGen
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi import error
+from pysmi.compiler import MibCompiler, MibStatus, parse_bundle, parse_mib
+from pysmi.manifest import BuildManifest
+from pysmi.parser.smi import parserFactory
+from pysmi.probe import split_mib
+from pysmi.reader.localfile import FileReader
+from pysmi.searcher.pyfile import PyFileSearcher
+from pysmi.searcher.stub import StubSearcher
+from pysmi.writer.callback import CallbackWriter
+from pysmi.writer.pyfile import PyFileWriter
+
+MIBS = {
+    "TEST-MIB": """
+    TEST-MIB DEFINITIONS ::= BEGIN
+    IMPORTS
+      MODULE-IDENTITY, OBJECT-TYPE
+        FROM SNMPv2-SMI
+      TestString
+        FROM TEST-TC-MIB;
+
+    testModule MODULE-IDENTITY
+        LAST-UPDATED "202501010000Z"
+        ORGANIZATION "Test"
+        CONTACT-INFO "Test"
+        DESCRIPTION  "Test module"
+        REVISION     "202501010000Z"
+        DESCRIPTION  "Initial revision"
+     ::= { 1 3 6 1 4 1 99999 }
+
+    testObject OBJECT-TYPE
+        SYNTAX          TestString
+        MAX-ACCESS      read-only
+        STATUS          current
+        DESCRIPTION     "Test object"
+     ::= { testModule 1 }
+
+    END
+    """,
+    "TEST-TC-MIB": """
+    TEST-TC-MIB DEFINITIONS ::= BEGIN
+    IMPORTS
+      TEXTUAL-CONVENTION
+        FROM SNMPv2-TC;
+
+    TestString ::= TEXTUAL-CONVENTION
+        STATUS       current
+        DESCRIPTION  "Test TC"
+        SYNTAX       OCTET STRING (SIZE (0..255))
+
+    END
+    """,
+    "BROKEN-MIB": """
+    BROKEN-MIB DEFINITIONS ::= BEGIN
+    IMPORTS
+      OBJECT-TYPE
+        FROM SNMPv2-SMI;
+
+    brokenObject OBJECT-TYPE
+        SYNTAX
+    END
+    """,
+    "BROKEN-TC-MIB": """
+    BROKEN-TC-MIB DEFINITIONS ::= BEGIN
+    IMPORTS
+      TestString
+        FROM TEST-TC-MIB;
+
+    brokenObject OBJECT-TYPE
+        SYNTAX TestString
+    END
+    """,
+}
+
+
+class MibCompilerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = parserFactory()()
+
+    def setUp(self):
+        self.srcDir = tempfile.mkdtemp()
+
+        for mibname, text in MIBS.items():
+            with open(os.path.join(self.srcDir, mibname), "w") as f:
+                f.write(textwrap.dedent(text))
+
+    def tearDown(self):
+        shutil.rmtree(self.srcDir)
+
+    def compile(self, *mibnames, cache=None, stubs=(), **options):
+        written = {}
+
+        def put_data(mibname, data, cbCtx):
+            # drop header comments carrying build time
+            written[mibname] = [x for x in data.splitlines() if x[:1] != "#"]
+
+        mibCompiler = MibCompiler(
+            self.parser, PySnmpCodeGen(), CallbackWriter(put_data)
+        )
+        mibCompiler.add_sources(FileReader(self.srcDir))
+        mibCompiler.add_searchers(StubSearcher(*PySnmpCodeGen.baseMibs, *stubs))
+        mibCompiler.set_cache(cache)
+
+        processed = mibCompiler.compile(*mibnames, **options)
+
+        return processed, written
+
+    # base MIBs are not available as ASN.1 sources here
+
+    def testCompile(self):
+        processed, written = self.compile("TEST-MIB", ignoreErrors=True)
+
+        self.assertEqual(processed["TEST-MIB"], "compiled")
+        self.assertEqual(processed["TEST-TC-MIB"], "compiled")
+        self.assertEqual(processed["TEST-MIB"].revision, "2025-01-01 00:00")
+        self.assertEqual(sorted(written), ["TEST-MIB", "TEST-TC-MIB"])
+
+    def testCompileFailure(self):
+        processed, written = self.compile("TEST-MIB", "BROKEN-MIB")
+
+        self.assertEqual(processed["SNMPv2-SMI"], "missing")
+        self.assertEqual(processed["BROKEN-MIB"], "failed")
+        self.assertEqual(processed["TEST-MIB"], "unprocessed")
+        self.assertFalse(written)
+
+    def testParallelCompileMatchesSerial(self):
+        for mibnames, options in (
+            (("TEST-MIB",), {}),
+            (("TEST-MIB",), {"ignoreErrors": True}),
+            (("TEST-MIB", "BROKEN-MIB", "NO-SUCH-MIB"), {"ignoreErrors": True}),
+        ):
+            serial = self.compile(*mibnames, **options)
+            parallel = self.compile(*mibnames, jobs=2, **options)
+
+            self.assertEqual(list(serial[0].items()), list(parallel[0].items()))
+            self.assertEqual(
+                [
+                    getattr(x, "error", None) and str(x.error)
+                    for x in serial[0].values()
+                ],
+                [
+                    getattr(x, "error", None) and str(x.error)
+                    for x in parallel[0].values()
+                ],
+            )
+            self.assertEqual(serial[1], parallel[1])
+
+    def testParallelCompileTextFilter(self):
+        options = dict(
+            genTexts=True,
+            textFilter=lambda symbol, text: text.upper(),
+            ignoreErrors=True,
+        )
+
+        serial = self.compile("TEST-MIB", "TEST-TC-MIB", **options)
+
+        # spawned workers get everything pickled
+        with mock.patch(
+            "pysmi.compiler.ProcessPoolExecutor",
+            partial(
+                ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+            ),
+        ):
+            parallel = self.compile("TEST-MIB", "TEST-TC-MIB", jobs=2, **options)
+
+        self.assertEqual(serial, parallel)
+        self.assertIn(
+            '    testObject.setDescription("TEST OBJECT")', parallel[1]["TEST-MIB"]
+        )
+
+    def testLowMemoryCompileMatchesDefault(self):
+        for mibnames, options in (
+            (("TEST-MIB",), {}),
+            (("TEST-MIB",), {"ignoreErrors": True}),
+            (("TEST-MIB", "BROKEN-MIB", "NO-SUCH-MIB"), {"ignoreErrors": True}),
+        ):
+            default = self.compile(*mibnames, **options)
+
+            for jobs in (1, 2):
+                lowMemory = self.compile(
+                    *mibnames, lowMemory=True, jobs=jobs, **options
+                )
+
+                self.assertEqual(default[0], lowMemory[0])
+                self.assertEqual(default[1], lowMemory[1])
+
+    def testPlan(self):
+        mibCompiler = MibCompiler(
+            self.parser, PySnmpCodeGen(), CallbackWriter(lambda *x: None)
+        )
+        mibCompiler.add_sources(FileReader(self.srcDir))
+
+        plan = mibCompiler.plan("TEST-MIB", "NO-SUCH-MIB")
+
+        self.assertEqual(plan.waves, (("TEST-TC-MIB",), ("TEST-MIB",)))
+        self.assertEqual(plan.missing, ("NO-SUCH-MIB", "SNMPv2-SMI", "SNMPv2-TC"))
+
+    def testPlannedCompileMatchesDefault(self):
+        for mibnames, options in (
+            (("TEST-MIB",), {}),
+            (("TEST-MIB", "BROKEN-MIB"), {}),
+            (("TEST-MIB", "BROKEN-MIB", "NO-SUCH-MIB"), {"ignoreErrors": True}),
+            # imports of MIBs failing to parse are not processed
+            (("BROKEN-TC-MIB",), {}),
+            (("BROKEN-TC-MIB",), {"ignoreErrors": True}),
+        ):
+            default = self.compile(*mibnames, **options)
+
+            for jobs in (1, 2):
+                planned = self.compile(*mibnames, plan=True, jobs=jobs, **options)
+
+                self.assertEqual(default[0], planned[0])
+                self.assertEqual(
+                    {
+                        x: getattr(y, "error", None) and str(y.error)
+                        for x, y in default[0].items()
+                    },
+                    {
+                        x: getattr(y, "error", None) and str(y.error)
+                        for x, y in planned[0].items()
+                    },
+                )
+                self.assertEqual(default[1], planned[1])
+
+    def testCompactAstCompileMatchesDefault(self):
+        for mibnames, options in (
+            (("TEST-MIB",), {}),
+            (("TEST-MIB", "BROKEN-MIB", "NO-SUCH-MIB"), {"ignoreErrors": True}),
+        ):
+            default = self.compile(*mibnames, **options)
+
+            for jobs in (1, 2):
+                compact = self.compile(*mibnames, compactAst=True, jobs=jobs, **options)
+
+                self.assertEqual(default[0], compact[0])
+                self.assertEqual(default[1], compact[1])
+
+    def testStatistics(self):
+        cache = FileCache(os.path.join(self.srcDir, "cache"))
+
+        processed, written = self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        status = processed["TEST-MIB"]
+
+        self.assertEqual(
+            sorted(status.timings),
+            ["codegen", "parse", "read", "search", "symtable", "write"],
+        )
+        self.assertEqual(
+            status.bytesRead, len(textwrap.dedent(MIBS["TEST-MIB"]).encode())
+        )
+        self.assertEqual(status.cacheHits, 0)
+        self.assertEqual(processed["SNMPv2-SMI"].bytesRead, 0)
+
+        processed, written = self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        self.assertGreater(processed["TEST-MIB"].cacheHits, 0)
+
+        report = MibCompiler.build_report(processed)
+
+        self.assertEqual(
+            report["statuses"], {"compiled": 2, "missing": len(processed) - 2}
+        )
+        self.assertEqual(
+            report["bytesRead"], sum(x.bytesRead for x in processed.values())
+        )
+        self.assertEqual(report["mibs"]["TEST-MIB"]["status"], "compiled")
+        self.assertAlmostEqual(
+            report["timings"]["read"],
+            sum(x.timings.get("read", 0) for x in processed.values()),
+        )
+
+        # statuses carrying no statistics do not share any
+        status = MibStatus("compiled")
+
+        self.assertIsNone(status.timings)
+        self.assertEqual(MibCompiler.build_report({"TEST-MIB": status})["timings"], {})
+
+    def testParseBundle(self):
+        bundle = "\n-- next module\n".join(
+            textwrap.dedent(MIBS[x]) for x in ("TEST-TC-MIB", "TEST-MIB")
+        )
+
+        self.assertEqual(
+            self.parser.parse(bundle), parse_bundle(self.parser, bundle, jobs=2)
+        )
+
+        with mock.patch("pysmi.compiler.bundleSize", 0):
+            self.assertEqual(
+                self.parser.parse(bundle), parse_mib(self.parser, bundle, jobs=2)
+            )
+
+        bundle += textwrap.dedent(MIBS["BROKEN-MIB"])
+
+        with self.assertRaises(error.PySmiParserError) as parsed:
+            self.parser.parse(bundle)
+
+        with self.assertRaises(error.PySmiParserError) as bundled:
+            parse_bundle(self.parser, bundle, jobs=2)
+
+        self.assertEqual(str(parsed.exception), str(bundled.exception))
+        self.assertEqual(parsed.exception.lineno, 48)
+
+    def testCompileBundle(self):
+        with open(os.path.join(self.srcDir, "BUNDLE"), "w") as f:
+            f.write(
+                "".join(textwrap.dedent(MIBS[x]) for x in ("TEST-MIB", "TEST-TC-MIB"))
+            )
+
+        serial = self.compile("BUNDLE", ignoreErrors=True)
+
+        self.assertEqual(serial[0]["TEST-MIB"], "compiled")
+
+        for context in multiprocessing.get_all_start_methods():
+            chunks = []
+
+            def counting_split_mib(data):
+                chunks.append(len(split_mib(data)))
+                return split_mib(data)
+
+            with mock.patch("pysmi.compiler.bundleSize", 0), mock.patch(
+                "pysmi.compiler.split_mib", counting_split_mib
+            ), mock.patch(
+                "pysmi.compiler.ProcessPoolExecutor",
+                partial(
+                    ProcessPoolExecutor,
+                    mp_context=multiprocessing.get_context(context),
+                ),
+            ):
+                parallel = self.compile("BUNDLE", ignoreErrors=True, jobs=2)
+
+            self.assertEqual(serial, parallel)
+
+            # bundle is split by the coordinator, even if workers fetched it
+            self.assertIn(2, chunks)
+
+    def testParseCache(self):
+        cache = FileCache(os.path.join(self.srcDir, "cache"))
+
+        processed, written = self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        with mock.patch.object(
+            self.parser, "parse", side_effect=AssertionError("MIB parsed")
+        ):
+            cached = self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        self.assertEqual(list(processed.items()), list(cached[0].items()))
+        self.assertEqual(written, cached[1])
+
+    def testParseCacheMiss(self):
+        cache = FileCache(os.path.join(self.srcDir, "cache"))
+
+        self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        with open(os.path.join(self.srcDir, "TEST-TC-MIB"), "a") as f:
+            f.write("-- changed")
+
+        with mock.patch.object(
+            self.parser, "parse", side_effect=self.parser.parse
+        ) as parse:
+            self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        self.assertEqual(parse.call_count, 1)
+
+    def testParseCacheTexts(self):
+        cache = FileCache(os.path.join(self.srcDir, "cache"))
+
+        self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        # ASTs parsed without texts do not stand in for complete ones
+        with mock.patch.object(
+            self.parser, "parse", side_effect=self.parser.parse
+        ) as parse:
+            processed, written = self.compile(
+                "TEST-MIB", cache=cache, ignoreErrors=True, genTexts=True
+            )
+
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(
+            (processed, written),
+            self.compile("TEST-MIB", ignoreErrors=True, genTexts=True),
+        )
+
+    def testSymbolTableCache(self):
+        cache = FileCache(os.path.join(self.srcDir, "cache"))
+
+        self.compile("TEST-MIB", cache=cache, ignoreErrors=True)
+
+        with open(os.path.join(self.srcDir, "TEST-MIB"), "a") as f:
+            f.write("-- changed")
+
+        with mock.patch("pysmi.compiler.parse_mib", side_effect=parse_mib) as parse:
+            processed, written = self.compile(
+                "TEST-MIB", cache=cache, stubs=["TEST-TC-MIB"], ignoreErrors=True
+            )
+
+        # TEST-TC-MIB symbols came from cache
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(processed["TEST-MIB"], "compiled")
+        self.assertEqual(processed["TEST-TC-MIB"], "untouched")
+        self.assertEqual(sorted(written), ["TEST-MIB"])
+
+    def testCompileIter(self):
+        for mibnames, options in (
+            (("TEST-MIB",), {"ignoreErrors": True}),
+            (("TEST-MIB", "BROKEN-MIB"), {}),
+            (("TEST-MIB", "BROKEN-MIB", "NO-SUCH-MIB"), {"ignoreErrors": True}),
+        ):
+            processed, written = self.compile(*mibnames, **options)
+
+            written = {}
+
+            def put_data(mibname, data, cbCtx):
+                written[mibname] = data
+
+            mibCompiler = MibCompiler(
+                self.parser, PySnmpCodeGen(), CallbackWriter(put_data)
+            )
+            mibCompiler.add_sources(FileReader(self.srcDir))
+            mibCompiler.add_searchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+
+            reported = {}
+
+            for mibname, status in mibCompiler.compile_iter(*mibnames, **options):
+                self.assertNotIn(mibname, reported)
+                self.assertEqual(status == "compiled", mibname in written)
+
+                reported[mibname] = status
+
+            self.assertEqual(processed, reported)
+
+    def testCompileIterReleasesAsts(self):
+        mibTrees = []
+
+        class RecordingCodeGen(PySnmpCodeGen):
+            def gen_code(self, ast, symbolTable, **kwargs):
+                mibTrees.append(ast)
+                return PySnmpCodeGen.gen_code(self, ast, symbolTable, **kwargs)
+
+        mibCompiler = MibCompiler(
+            self.parser, RecordingCodeGen(), CallbackWriter(lambda *args: None)
+        )
+        mibCompiler.add_sources(FileReader(self.srcDir))
+        mibCompiler.add_searchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+
+        statuses = mibCompiler.compile_iter("TEST-MIB", ignoreErrors=True)
+
+        for mibname, status in statuses:
+            if status == "compiled":
+                break
+
+        # code is generated for all MIBs before any is written
+        self.assertEqual(len(mibTrees), 2)
+
+        # parser holds on to the last AST it built
+        self.parser.parse("")
+
+        for mibTree in mibTrees:
+            self.assertEqual(
+                [x for x in gc.get_referrers(mibTree) if x is not mibTrees], []
+            )
+
+        # the rest of MIBs get written
+        self.assertIn("compiled", dict(statuses).values())
+
+    def build(self, manifest, **options):
+        dstDir = os.path.join(self.srcDir, "build")
+
+        mibCompiler = MibCompiler(self.parser, PySnmpCodeGen(), PyFileWriter(dstDir))
+        mibCompiler.add_sources(FileReader(self.srcDir))
+        mibCompiler.add_searchers(
+            PyFileSearcher(dstDir), StubSearcher(*PySnmpCodeGen.baseMibs)
+        )
+        mibCompiler.set_manifest(manifest)
+
+        processed = mibCompiler.compile("TEST-MIB", ignoreErrors=True, **options)
+
+        return {x: processed[x] for x in ("TEST-MIB", "TEST-TC-MIB")}
+
+    def testBuildManifest(self):
+        manifest = BuildManifest(os.path.join(self.srcDir, "manifest.json"))
+
+        self.assertEqual(
+            self.build(manifest), {"TEST-MIB": "compiled", "TEST-TC-MIB": "compiled"}
+        )
+        self.assertEqual(
+            self.build(manifest),
+            {"TEST-MIB": "untouched", "TEST-TC-MIB": "untouched"},
+        )
+
+        # newer but unchanged source
+        mtime = os.stat(os.path.join(self.srcDir, "TEST-MIB")).st_mtime + 3600
+        os.utime(os.path.join(self.srcDir, "TEST-MIB"), (mtime, mtime))
+
+        manifest = BuildManifest(os.path.join(self.srcDir, "manifest.json"))
+
+        self.assertEqual(
+            self.build(manifest),
+            {"TEST-MIB": "untouched", "TEST-TC-MIB": "untouched"},
+        )
+
+        # changed dependency
+        with open(os.path.join(self.srcDir, "TEST-TC-MIB"), "a") as f:
+            f.write("-- changed")
+
+        self.assertEqual(
+            self.build(manifest), {"TEST-MIB": "compiled", "TEST-TC-MIB": "compiled"}
+        )
+        self.assertEqual(
+            self.build(manifest, rebuild=True),
+            {"TEST-MIB": "compiled", "TEST-TC-MIB": "compiled"},
+        )
+
+    def testBuildManifestNotWritten(self):
+        for options, statuses in (
+            ({"noDeps": True}, {"TEST-MIB": "compiled", "TEST-TC-MIB": "untouched"}),
+            ({"writeMibs": False}, {"TEST-MIB": "compiled", "TEST-TC-MIB": "compiled"}),
+        ):
+            manifest = BuildManifest(os.path.join(self.srcDir, "manifest.json"))
+
+            self.build(manifest, rebuild=True)
+
+            with open(os.path.join(self.srcDir, "TEST-TC-MIB"), "a") as f:
+                f.write("-- changed")
+
+            mtime = os.stat(os.path.join(self.srcDir, "TEST-TC-MIB")).st_mtime + 3600
+            os.utime(os.path.join(self.srcDir, "TEST-TC-MIB"), (mtime, mtime))
+
+            self.assertEqual(self.build(manifest, **options), statuses)
+
+            # changed MIB was not written, so it is not up to date
+            self.assertEqual(self.build(manifest)["TEST-TC-MIB"], "compiled")
+
+    def testBuildManifestDependencies(self):
+        manifest = BuildManifest(os.path.join(self.srcDir, "manifest.json"))
+
+        manifest.update("A-MIB", "a", ["B-MIB"])
+        manifest.update("B-MIB", "b", ["C-MIB"])
+        manifest.update("C-MIB", "c", ["B-MIB"])
+        manifest.update("D-MIB", "d", [])
+
+        self.assertEqual(
+            manifest.get_changed(
+                {"A-MIB": "a", "B-MIB": "b", "C-MIB": "c", "D-MIB": "d"}, {}
+            ),
+            set(),
+        )
+        self.assertEqual(
+            manifest.get_changed({"A-MIB": "a", "C-MIB": "x", "D-MIB": "d"}, {}),
+            {"A-MIB", "B-MIB", "C-MIB"},
+        )
+        self.assertEqual(
+            manifest.get_changed(
+                {"A-MIB": "a", "B-MIB": "b", "C-MIB": "c", "D-MIB": "d"},
+                {"D-MIB": ["E-MIB"]},
+            ),
+            set(),
+        )
+        self.assertEqual(
+            manifest.get_changed(
+                {"A-MIB": "a", "B-MIB": "b", "C-MIB": "c", "D-MIB": "d", "E-MIB": "e"},
+                {"D-MIB": ["E-MIB"]},
+            ),
+            {"D-MIB"},
+        )
+
+    def compile_targets(self, *mibnames, codegens=(), **options):
+        # code generators may come along with MIBs to stub out
+        written = [{} for _ in codegens]
+        targets = []
+
+        for codegen, output in zip(codegens, written):
+            codegen, stubs = isinstance(codegen, tuple) and codegen or (codegen, ())
+
+            def put_data(mibname, data, cbCtx, output=output):
+                # drop comments carrying build time
+                output[mibname] = [
+                    x
+                    for x in data.splitlines()
+                    if x[:1] != "#" and "Produced by" not in x
+                ]
+
+            targets.append(
+                (
+                    codegen,
+                    CallbackWriter(put_data),
+                    [StubSearcher(*codegen.baseMibs, *stubs)],
+                )
+            )
+
+        mibCompiler = MibCompiler(
+            self.parser, PySnmpCodeGen(), CallbackWriter(lambda *args: None)
+        )
+        mibCompiler.add_sources(FileReader(self.srcDir))
+
+        processed = mibCompiler.compile_targets(targets, *mibnames, **options)
+
+        return processed, written
+
+    def testCompileTargetsMatchesCompile(self):
+        codegens = PySnmpCodeGen(), JsonCodeGen()
+
+        for mibnames, options in (
+            (("TEST-MIB",), {"ignoreErrors": True}),
+            (("TEST-MIB", "BROKEN-MIB"), {}),
+            (("TEST-MIB",), {"ignoreErrors": True, "lowMemory": True}),
+            (("TEST-MIB",), {"ignoreErrors": True, "jobs": 2}),
+        ):
+            processed, written = self.compile_targets(
+                *mibnames, codegens=codegens, **options
+            )
+
+            for index, codegen in enumerate(codegens):
+                expected = self.compile_targets(
+                    *mibnames, codegens=[codegen], **options
+                )
+
+                self.assertEqual(processed[index], expected[0][0])
+                self.assertEqual(written[index], expected[1][0])
+
+    def testCompileTargetsParseOnce(self):
+        with mock.patch.object(self.parser, "parse", wraps=self.parser.parse) as parse:
+            processed, written = self.compile_targets(
+                "TEST-MIB",
+                codegens=(PySnmpCodeGen(), JsonCodeGen()),
+                ignoreErrors=True,
+            )
+
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(sorted(written[0]), ["TEST-MIB", "TEST-TC-MIB"])
+        self.assertEqual(sorted(written[1]), ["TEST-MIB", "TEST-TC-MIB"])
+
+    def testCompileTargetsSearchers(self):
+        processed, written = self.compile_targets(
+            "TEST-MIB",
+            codegens=((PySnmpCodeGen(), ("TEST-TC-MIB",)), JsonCodeGen()),
+            ignoreErrors=True,
+        )
+
+        self.assertEqual(processed[0]["TEST-TC-MIB"], "untouched")
+        self.assertEqual(processed[1]["TEST-TC-MIB"], "compiled")
+        self.assertEqual(sorted(written[0]), ["TEST-MIB"])
+        self.assertEqual(sorted(written[1]), ["TEST-MIB", "TEST-TC-MIB"])
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
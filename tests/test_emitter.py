@@ -0,0 +1,215 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import ast
+import glob
+import os
+import sys
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi import error
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.parser.dialect import smi_v1_relaxed
+from pysmi.parser.smi import parserFactory
+from pysnmp.smi.builder import MibBuilder
+
+
+def get_test_mibs():
+    """Collect MIBs the pysnmp code generation tests are run against.
+
+    Each test case comes with its MIB in the docstring, preceded by the
+    MIBs it imports from (if any) held in class attributes.
+    """
+    mibs = []
+
+    for path in sorted(
+        glob.glob(os.path.join(os.path.dirname(__file__), "test_*_pysnmp.py"))
+    ):
+        with open(path) as f:
+            tree = ast.parse(f.read())
+
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+
+            docstring = ast.get_docstring(node)
+
+            if not docstring or "DEFINITIONS ::= BEGIN" not in docstring:
+                continue
+
+            imported = [
+                x.value.value
+                for x in node.body[1:]
+                if isinstance(x, ast.Assign)
+                and isinstance(x.value, ast.Constant)
+                and "DEFINITIONS ::= BEGIN" in str(x.value.value)
+            ]
+
+            mibs.append(
+                (f"{os.path.basename(path)}:{node.name}", imported + [docstring])
+            )
+
+    return mibs
+
+
+class DirectRendererTestCase(unittest.TestCase):
+    def setUp(self):
+        self.parser = parserFactory(**smi_v1_relaxed)()
+
+    def render(self, mibTree, symbolTableMap, **kwargs):
+        return PySnmpCodeGen().gen_code(
+            mibTree, symbolTableMap, comments=["test comment"], **kwargs
+        )[1]
+
+    def testSameCode(self):
+        mibs = get_test_mibs()
+
+        self.assertTrue(mibs, "no test MIBs found")
+
+        for name, mibData in mibs:
+            symbolTableMap = {}
+
+            for mibTree in self.parser.parse("\n".join(mibData)):
+                mibInfo, symtable = SymtableCodeGen().gen_code(
+                    mibTree, {}, genTexts=True
+                )
+
+                symbolTableMap[mibInfo.name] = symtable
+
+                for genTexts in (True, False):
+                    with self.subTest(mib=name, genTexts=genTexts):
+                        self.assertEqual(
+                            self.render(
+                                mibTree,
+                                symbolTableMap,
+                                genTexts=genTexts,
+                                renderer="direct",
+                            ),
+                            self.render(mibTree, symbolTableMap, genTexts=genTexts),
+                            "direct renderer code differs from template one",
+                        )
+
+    def testUnknownRenderer(self):
+        mibTree = self.parser.parse(get_test_mibs()[0][1][-1])[0]
+
+        mibInfo, symtable = SymtableCodeGen().gen_code(mibTree, {})
+
+        self.assertRaises(
+            error.PySmiCodegenError,
+            self.render,
+            mibTree,
+            {mibInfo.name: symtable},
+            renderer="unknown",
+        )
+
+
+class CompactCodeTestCase(unittest.TestCase):
+    # MIB objects properties to compare
+    GETTERS = (
+        "getName",
+        "getMaxAccess",
+        "getStatus",
+        "getUnits",
+        "getReference",
+        "getDescription",
+        "getIndexNames",
+    )
+
+    def setUp(self):
+        self.parser = parserFactory(**smi_v1_relaxed)()
+
+    def load(self, mibData, renderer):
+        mibBuilder = MibBuilder()
+        mibBuilder.loadTexts = True
+
+        ctx = {"mibBuilder": mibBuilder}
+
+        symbolTableMap = {}
+
+        for mibTree in self.parser.parse("\n".join(mibData)):
+            mibInfo, symtable = SymtableCodeGen().gen_code(mibTree, {}, genTexts=True)
+
+            symbolTableMap[mibInfo.name] = symtable
+
+            mibInfo, pycode = PySnmpCodeGen().gen_code(
+                mibTree, dict(symbolTableMap), genTexts=True, renderer=renderer
+            )
+
+            exec(compile(pycode, "test", "exec"), ctx, ctx)
+
+        self.namespace = ctx
+
+        return mibBuilder.mibSymbols[mibInfo.name]
+
+    def describe(self, symbol):
+        # comparable representation of MIB symbol
+        if isinstance(symbol, type):
+            return symbol.__name__
+
+        description = [type(symbol).__name__]
+
+        for getter in self.GETTERS:
+            if hasattr(symbol, getter):
+                try:
+                    description.append((getter, getattr(symbol, getter)()))
+
+                except Exception:
+                    # some properties can not be taken unless set
+                    description.append((getter, sys.exc_info()[0]))
+
+        syntax = getattr(symbol, "getSyntax", lambda: None)()
+
+        if syntax is not None:
+            value = None
+
+            if syntax.isValue:
+                # some strings can not be printed
+                value = getattr(syntax, "asOctets", syntax.prettyPrint)()
+
+            description.append(
+                (
+                    type(syntax).__name__,
+                    value,
+                    repr(syntax.subtypeSpec),
+                    repr(getattr(syntax, "namedValues", None)),
+                )
+            )
+
+        return description
+
+    def testSameSymbols(self):
+        for name, mibData in get_test_mibs():
+            with self.subTest(mib=name):
+                try:
+                    symbols = self.load(mibData, "template")
+
+                except Exception:
+                    # MIBs testing code generation failures
+                    continue
+
+                compactSymbols = self.load(mibData, "compact")
+
+                self.assertNotIn("_load_objects", self.namespace)
+                self.assertEqual(sorted(symbols), sorted(compactSymbols))
+
+                for symbol in symbols:
+                    self.assertEqual(
+                        self.describe(symbols[symbol]),
+                        self.describe(compactSymbols[symbol]),
+                        f"symbol {symbol} differs",
+                    )
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
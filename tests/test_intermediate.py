@@ -0,0 +1,177 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import pickle
+import sys
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi import error
+from pysmi.codegen.intermediate import IntermediateCodeGen
+
+
+class OidResolutionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.codegen = IntermediateCodeGen()
+        self.codegen.symbolTable = {
+            "SNMPv2-SMI": {
+                "org": {"oid": (("iso", "SNMPv2-SMI"), 3)},
+                "dod": {"oid": (("org", "SNMPv2-SMI"), 6)},
+                "internet": {"oid": (("dod", "SNMPv2-SMI"), 1)},
+                "enterprises": {"oid": (("internet", "SNMPv2-SMI"), 4, 1)},
+            },
+            "TEST-MIB": {
+                "test": {"oid": (("enterprises", "SNMPv2-SMI"), 99999)},
+            },
+        }
+
+    def testResolve(self):
+        self.assertEqual(
+            self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 1)),
+            (1, 3, 6, 1, 4, 1, 99999, 1),
+        )
+
+    def testCached(self):
+        self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 1))
+
+        self.codegen.symbolTable["SNMPv2-SMI"]["org"]["oid"] = (("iso", "X"), 4)
+
+        self.assertEqual(
+            self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 2)),
+            (1, 3, 6, 1, 4, 1, 99999, 2),
+        )
+
+    def testInvalidated(self):
+        self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 1))
+
+        symbolTable = dict(self.codegen.symbolTable["SNMPv2-SMI"])
+        symbolTable["org"] = {"oid": (("iso", "SNMPv2-SMI"), 4)}
+
+        self.codegen.symbolTable["SNMPv2-SMI"] = symbolTable
+
+        self.assertEqual(
+            self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 1)),
+            (1, 4, 6, 1, 4, 1, 99999, 1),
+        )
+
+        del self.codegen.symbolTable["SNMPv2-SMI"]
+
+        self.assertRaises(
+            error.PySmiSemanticError,
+            self.codegen.gen_numeric_oid,
+            (("test", "TEST-MIB"), 1),
+        )
+
+    def testBounded(self):
+        self.codegen.cacheSize = 2
+
+        self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 1))
+
+        self.assertEqual(
+            list(self.codegen._oidCache),
+            [("SNMPv2-SMI", "enterprises"), ("TEST-MIB", "test")],
+        )
+
+    def testPickled(self):
+        self.codegen.gen_numeric_oid((("test", "TEST-MIB"), 1))
+
+        codegen = pickle.loads(pickle.dumps(self.codegen))
+
+        self.assertEqual(len(codegen._oidCache), 0)
+
+    def testUnknownSymbol(self):
+        self.assertRaises(
+            error.PySmiSemanticError,
+            self.codegen.gen_numeric_oid,
+            (("noSuchSymbol", "TEST-MIB"), 1),
+        )
+
+
+class BaseTypeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.codegen = IntermediateCodeGen()
+        self.codegen.symbolTable = {
+            "TEST-TC-MIB": {
+                "TestEnum": {
+                    "syntax": (("Integer32", ""), {"one": 1, "two": 2}),
+                },
+                "TestRange": {
+                    "syntax": (("Integer32", ""), [[(1, 100)]]),
+                },
+            },
+            "TEST-MIB": {
+                "testEnum": {
+                    "syntax": (("TestEnum", "TEST-TC-MIB"), {"three": 3}),
+                },
+                "testRange": {
+                    "syntax": (("TestRange", "TEST-TC-MIB"), [[(1, 10)]]),
+                },
+            },
+        }
+
+    def testEnumeration(self):
+        baseType = self.codegen.get_base_type("testEnum", "TEST-MIB")
+
+        self.assertEqual(baseType[0], ("Integer32", ""))
+        self.assertEqual(dict(baseType[1]), {"one": 1, "two": 2, "three": 3})
+
+    def testRange(self):
+        baseType = self.codegen.get_base_type("testRange", "TEST-MIB")
+
+        self.assertEqual(baseType, (("Integer32", ""), (((1, 10),), ((1, 100),))))
+
+    def testImmutable(self):
+        for _ in range(2):
+            baseType = self.codegen.get_base_type("testEnum", "TEST-MIB")
+
+            with self.assertRaises(TypeError):
+                baseType[1]["four"] = 4
+
+            self.codegen.get_base_type("testRange", "TEST-MIB")
+
+        self.assertEqual(
+            self.codegen.symbolTable["TEST-TC-MIB"]["TestEnum"]["syntax"][1],
+            {"one": 1, "two": 2},
+        )
+        self.assertEqual(
+            self.codegen.symbolTable["TEST-MIB"]["testRange"]["syntax"][1],
+            [[(1, 10)]],
+        )
+
+    def testCached(self):
+        baseType = self.codegen.get_base_type("TestEnum", "TEST-TC-MIB")
+
+        self.assertIs(self.codegen.get_base_type("TestEnum", "TEST-TC-MIB"), baseType)
+
+        # objects are not cached, but the types they are of are
+        self.codegen.get_base_type("testRange", "TEST-MIB")
+
+        self.assertEqual(
+            list(self.codegen._baseTypeCache),
+            [("TEST-TC-MIB", "TestEnum"), ("TEST-TC-MIB", "TestRange")],
+        )
+
+    def testInvalidated(self):
+        self.codegen.get_base_type("testEnum", "TEST-MIB")
+
+        self.codegen.symbolTable["TEST-TC-MIB"] = {
+            "TestEnum": {"syntax": (("Integer32", ""), {"zero": 0})}
+        }
+
+        self.assertEqual(
+            dict(self.codegen.get_base_type("testEnum", "TEST-MIB")[1]),
+            {"zero": 0, "three": 3},
+        )
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,96 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+from unittest import mock
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.codegen.jenv import get_template
+from pysmi.codegen.jsondoc import JsonCodeGen
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+
+
+class TestCodeGen:
+    TEMPLATE_FILTERS = {"shout": lambda text: text.upper()}
+
+
+class TemplateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.dstTemplate = os.path.join(self.tempDir, "templates", "test.j2")
+
+        os.makedirs(os.path.dirname(self.dstTemplate))
+
+        self.write_template("{{ mib.name | shout }}")
+
+        # keep compiled templates of the tests out of user's cache
+        patcher = mock.patch.dict(
+            os.environ, {"XDG_CACHE_HOME": os.path.join(self.tempDir, "cache")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def write_template(self, text, mtime=None):
+        with open(self.dstTemplate, "w") as f:
+            f.write(text)
+
+        if mtime is not None:
+            os.utime(self.dstTemplate, (mtime, mtime))
+
+    def testShippedTemplateReused(self):
+        for codegen in (PySnmpCodeGen, JsonCodeGen):
+            self.assertIs(
+                get_template(codegen, codegen.TEMPLATE_NAME),
+                get_template(codegen, codegen.TEMPLATE_NAME),
+            )
+
+        self.assertIsNot(
+            get_template(PySnmpCodeGen, JsonCodeGen.TEMPLATE_NAME),
+            get_template(JsonCodeGen, JsonCodeGen.TEMPLATE_NAME),
+        )
+
+    def testCustomTemplate(self):
+        template = get_template(TestCodeGen, "unused.j2", self.dstTemplate)
+
+        self.assertEqual(template.render(mib={"name": "test"}), "TEST")
+        self.assertIs(
+            get_template(TestCodeGen, "unused.j2", self.dstTemplate), template
+        )
+
+    def testCustomTemplateChanged(self):
+        template = get_template(TestCodeGen, "unused.j2", self.dstTemplate)
+
+        self.write_template(
+            "{{ mib.name }}", mtime=os.path.getmtime(self.dstTemplate) + 10
+        )
+
+        template = get_template(TestCodeGen, "unused.j2", self.dstTemplate)
+
+        self.assertEqual(template.render(mib={"name": "test"}), "test")
+
+    def testBytecodeCached(self):
+        get_template(TestCodeGen, "unused.j2", self.dstTemplate)
+
+        self.assertTrue(
+            os.listdir(os.path.join(self.tempDir, "cache", "pysmi", "templates"))
+        )
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,451 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import pickle
+import sys
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+from pysmi import error
+from pysmi.lexer.smi import lexerBackends, lexerFactory
+from pysmi.parser.dialect import smi_v1, smi_v1_relaxed, smi_v2
+from pysmi.parser.smi import ParserPool, build_tables, compact_ast, parserFactory
+
+MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testObject OBJECT-TYPE
+    SYNTAX          Integer32
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test object"
+ ::= { 1 3 6 1 4 1 99999 1 }
+
+END
+"""
+
+
+class ParserTablesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def testGrammarHash(self):
+        hashes = {
+            parserFactory(**x).get_grammar_hash()
+            for x in (smi_v2, smi_v1, smi_v1_relaxed)
+        }
+
+        self.assertEqual(len(hashes), 3)
+        self.assertEqual(
+            parserFactory(**smi_v1).get_grammar_hash(),
+            parserFactory(**smi_v1).get_grammar_hash(),
+        )
+        self.assertNotEqual(
+            parserFactory().get_grammar_hash(),
+            parserFactory().get_grammar_hash("moduleIdentity"),
+        )
+
+    def testTablesReused(self):
+        parserClass = parserFactory(**smi_v1)
+
+        mibTree = parserClass(tempdir=self.tempDir).parse(MIB)
+
+        tablesFile = os.path.join(
+            self.tempDir, "mibFile", parserClass.get_grammar_hash() + ".pickle"
+        )
+
+        self.assertTrue(os.path.exists(tablesFile))
+
+        with mock.patch.object(
+            yacc, "LRGeneratedTable", side_effect=AssertionError("tables built")
+        ):
+            parser = parserClass(tempdir=self.tempDir)
+
+        self.assertEqual(parser.parse(MIB), mibTree)
+
+    def testBrokenTablesRebuilt(self):
+        parserClass = parserFactory(**smi_v2)
+
+        tablesFile = os.path.join(
+            self.tempDir, "mibFile", parserClass.get_grammar_hash() + ".pickle"
+        )
+
+        os.makedirs(os.path.dirname(tablesFile))
+
+        with open(tablesFile, "wb") as f:
+            f.write(b"garbage")
+
+        mibTree = parserClass(tempdir=self.tempDir).parse(MIB)
+
+        self.assertEqual(mibTree, parserClass().parse(MIB))
+        self.assertGreater(os.path.getsize(tablesFile), len(b"garbage"))
+
+    def testBuildTables(self):
+        build_tables(self.tempDir)
+
+        self.assertEqual(
+            sorted(os.listdir(self.tempDir)),
+            sorted(
+                parserFactory(**x).get_grammar_hash() + ".pickle"
+                for x in (smi_v2, smi_v1, smi_v1_relaxed)
+            ),
+        )
+
+
+class ParserFactoryTestCase(unittest.TestCase):
+    def testSameClass(self):
+        self.assertIs(parserFactory(**smi_v1), parserFactory(**dict(smi_v1)))
+        self.assertIs(
+            parserFactory(), parserFactory(**{x: False for x in smi_v1_relaxed})
+        )
+        self.assertIs(
+            parserFactory("regex", **smi_v1).defaultLexer,
+            lexerFactory("regex", **smi_v1),
+        )
+
+    def testDifferentClass(self):
+        self.assertIsNot(parserFactory(), parserFactory(**smi_v1))
+        self.assertIsNot(parserFactory(), parserFactory("regex"))
+
+    def testUnknownOption(self):
+        self.assertRaises(error.PySmiError, parserFactory, noSuchOption=True)
+
+    def testTablesShared(self):
+        parserClass = parserFactory(**smi_v1)
+
+        mibTree = parserClass().parse(MIB)
+
+        with mock.patch.object(yacc, "yacc", side_effect=AssertionError("yacc run")):
+            parser = parserClass()
+
+        self.assertEqual(parser.parse(MIB), mibTree)
+
+    def testInstancesIndependent(self):
+        parserClass = parserFactory(**smi_v1)
+
+        parser1, parser2 = parserClass(), parserClass()
+
+        self.assertIsNot(parser1.parser, parser2.parser)
+        self.assertIs(parser1.parser.action, parser2.parser.action)
+        self.assertIs(parser1.parser.productions[1].callable.__self__, parser1)
+        self.assertIs(parser2.parser.productions[1].callable.__self__, parser2)
+
+
+class ParserPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pool = ParserPool(parserFactory(**smi_v1), size=2)
+
+    def testReuse(self):
+        with self.pool.parser() as parser1:
+            with self.pool.parser() as parser2:
+                self.assertIsNot(parser1, parser2)
+
+        with self.pool.parser() as parser:
+            self.assertIn(parser, (parser1, parser2))
+
+    def testSize(self):
+        parsers = [self.pool.acquire() for _ in range(3)]
+
+        for parser in parsers:
+            self.pool.release(parser)
+
+        self.assertEqual(len(self.pool._parsers), 2)
+
+    def testThreads(self):
+        mibTree = self.pool.parse(MIB)
+
+        mibTrees = []
+
+        def parse():
+            for _ in range(5):
+                mibTrees.append(self.pool.parse(MIB))
+
+        threads = [threading.Thread(target=parse) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mibTrees, [mibTree] * 20)
+
+
+class LexerResetTestCase(unittest.TestCase):
+    def testLexerBuiltOnce(self):
+        lexerClass = lexerFactory(**smi_v1)
+
+        lexerClass()
+
+        with mock.patch.object(
+            lex, "LexerReflect", side_effect=AssertionError("lexer built")
+        ):
+            lexer = lexerClass()
+            lexer.reset()
+
+        self.assertIs(lexer.lexer.lexmodule, lexer)
+
+        # not reset yet
+        lexer = lexerClass()
+
+        for _, rules in lexer.lexer.lexre:
+            for rule in rules:
+                if rule and rule[0]:
+                    self.assertIs(rule[0].__self__, lexer)
+
+    def testLineNumbersReset(self):
+        parser = parserFactory()()
+
+        brokenMib = MIB.replace("testObject OBJECT-TYPE", "testObject- OBJECT-TYPE")
+
+        for _ in range(2):
+            try:
+                parser.parse(brokenMib)
+
+            except error.PySmiLexerError:
+                self.assertEqual(sys.exc_info()[1].lineno, 7)
+
+            else:
+                self.fail("lexer error not raised")
+
+        self.assertEqual(parser.parse(MIB), parserFactory()().parse(MIB))
+
+
+class RegexLexerTestCase(unittest.TestCase):
+    MIBS = [
+        MIB,
+        MIB.replace("\n", "\r\n"),
+        """
+TEST-MIB DEFINITIONS ::= BEGIN
+EXPORTS testObject,
+  testType;
+IMPORTS  -- trailing comment -- still comment
+  Counter, TRAP-TYPE FROM RFC-1215;
+
+OBJECT-TYPE MACRO ::=
+BEGIN
+    TYPE NOTATION ::= "SYNTAX" type(TYPE ObjectSyntax)
+END
+
+TestType ::= CHOICE { a INTEGER,
+  b '0101'B }
+
+testValue INTEGER ::= -4294967296
+testRange INTEGER (-1..18446744073709551615)
+testString OCTET STRING ::= 'ff'H
+testText ::= "multi
+line\r\ntext"
+END
+""",
+        "TEST-MIB DEFINITIONS ::= BEGIN\n\ttest-\nEND",
+        "TEST-MIB DEFINITIONS ::= BEGIN\n  BOOLEAN\nEND",
+        "TEST-MIB DEFINITIONS ::= BEGIN\n  x 184467440737095516150\nEND",
+        "TEST-MIB DEFINITIONS ::= BEGIN\n  x # y\nEND",
+        "TEST-MIB DEFINITIONS ::= BEGIN\n  MACRO ::= [ no end",
+    ]
+
+    def tokenize(self, lexerClass, data):
+        lexer = lexerClass().lexer
+        lexer.input(data)
+
+        tokens = []
+
+        try:
+            for token in iter(lexer.token, None):
+                tokens.append((token.type, token.value, token.lineno, token.lexpos))
+
+        except Exception:
+            tokens.append((sys.exc_info()[0], str(sys.exc_info()[1])))
+
+        return tokens
+
+    def testSameTokens(self):
+        for grammarOptions in (smi_v2, smi_v1, smi_v1_relaxed):
+            plyLexer = lexerFactory(**grammarOptions)
+            regexLexer = lexerFactory("regex", **grammarOptions)
+
+            for mib in self.MIBS:
+                self.assertEqual(
+                    self.tokenize(regexLexer, mib), self.tokenize(plyLexer, mib)
+                )
+
+    def testParse(self):
+        parser = parserFactory(lexerBackend="regex", **smi_v1)()
+
+        self.assertEqual(parser.parse(MIB), parserFactory(**smi_v1)().parse(MIB))
+
+        parser = pickle.loads(pickle.dumps(parser))
+
+        self.assertEqual(parser.lexerBackend, "regex")
+        self.assertEqual(parser.parse(MIB), parserFactory(**smi_v1)().parse(MIB))
+
+    def testUnknownBackend(self):
+        self.assertRaises(error.PySmiError, lexerFactory, "unknown")
+
+
+class TextlessParseTestCase(unittest.TestCase):
+    MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  MODULE-IDENTITY, OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testModule MODULE-IDENTITY
+    LAST-UPDATED "202501010000Z"
+    ORGANIZATION "Test
+                  organization"
+    CONTACT-INFO "Test
+                  contact"
+    DESCRIPTION  "Test module"
+    REVISION     "202501010000Z"
+    DESCRIPTION  "Initial
+                  revision"
+ ::= { 1 3 6 1 4 1 99999 }
+
+testObject OBJECT-TYPE
+    SYNTAX          Integer32
+    UNITS           "seconds"
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test
+                     object"
+    REFERENCE       "Test reference"
+    DEFVAL          { 1 }
+ ::= { testModule 1 }
+
+END
+"""
+
+    def testTextsSkipped(self):
+        for lexerBackend in sorted(lexerBackends):
+            parser = parserFactory(lexerBackend=lexerBackend)()
+
+            moduleIdentity, objectType = parser.parse(self.MIB, genTexts=False)[0][3]
+
+            self.assertEqual(
+                moduleIdentity[2:7],
+                (
+                    ("LAST-UPDATED", "202501010000Z"),
+                    ("ORGANIZATION", ""),
+                    ("CONTACT-INFO", ""),
+                    ("DESCRIPTION", ""),
+                    (
+                        "Revisions",
+                        [
+                            (
+                                "202501010000Z",
+                                ("DESCRIPTION", "Initial\n                  revision"),
+                            )
+                        ],
+                    ),
+                ),
+            )
+            self.assertEqual(objectType[3], ("UNITS", "seconds"))
+            self.assertEqual(objectType[6:8], (("DESCRIPTION", ""), ("REFERENCE", "")))
+            self.assertEqual(objectType[10], ("DEFVAL", 1))
+
+            moduleIdentity, objectType = parser.parse(self.MIB)[0][3]
+
+            self.assertEqual(
+                moduleIdentity[3],
+                ("ORGANIZATION", "Test\n                  organization"),
+            )
+            self.assertEqual(objectType[7], ("REFERENCE", "Test reference"))
+
+    def testLineNumbers(self):
+        brokenMib = self.MIB.replace(
+            "testObject OBJECT-TYPE", "testObject- OBJECT-TYPE"
+        )
+
+        for lexerBackend in sorted(lexerBackends):
+            parser = parserFactory(lexerBackend=lexerBackend)()
+
+            for genTexts in (True, False):
+                try:
+                    parser.parse(brokenMib, genTexts=genTexts)
+
+                except error.PySmiLexerError:
+                    self.assertEqual(sys.exc_info()[1].lineno, 19)
+
+                else:
+                    self.fail("lexer error not raised")
+
+
+class CompactAstTestCase(unittest.TestCase):
+    def testCompactAst(self):
+        parser = parserFactory()()
+
+        mibTrees = parser.parse(TextlessParseTestCase.MIB)
+        compactTrees = parser.parse(TextlessParseTestCase.MIB, compact=True)
+
+        self.assertEqual(mibTrees, compactTrees)
+        self.assertEqual(pickle.loads(pickle.dumps(compactTrees)), mibTrees)
+
+        moduleIdentity, objectType = compactTrees[0][3]
+
+        # texts are not interned, yet are equal
+        self.assertEqual(
+            objectType[6], ("DESCRIPTION", "Test\n                     object")
+        )
+
+    def testSharing(self):
+        ast = [
+            ("a", ("b-c", 1, None), ["d"]),
+            ("a", ("b-c", 1, None), ["d"]),
+            ("a", ("b-c", True), {"d": ("b-c", 1, None)}),
+            ("a", ("b-c", 1), "some text"),
+        ]
+
+        compacted = compact_ast(ast)
+
+        self.assertEqual(ast, compacted)
+
+        # words are interned
+        self.assertIs(compacted[0][1][0], sys.intern("b-c"))
+
+        # equal tuples of words and numbers are shared
+        self.assertIs(compacted[0][1], compacted[1][1])
+        self.assertIs(compacted[0][1], compacted[2][2]["d"])
+
+        # tuples holding lists are not shared
+        self.assertIsNot(compacted[0], compacted[1])
+        self.assertIsNot(compacted[0][2], compacted[1][2])
+
+        # booleans are not mixed up with integers
+        self.assertIs(compacted[2][1][1], True)
+        self.assertIs(compacted[3][1][1], 1)
+
+    def testSharedInBetween(self):
+        shared = {}
+
+        first = compact_ast([("a", ("b", 1))], shared)
+        second = compact_ast([("a", ("b", 1))], shared)
+
+        self.assertIs(first[0], second[0])
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
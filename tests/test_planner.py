@@ -0,0 +1,130 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+import textwrap
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.planner import BuildPlan, plan_mibs
+from pysmi.reader.localfile import FileReader
+
+MIB = """
+%s DEFINITIONS ::= BEGIN
+IMPORTS
+  %s
+    FROM %s;
+END
+"""
+
+
+class BuildPlanTestCase(unittest.TestCase):
+    def testSchedule(self):
+        plan = BuildPlan(
+            {
+                "A-MIB": ("B-MIB", "C-MIB", "SNMPv2-SMI"),
+                "B-MIB": ("C-MIB",),
+                "C-MIB": ("SNMPv2-SMI",),
+                "D-MIB": (),
+            },
+            ["SNMPv2-SMI"],
+        )
+
+        self.assertEqual(
+            plan.waves, (("C-MIB", "D-MIB"), ("B-MIB",), ("A-MIB",)), "bad waves"
+        )
+        self.assertEqual(plan.order, ("C-MIB", "D-MIB", "B-MIB", "A-MIB"), "bad order")
+        self.assertEqual(len(plan), 4, "bad length")
+        self.assertIn("A-MIB", plan)
+        self.assertNotIn("SNMPv2-SMI", plan)
+
+    def testScheduleCycle(self):
+        plan = BuildPlan(
+            {
+                "A-MIB": ("B-MIB",),
+                "B-MIB": ("C-MIB", "A-MIB"),
+                "C-MIB": ("B-MIB",),
+                "D-MIB": ("A-MIB", "D-MIB"),
+            }
+        )
+
+        self.assertEqual(
+            plan.waves, (("A-MIB", "B-MIB", "C-MIB"), ("D-MIB",)), "bad waves"
+        )
+
+    def testScheduleCycles(self):
+        plan = BuildPlan(
+            {
+                "A-MIB": ("B-MIB", "C-MIB"),
+                "B-MIB": ("A-MIB",),
+                "C-MIB": ("D-MIB",),
+                "D-MIB": ("C-MIB", "E-MIB"),
+                "E-MIB": (),
+            }
+        )
+
+        self.assertEqual(
+            plan.waves,
+            (("E-MIB",), ("C-MIB", "D-MIB"), ("A-MIB", "B-MIB")),
+            "bad waves",
+        )
+
+    def testEmpty(self):
+        plan = BuildPlan({})
+
+        self.assertEqual(plan.waves, (), "bad waves")
+        self.assertEqual(len(plan), 0, "bad length")
+
+
+class PlanMibsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.srcDir = tempfile.mkdtemp()
+
+        for filename, text in (
+            ("A-MIB", MIB % ("A-MIB", "b, c", "B-MIB c FROM c-mib")),
+            ("B-MIB", MIB % ("B-MIB", "c", "C-MIB")),
+            ("c-mib", MIB % ("C-MIB", "x", "NO-SUCH-MIB")),
+            ("BAD-MIB", "BAD-MIB ~"),
+        ):
+            with open(os.path.join(self.srcDir, filename), "w") as f:
+                f.write(textwrap.dedent(text))
+
+    def tearDown(self):
+        shutil.rmtree(self.srcDir)
+
+    def testPlan(self):
+        plan = plan_mibs([FileReader(self.srcDir)], "A-MIB")
+
+        self.assertEqual(
+            plan.imports,
+            {
+                "A-MIB": ("B-MIB", "c-mib"),
+                "B-MIB": ("c-mib",),
+                "c-mib": ("NO-SUCH-MIB",),
+            },
+            "bad imports",
+        )
+        self.assertEqual(plan.order, ("c-mib", "B-MIB", "A-MIB"), "bad order")
+        self.assertEqual(plan.missing, ("NO-SUCH-MIB",), "bad missing")
+
+    def testPlanFailures(self):
+        plan = plan_mibs([FileReader(self.srcDir)], "BAD-MIB", "NO-SUCH-MIB")
+
+        self.assertEqual(plan.imports, {"BAD-MIB": ()}, "bad imports")
+        self.assertEqual(plan.missing, ("NO-SUCH-MIB",), "bad missing")
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,176 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import sys
+from datetime import datetime
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi import error
+from pysmi.probe import probe_mib, split_mib
+
+
+class ProbeTestCase(unittest.TestCase):
+    R"""
+    TEST-MIB DEFINITIONS ::= BEGIN
+    IMPORTS
+      MODULE-IDENTITY, OBJECT-TYPE, Integer32
+        FROM SNMPv2-SMI
+      DisplayString
+        FROM SNMPv2-TC;
+
+    testModule MODULE-IDENTITY
+        LAST-UPDATED "202501010000Z"
+        ORGANIZATION "Test, see END of MODULE-IDENTITY"
+        CONTACT-INFO "Test"
+        DESCRIPTION  "Test module"
+        REVISION     "202501010000Z"
+        DESCRIPTION  "Latest revision"
+        REVISION     "9901010000Z"
+        DESCRIPTION  "Initial revision"
+     ::= { enterprises test(99999) 1 }
+
+    testObject OBJECT-TYPE
+        SYNTAX          Integer32
+        MAX-ACCESS      read-only
+        STATUS          current
+        DESCRIPTION     "Test object"
+     ::= { testModule 1 }
+
+    END
+
+    TEST-V1-MIB { iso 3 } DEFINITIONS ::= BEGIN
+
+    TestMacro MACRO ::=
+    BEGIN
+    END
+
+    END
+    """
+
+    def setUp(self):
+        self.headers = probe_mib(self.__class__.__doc__)
+
+    def testModules(self):
+        self.assertEqual(
+            [x.name for x in self.headers], ["TEST-MIB", "TEST-V1-MIB"], "bad names"
+        )
+
+    def testImports(self):
+        header = self.headers[0]
+
+        self.assertEqual(header.imported, ("SNMPv2-SMI", "SNMPv2-TC"), "bad imported")
+        self.assertEqual(
+            header.imports,
+            {
+                "SNMPv2-SMI": ["MODULE-IDENTITY", "OBJECT-TYPE", "Integer32"],
+                "SNMPv2-TC": ["DisplayString"],
+            },
+            "bad imports",
+        )
+
+        self.assertEqual(self.headers[1].imported, (), "bad imported")
+
+    def testIdentity(self):
+        header = self.headers[0]
+
+        self.assertEqual(header.identityName, "testModule", "bad identity name")
+        self.assertEqual(header.identity, ("enterprises", 99999, 1), "bad identity")
+        self.assertEqual(header.lastUpdated, "202501010000Z", "bad last updated")
+
+        self.assertEqual(self.headers[1].identity, (), "bad identity")
+
+    def testRevisions(self):
+        header = self.headers[0]
+
+        self.assertEqual(
+            header.revisions, ("202501010000Z", "9901010000Z"), "bad revisions"
+        )
+        self.assertEqual(header.revision, datetime(2025, 1, 1), "bad revision")
+
+        self.assertIsNone(self.headers[1].revision, "bad revision")
+
+    def testBadRevision(self):
+        header = probe_mib(
+            self.__class__.__doc__.replace('REVISION     "2025', 'REVISION     "_')
+        )[0]
+
+        self.assertIsNone(header.revision, "bad revision")
+
+    def testShortRevision(self):
+        header = probe_mib(
+            self.__class__.__doc__.replace(
+                'REVISION     "202501010000Z"', 'REVISION     "9912310000Z"'
+            )
+        )[0]
+
+        self.assertEqual(header.revision, datetime(1999, 12, 31), "bad revision")
+
+    def testMibFile(self):
+        with open(
+            os.path.join(os.path.dirname(__file__), "data", "asn1", "MIKROTIK-MIB")
+        ) as f:
+            (header,) = probe_mib(f.read())
+
+        self.assertEqual(header.name, "MIKROTIK-MIB", "bad name")
+        self.assertEqual(
+            header.imported, ("SNMPv2-SMI", "SNMPv2-TC", "SNMPv2-CONF"), "bad imported"
+        )
+        self.assertEqual(header.identity, ("mikrotik", 1), "bad identity")
+        self.assertEqual(header.revision, datetime(2017, 3, 10), "bad revision")
+
+    def testNotMib(self):
+        self.assertEqual(probe_mib("just some text\n"), [], "not a MIB probed")
+
+    def testLexerError(self):
+        self.assertRaises(error.PySmiLexerError, probe_mib, "TEST-MIB ~ BEGIN")
+
+
+class SplitTestCase(unittest.TestCase):
+    def testSplit(self):
+        data = ProbeTestCase.__doc__
+
+        chunks = split_mib(data)
+
+        self.assertEqual([x[0] for x in chunks], [2, 29], "bad line numbers")
+
+        for lineno, chunk in chunks:
+            self.assertTrue(
+                data.splitlines()[lineno - 1].lstrip().startswith(chunk[:11]),
+                "bad module start",
+            )
+            self.assertTrue(chunk.endswith("END"), "bad module end")
+
+        self.assertEqual(
+            [x.name for x in probe_mib(chunks[1][1])], ["TEST-V1-MIB"], "bad chunk"
+        )
+
+    def testNotSplit(self):
+        for data in ("", "-- just a comment", "a", "A-MIB ~", "A-MIB B-MIB { a } END"):
+            self.assertEqual(split_mib(data), [(1, data)], "text split")
+
+    def testUnterminated(self):
+        data = "A-MIB DEFINITIONS ::= BEGIN END\nB-MIB DEFINITIONS ::= BEGIN"
+
+        self.assertEqual(
+            split_mib(data),
+            [
+                (1, "A-MIB DEFINITIONS ::= BEGIN END"),
+                (2, "B-MIB DEFINITIONS ::= BEGIN"),
+            ],
+            "bad split",
+        )
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,143 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import importlib.machinery
+import importlib.util
+import marshal
+import os
+import py_compile
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi import error
+from pysmi.searcher.pyfile import PyFileSearcher
+from pysmi.writer.pyfile import PyFileWriter
+
+CODE = 'value = "test"\n'
+
+
+class PyFileWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def load(self, loaderClass, path):
+        loader = loaderClass("TEST_MIB", path)
+
+        ctx = {}
+
+        exec(loader.get_code("TEST_MIB"), ctx)
+
+        return ctx
+
+    def testCompileInMemory(self):
+        PyFileWriter(self.path).set_options(pyCompileInMemory=True).put_data(
+            "TEST_MIB", CODE
+        )
+
+        pyfile = os.path.join(self.path, "TEST_MIB.py")
+        pycfile = importlib.util.cache_from_source(pyfile)
+
+        self.assertTrue(os.path.isfile(pyfile), "source not written")
+        self.assertTrue(os.path.isfile(pycfile), "bytecode not written")
+
+        with open(pycfile, "rb") as f:
+            pycData = f.read()
+
+        # the same as written by py_compile, so that Python takes it
+        py_compile.compile(pyfile, cfile=pycfile, doraise=True)
+
+        with open(pycfile, "rb") as f:
+            expected = f.read()
+
+        self.assertEqual(pycData[:16], expected[:16], "bad bytecode header")
+        self.assertEqual(
+            marshal.loads(pycData[16:]), marshal.loads(expected[16:]), "bad bytecode"
+        )
+
+    def testCompileInMemoryOptimized(self):
+        PyFileWriter(self.path).set_options(
+            pyCompileInMemory=True, pyOptimizationLevel=2
+        ).put_data("TEST_MIB", CODE)
+
+        pycfile = importlib.util.cache_from_source(
+            os.path.join(self.path, "TEST_MIB.py"), optimization=2
+        )
+
+        self.assertTrue(os.path.isfile(pycfile), "bytecode not written")
+
+    def testSyntaxError(self):
+        writer = PyFileWriter(self.path).set_options(pyCompileInMemory=True)
+
+        self.assertRaises(
+            error.PySmiWriterError, writer.put_data, "TEST_MIB", "value = (\n"
+        )
+
+        self.assertFalse(os.listdir(self.path), "files written")
+
+    def testSyntaxErrorIgnored(self):
+        PyFileWriter(self.path).put_data("TEST_MIB", "value = (\n")
+
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.path, "TEST_MIB.py")), "source not written"
+        )
+
+    def testSourceless(self):
+        pyfile = os.path.join(self.path, "TEST_MIB.py")
+
+        # stale source would be imported instead of bytecode
+        with open(pyfile, "w") as f:
+            f.write('value = "stale"\n')
+
+        PyFileWriter(self.path).set_options(pySourceless=True).put_data(
+            "TEST_MIB", CODE
+        )
+
+        self.assertEqual(os.listdir(self.path), ["TEST_MIB.pyc"])
+
+        ctx = self.load(
+            importlib.machinery.SourcelessFileLoader,
+            os.path.join(self.path, "TEST_MIB.pyc"),
+        )
+
+        self.assertEqual(ctx["value"], "test")
+
+    def testSourcelessFound(self):
+        PyFileWriter(self.path).set_options(pySourceless=True).put_data(
+            "TEST_MIB", CODE
+        )
+
+        searcher = PyFileSearcher(self.path)
+
+        self.assertRaises(
+            error.PySmiFileNotModifiedError,
+            searcher.file_exists,
+            "TEST_MIB",
+            time.time() - 60,
+        )
+
+        self.assertRaises(
+            error.PySmiFileNotFoundError,
+            searcher.file_exists,
+            "TEST_MIB",
+            time.time() + 60,
+        )
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,173 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2020, Ilya Etingof <etingof@gmail.com>
+# License: https://www.pysnmp.com/pysmi/license.html
+#
+import os
+import sys
+import shutil
+import socket
+import tempfile
+import textwrap
+import threading
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi import error
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.compiler import MibCompiler
+from pysmi.parser.smi import parserFactory
+from pysmi.reader.localfile import FileReader
+from pysmi.searcher.stub import StubSearcher
+from pysmi.writer.callback import CallbackWriter
+
+TEST_MIB = """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  MODULE-IDENTITY, OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testModule MODULE-IDENTITY
+    LAST-UPDATED "202501010000Z"
+    ORGANIZATION "Test"
+    CONTACT-INFO "Test"
+    DESCRIPTION  "Test module"
+ ::= { 1 3 6 1 4 1 99999 }
+
+testObject OBJECT-TYPE
+    SYNTAX          Integer32
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test object"
+ ::= { testModule 1 }
+
+END
+"""
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "no Unix domain sockets")
+class CompileServerTestCase(unittest.TestCase):
+    def setUp(self):
+        # no Unix domain socket server on some platforms
+        from pysmi.server import CompileServer
+
+        self.tempDir = tempfile.mkdtemp()
+
+        with open(os.path.join(self.tempDir, "TEST-MIB"), "w") as f:
+            f.write(textwrap.dedent(TEST_MIB))
+
+        self.written = {}
+
+        def put_data(mibname, data, cbCtx):
+            self.written[mibname] = data
+
+        self.mibCompiler = MibCompiler(
+            parserFactory()(), PySnmpCodeGen(), CallbackWriter(put_data)
+        )
+        self.mibCompiler.add_sources(FileReader(self.tempDir))
+        self.mibCompiler.add_searchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+
+        self.path = os.path.join(self.tempDir, "pysmi.sock")
+
+        self.server = CompileServer(self.path, self.mibCompiler, ignoreErrors=True)
+
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        shutil.rmtree(self.tempDir)
+
+    def testCompile(self):
+        from pysmi.server import CompileClient
+
+        client = CompileClient(self.path, timeout=60)
+
+        processed = client.compile("TEST-MIB")
+
+        self.assertEqual(processed["TEST-MIB"], "compiled")
+        self.assertEqual(processed["TEST-MIB"].identity, "1.3.6.1.4.1.99999")
+        self.assertEqual(processed["SNMPv2-SMI"], "missing")
+        self.assertIn("TEST-MIB", self.written)
+
+        processed = client.compile("NO-SUCH-MIB", ignoreErrors=False)
+
+        self.assertEqual(processed["NO-SUCH-MIB"], "missing")
+
+    def testBadRequest(self):
+        from pysmi.server import CompileClient
+
+        client = CompileClient(self.path, timeout=60)
+
+        self.assertRaises(error.PySmiError, client.compile, "TEST-MIB", jobs=10)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(b"not json\n")
+
+            with sock.makefile("rb") as f:
+                self.assertIn(b"malformed request", f.readline())
+
+        # server survives bad requests
+        self.assertEqual(client.compile("TEST-MIB")["TEST-MIB"], "compiled")
+
+    def testIdleClient(self):
+        from pysmi.server import CompileClient
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+
+            # one client stays connected, but sends nothing
+            processed = CompileClient(self.path, timeout=10).compile("TEST-MIB")
+
+            self.assertEqual(processed["TEST-MIB"], "compiled")
+
+    def testServerClose(self):
+        from pysmi.server import CompileClient
+
+        self.assertTrue(os.path.exists(self.path))
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertRaises(
+            error.PySmiError, CompileClient(self.path).compile, "TEST-MIB"
+        )
+
+    def testSocketPath(self):
+        from pysmi.server import CompileServer
+
+        # server is running
+        self.assertRaises(OSError, CompileServer, self.path, self.mibCompiler)
+
+        # not a socket
+        path = os.path.join(self.tempDir, "TEST-MIB")
+
+        self.assertRaises(OSError, CompileServer, path, self.mibCompiler)
+        self.assertTrue(os.path.isfile(path))
+
+        # stale socket
+        path = os.path.join(self.tempDir, "stale.sock")
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(path)
+
+        server = CompileServer(path, self.mibCompiler)
+        server.server_close()
+
+        self.assertFalse(os.path.exists(path))
+
+
+suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+if __name__ == "__main__":
+    unittest.TextTestRunner(verbosity=2).run(suite)